@@ -9,18 +9,32 @@ class Line(object):
     equation : str
         a formatted string to print out what the line is in slope-intercept form, i.e. y=3x-231.4, x=2, y=-34421.6
 
+    The equation is parsed once on creation. Two lines are equal, and hash the same, when their canonical
+    coefficients are equal, i.e. Line("y=2x+0") == Line("y=2.0x-0.0")
+
+    A line created from numbers with Line.from_slope_intercept() is never parsed, its equation is only formatted
+    the first time it is read
+
     Methods
     -------
+    from_slope_intercept(slope, y_intercept, x_intercept=None)
+        Line given its numbers, without formatting or parsing an equation
+
     get_slope()
-        calculate slope of given line
+        slope of given line
 
     get_y_intercept()
-        calculate the y intercept of given line
+        the y intercept of given line
 
     get_x_intercept()
-        calculate the x intercept of given line
+        the x intercept of given line
+
+    get_coefficients()
+        the canonical (a, b, c) of given line in general form a*x + b*y + c = 0
     """
 
+    __slots__ = ("_equation", "_slope", "_y_intercept", "_x_intercept", "_coefficients")
+
     def __init__(self, slope_intercept_eq):
         ########################
         ### parameters check ###
@@ -45,11 +59,108 @@ class Line(object):
                         slope_intercept_eq.find("x") != 0 or slope_intercept_eq.find("=") != 1))
             ):
             raise ValueError("Line: equation inputted %r must be in valid y=mx+b form." % slope_intercept_eq)
-        self.equation = slope_intercept_eq
+        self._equation = slope_intercept_eq
+
+        # parse the equation once, accessors below only return the stored numbers
+        self._slope = self._parse_slope()
+        self._y_intercept = self._parse_y_intercept()
+        self._x_intercept = self._parse_x_intercept()
+        self._set_coefficients()
+
+    @classmethod
+    def from_slope_intercept(cls, slope, y_intercept, x_intercept=None):
+        '''
+        create a Line from its numbers, i.e. the results of computation.py, without formatting or parsing an equation.
+        the equation is formatted the same way as computation.py did, i.e. "y=2.0x+3.0", "x=4.0"
+
+        :param slope: float, "DNE" if the line is vertical
+        :param y_intercept: float, "DNE" if the line is vertical
+        :param x_intercept: float, only used if the line is vertical. it is calculated from the slope and y-intercept
+            otherwise
+        :return: Line object
+        '''
+
+        line = cls.__new__(cls)
+        line._equation = None
+
+        if slope == "DNE":
+            line._slope = "DNE"
+            line._y_intercept = "DNE"
+            line._x_intercept = float(x_intercept)
+        else:
+            line._slope = float(slope)
+            line._y_intercept = float(y_intercept)
+            # the line does not cross the x-axis if it is horizontal
+            line._x_intercept = "DNE" if line._slope == 0 else (-line._y_intercept) / line._slope
+        line._set_coefficients()
+
+        return line
+
+    def _set_coefficients(self):
+        # canonical general form a*x + b*y + c = 0, normalized so b=1, or a=1 and b=0 for vertical lines
+        if self._slope == "DNE":
+            self._coefficients = (1.0, 0.0, 0.0 - self._x_intercept)
+        else:
+            self._coefficients = (0.0 - self._slope, 1.0, 0.0 - self._y_intercept)
+
+    @property
+    def equation(self):
+        '''
+        :return: string of the line in slope-intercept form, i.e. y=3x-231.4, x=2, y=-34421.6
+        '''
+        if self._equation is None:
+            if self._slope == "DNE":
+                self._equation = "x=%s" % self._x_intercept
+            # put in string format. if negative, string does not need a '+'
+            elif self._y_intercept >= 0:
+                self._equation = "y=%sx+%s" % (self._slope, self._y_intercept)
+            else:
+                self._equation = "y=%sx%s" % (self._slope, self._y_intercept)
+        return self._equation
+
+    def __eq__(self, other):
+        if isinstance(other, Line) is False:
+            return NotImplemented
+        return self._coefficients == other._coefficients
+
+    def __hash__(self):
+        return hash(self._coefficients)
+
+    def __repr__(self):
+        return "Line(%r)" % self.equation
 
     def get_slope(self):
         '''
-        find slope given self.equation
+        get slope of self.equation
+        :return: float representing slope, "DNE" if the line is vertical
+        '''
+        return self._slope
+
+    def get_y_intercept(self):
+        '''
+        get y-intercept of self.equation
+        :return: float representing y_intercept, "DNE" if the line is vertical
+        '''
+        return self._y_intercept
+
+    def get_x_intercept(self):
+        '''
+        get x-intercept of self.equation
+        :return: float representing x_intercept, "DNE" if the line is horizontal
+        '''
+        return self._x_intercept
+
+    def get_coefficients(self):
+        '''
+        get the canonical coefficients of self.equation in general form a*x + b*y + c = 0
+        i.e. y=2x+8 -> (-2.0, 1.0, -8.0), x=3 -> (1.0, 0.0, -3.0)
+        :return: tuple (a, b, c) of floats
+        '''
+        return self._coefficients
+
+    def _parse_slope(self):
+        '''
+        parse slope from self.equation
         :return: float representing slope
         '''
 
@@ -71,16 +182,16 @@ class Line(object):
                 slope = float(m)
             except ValueError as e:
                 # reraise it with custom message
-                error_msg_output = "get_slope: slope cannot be found for %s!" % self.equation
+                error_msg_output = "Line: slope cannot be found for %s!" % self.equation
                 print(error_msg_output)
                 e.args += (error_msg_output,)
                 raise
 
         return slope
 
-    def get_y_intercept(self):
+    def _parse_y_intercept(self):
         '''
-        find y-intercept given self.equation
+        parse y-intercept from self.equation
         :return: float representing y_intercept
         '''
 
@@ -99,22 +210,23 @@ class Line(object):
                 x_index = equals_index
 
             # b is after the sign after the x, i.e. b=3 when y=5x+3
-            y_intercept = self.equation[x_index + 1:]
+            # a negative zero intercept is formatted as "+-0.0", i.e. y=-0.0x+-0.0
+            y_intercept = self.equation[x_index + 1:].replace("+-", "-")
 
             try:
                 b = float(y_intercept)
             except ValueError as e:
                 # reraise it with custom message
-                error_msg_output = "get_y_intercept: y_intercept cannot be found for %s!" % self.equation
+                error_msg_output = "Line: y_intercept cannot be found for %s!" % self.equation
                 print(error_msg_output)
                 e.args += (error_msg_output,)
                 raise
 
         return b
 
-    def get_x_intercept(self):
+    def _parse_x_intercept(self):
         '''
-        find x-intercept given self.equation
+        parse x-intercept from self.equation, must be called after the slope and y-intercept are parsed
         :return: float representing x_intercept
         '''
         # parse the equation
@@ -125,7 +237,7 @@ class Line(object):
         if x_index < 0:
             # if x is not found in the equation, then it must not be crossing the x-axis, i.e. y=5
             x_inter = "DNE"
-        elif (self.get_slope() == 0):
+        elif (self._slope == 0):
             x_inter = "DNE"
         else:
 
@@ -134,13 +246,13 @@ class Line(object):
                 x_intercept = self.equation[equals_index + 1:]
             else:
                 # find x intercept by setting y to 0 i.e. 0 = 4x+6 and isolating x, i.e. x= -6/4
-                x_intercept = (-self.get_y_intercept()) / self.get_slope()
+                x_intercept = (-self._y_intercept) / self._slope
 
             try:
                 x_inter = float(x_intercept)
             except ValueError as e:
                 # reraise it with custom message
-                error_msg_output = "get_x_intercept: x_intercept cannot be found!" % self.equation
+                error_msg_output = "Line: x_intercept cannot be found for %s!" % self.equation
                 print(error_msg_output)
                 e.args += (error_msg_output,)
                 raise
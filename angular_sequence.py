@@ -0,0 +1,121 @@
+import numpy as np
+
+
+def encode_angular_sequence(point_array, center, tolerance=0.01):
+    '''
+    encode points as the cyclic sequence of their angles around a center, for finding mirror axes through the center
+    by string matching
+
+    the points are sorted by angle around the center. points less than about tolerance apart in angle are one class,
+    and the sequence alternates the radii of each class with the angle gap to the next class: R_0, g_0, R_1, g_1, ...,
+    R_m-1, g_m-1. radii are quantized by tolerance, and gaps between the mean angles of the classes by about tolerance
+    at the farthest point, so equal values are equal symbols. gaps are quantized rather than angles, since a reflection
+    keeps the gaps but not where the angles fall on a grid. points within tolerance of the center are on every axis
+    through it and are left out. the symbols are integer ids, radii and gaps never share an id
+
+    :param point_array: array of shape (N, 2) of distinct points
+    :param center: tuple (x, y), i.e. the centroid of the points
+    :param tolerance: resolution of the radii, and of the angles at the farthest point
+    :return: tuple (classes, sequence). classes is a list of arrays of indices into point_array, one for each class in
+        angular order, each sorted by radius. sequence is a list of 2 * len(classes) integers
+    '''
+
+    dx = point_array[:, 0] - center[0]
+    dy = point_array[:, 1] - center[1]
+    radii = np.hypot(dx, dy)
+
+    off_center = np.flatnonzero(radii > tolerance)
+    if len(off_center) == 0:
+        return [], []
+
+    # an angle step moves the farthest point by about the tolerance
+    angle_resolution = tolerance / radii[off_center].max()
+    quantized_radii = np.rint(radii[off_center] / tolerance).astype(np.int64)
+
+    angles = np.arctan2(dy[off_center], dx[off_center]) % (2 * np.pi)
+    order = np.argsort(angles, kind="stable")
+    sorted_angles = angles[order]
+
+    # a class starts where the gap from the angle before it, around the circle, is over the resolution
+    cyclic_gaps = np.diff(sorted_angles, prepend=sorted_angles[-1] - 2 * np.pi)
+    starts = np.flatnonzero(cyclic_gaps > angle_resolution)
+    if len(starts) == 0:
+        # every point is at about the same angle
+        starts = np.array([0])
+    else:
+        # begin at a class start, so no class wraps around the circle, and unwrap the angles after it
+        order = np.roll(order, -starts[0])
+        sorted_angles = np.roll(sorted_angles, -starts[0])
+        sorted_angles[len(sorted_angles) - starts[0]:] += 2 * np.pi
+        starts = starts - starts[0]
+    stops = np.r_[starts[1:], len(order)]
+
+    class_angles = np.add.reduceat(sorted_angles, starts) / (stops - starts)
+    gaps = np.diff(class_angles, append=class_angles[0] + 2 * np.pi)
+    quantized_gaps = np.rint(gaps / angle_resolution).astype(np.int64)
+
+    # same radii, or same gap, same symbol id
+    symbol_ids = {}
+    classes = []
+    sequence = []
+    for start, stop, gap in zip(starts.tolist(), stops.tolist(), quantized_gaps.tolist()):
+        class_points = order[start:stop]
+        class_points = class_points[np.argsort(quantized_radii[class_points], kind="stable")]
+        classes.append(off_center[class_points])
+        sequence.append(symbol_ids.setdefault(("radii", tuple(quantized_radii[class_points].tolist())),
+                                              len(symbol_ids)))
+        sequence.append(symbol_ids.setdefault(("gap", gap), len(symbol_ids)))
+
+    return classes, sequence
+
+
+def find_occurrences(text, pattern):
+    '''
+    find every occurrence of a pattern in a text with the Knuth-Morris-Pratt algorithm, in O(len(text) + len(pattern))
+
+    :param text: list of symbols
+    :param pattern: list of symbols, not empty
+    :return: list of the start indices of the occurrences in text, overlapping ones included
+    '''
+
+    # prefix function, longest proper prefix of pattern[:i + 1] that is also a suffix of it
+    prefix = [0] * len(pattern)
+    k = 0
+    for i in range(1, len(pattern)):
+        while k and pattern[i] != pattern[k]:
+            k = prefix[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        prefix[i] = k
+
+    occurrences = []
+    k = 0
+    for i, symbol in enumerate(text):
+        while k and symbol != pattern[k]:
+            k = prefix[k - 1]
+        if symbol == pattern[k]:
+            k += 1
+        if k == len(pattern):
+            occurrences.append(i - k + 1)
+            k = prefix[k - 1]
+
+    return occurrences
+
+
+def mirror_axes(sequence):
+    '''
+    find the mirror axes of a cyclic sequence from encode_angular_sequence(). a reflection reverses the angular order,
+    so each axis is a rotation of the sequence equal to its reverse, found with find_occurrences() of the reverse in
+    the sequence repeated twice
+
+    :param sequence: list of symbols R_0, g_0, ..., R_m-1, g_m-1
+    :return: list of sequence indices p in [0, m), one for each axis. an even p = 2k means the axis goes along the
+        ray of class k, an odd p = 2k + 1 means it splits the gap between class k and class k + 1
+    '''
+
+    if not sequence:
+        return []
+
+    # an occurrence at j maps sequence index p onto j - 1 - p, so it fixes index (j - 1) / 2, and that index plus m.
+    # radii are at even indices and gaps at odd ones, so only odd j can map radii onto radii
+    return [(j - 1) // 2 for j in find_occurrences(sequence + sequence[:-1], sequence[::-1]) if j % 2 == 1]
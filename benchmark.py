@@ -0,0 +1,377 @@
+# benchmark the public functions over a sweep of sizes, i.e.
+#   python benchmark.py --save baseline.json
+#   python benchmark.py --compare baseline.json --threshold 0.2
+#   python benchmark.py --imports-only
+#   python benchmark.py --checks
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+from computation import calculate_symmetry_cartesian, calculate_reflection_cartesian, get_line
+from get_reflection_point import get_reflection_point
+from get_symmetry_line import get_symmetry_line, iter_symmetry_lines, find_valid_symmetry_lines, score_symmetry_lines
+from Line import Line
+from reflection_engine import reflect_points, reflect_points_chain
+
+# number of points to run each benchmark with
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+
+# lines of symmetry the reflection benchmarks reflect over
+REFLECTION_LINES = ["x-axis", "y-axis", "y=2x+3", "y=-0.5x-1", "x=4", "y=7"]
+
+# modules whose import time is measured in a fresh interpreter
+IMPORT_MODULES = ("get_symmetry_line", "get_reflection_point")
+
+# seconds importing each of IMPORT_MODULES may take, numpy alone takes about 0.1 s
+IMPORT_BUDGET = 0.5
+
+# modules only the output backends and worker pools use, importing IMPORT_MODULES must not load them
+LAZY_MODULES = ("matplotlib", "concurrent.futures")
+
+
+def random_points(n, seed=0):
+    '''
+    :param n: number of points
+    :param seed: seed of the random generator, the same seed gives the same points
+    :return: list of n distinct-looking random points (x, y) in [-100, 100)
+    '''
+    rng = np.random.default_rng(seed)
+    return [tuple(point) for point in rng.uniform(-100, 100, (n, 2)).round(3).tolist()]
+
+
+def mirrored_points(n, seed=0):
+    '''
+    :param n: number of points, rounded down to an even number
+    :param seed: seed of the random generator, the same seed gives the same points
+    :return: list of random points (x, y) with x > 0 and their reflections over x=0, so there is a line of symmetry
+    '''
+    rng = np.random.default_rng(seed)
+    half = rng.uniform(1, 100, (max(n // 2, 1), 2)).round(3)
+    return [tuple(point) for point in half.tolist()] + [(-x, y) for x, y in half.tolist()]
+
+
+def _pairs(points):
+    # consecutive pairs of points, one pair per point
+    return list(zip(points, points[1:] + points[:1]))
+
+
+# benchmarks by name, as (make input from n, run on the input, order of growth in n). the order is used to skip sizes
+# that would take longer than the time budget
+BENCHMARKS = {
+    "get_symmetry_line": (
+        random_points, lambda points: get_symmetry_line(points, visualize=False), 2),
+    "get_symmetry_line[array]": (
+        random_points, lambda points: get_symmetry_line(points, visualize=False, output_format="array"), 2),
+    "iter_symmetry_lines": (
+        random_points, lambda points: deque(iter_symmetry_lines(points), maxlen=0), 2),
+    "find_valid_symmetry_lines[pairwise]": (
+        mirrored_points, lambda points: find_valid_symmetry_lines(points, visualize=False, engine="pairwise"), 3),
+    "find_valid_symmetry_lines[centroid]": (
+        mirrored_points, lambda points: find_valid_symmetry_lines(points, visualize=False, engine="centroid"), 2),
+    "find_valid_symmetry_lines[voting]": (
+        mirrored_points, lambda points: find_valid_symmetry_lines(points, visualize=False, engine="voting"), 2),
+    "find_valid_symmetry_lines[angular]": (
+        mirrored_points, lambda points: find_valid_symmetry_lines(points, visualize=False, engine="angular"), 1),
+    "score_symmetry_lines": (
+        mirrored_points, lambda points: score_symmetry_lines(points, "Cartesian"), 2),
+    "get_reflection_point": (
+        random_points, lambda points: get_reflection_point(points, REFLECTION_LINES, visualize=False), 1),
+    "reflect_points": (
+        lambda n: np.array(random_points(n)), lambda points: reflect_points(points, [Line("y=2x+3"), Line("x=4")]), 1),
+    "reflect_points_chain": (
+        lambda n: np.array(random_points(n)), lambda points: reflect_points_chain(points, REFLECTION_LINES), 1),
+    "calculate_symmetry_cartesian": (
+        lambda n: _pairs(random_points(n)), lambda pairs: [calculate_symmetry_cartesian(*pair) for pair in pairs], 1),
+    "calculate_reflection_cartesian": (
+        random_points, lambda points: [calculate_reflection_cartesian(point, Line("y=2x+3")) for point in points], 1),
+    "get_line": (
+        lambda n: _pairs(random_points(n)), lambda pairs: [get_line(*pair) for pair in pairs], 1),
+}
+
+
+def time_call(function, argument, repeat=3, min_seconds=0.2):
+    '''
+    time a function, best of repeat runs. runs slower than min_seconds are only timed once
+
+    :param function: function to time, called as function(argument)
+    :param argument: argument of the function
+    :param repeat: largest number of runs
+    :param min_seconds: stop repeating once a run takes this long
+    :return: float, fastest run in seconds
+    '''
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        if elapsed >= min_seconds:
+            break
+
+    return best
+
+
+def peak_memory(function, argument):
+    '''
+    :param function: function to measure, called as function(argument)
+    :param argument: argument of the function
+    :return: int, peak bytes allocated by Python and NumPy during the call, over what was allocated before
+    '''
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        function(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak - start
+
+
+def check_parallel_memory():
+    '''
+    iter_symmetry_lines() with workers keeps only a few row blocks of Line objects in flight, so its peak memory stays
+    about the same with 9 times as many pairs
+
+    :return: None if the check passes, otherwise a message of what failed
+    '''
+    from parallel_pairs import iter_symmetry_lines_parallel
+
+    def consume(points):
+        deque(iter_symmetry_lines_parallel(points, 2, block_pairs=1000), maxlen=0)
+
+    peaks = [peak_memory(consume, random_points(n)) for n in (200, 600)]
+    if peaks[1] > 1.5 * peaks[0]:
+        return "peak memory grew from %d to %d bytes with 9 times the pairs" % tuple(peaks)
+
+    return None
+
+
+def check_near_vertical_axis():
+    '''
+    the centroid of points mirrored across a vertical axis is off the axis by float noise, the centroid engine still
+    finds the vertical line and not a line with a huge slope
+
+    :return: None if the check passes, otherwise a message of what failed
+    '''
+    from get_symmetry_line import find_valid_symmetry_lines
+
+    points = [(13.089327, 3.066523), (4.629047000000001, 3.066523), (8.859187, -12.262575), (8.859187, -7.606002)]
+    lines = find_valid_symmetry_lines(points, engine="centroid")
+    if lines != ["x=8.859187"]:
+        return "found %r instead of ['x=8.859187']" % lines
+
+    return None
+
+
+def check_index_moves():
+    '''
+    moving the points of a SymmetryIndex many times reuses the slots of its grid, so the grid stays the size of the
+    points
+
+    :return: None if the check passes, otherwise a message of what failed
+    '''
+    from symmetry_index import SymmetryIndex
+
+    index = SymmetryIndex()
+    point_ids = [index.add(point) for point in random_points(100)]
+    for move_i, point in enumerate(random_points(10000, seed=1)):
+        index.move(point_ids[move_i % len(point_ids)], point)
+    slots = len(index._grid._coordinates)
+    if slots > len(point_ids):
+        return "grid has %d slots for %d points after 10000 moves" % (slots, len(point_ids))
+
+    return None
+
+
+# regression checks run by --checks, by name
+CHECKS = {
+    "parallel_memory": check_parallel_memory,
+    "near_vertical_axis": check_near_vertical_axis,
+    "index_moves": check_index_moves,
+}
+
+
+def run_checks(names):
+    '''
+    :param names: names of the checks in CHECKS to run
+    :return: True if any check failed
+    '''
+
+    failed = False
+    for name in names:
+        message = CHECKS[name]()
+        print("%-40s %s" % ("check " + name, "ok" if message is None else "FAILED: " + message))
+        failed = failed or message is not None
+
+    return failed
+
+
+def import_time(module_name):
+    '''
+    :param module_name: name of the module to import
+    :return: tuple (float, list), seconds to import the module in a fresh interpreter, and the LAZY_MODULES the
+        import loaded
+    '''
+
+    code = ("import json, sys, time; start = time.perf_counter(); import %s; seconds = time.perf_counter() - start; "
+            "print(json.dumps([seconds, [name for name in %r if name in sys.modules]]))" % (module_name, LAZY_MODULES))
+    # run next to this file so the modules of the project are found
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+
+    seconds, loaded = json.loads(output.splitlines()[-1])
+    return seconds, loaded
+
+
+def check_imports(budget=IMPORT_BUDGET):
+    '''
+    time the import of each of IMPORT_MODULES in a fresh interpreter, and check it is within the budget without
+    loading any of LAZY_MODULES
+
+    :param budget: seconds each import may take, None to only check LAZY_MODULES
+    :return: tuple (dictionary of module name and seconds to import it, True if any module failed the check)
+    '''
+
+    imports = {}
+    failed = False
+    for module_name in IMPORT_MODULES:
+        imports[module_name], loaded = import_time(module_name)
+        print("%-40s %10.6f s" % ("import " + module_name, imports[module_name]))
+        if budget is not None and imports[module_name] > budget:
+            print("  over the import budget of %.3f s" % budget)
+            failed = True
+        if loaded:
+            print("  loads %s, which must only be imported when used" % ", ".join(loaded))
+            failed = True
+
+    return imports, failed
+
+
+def run_benchmarks(names, sizes, max_seconds=10.0, repeat=3, memory=True):
+    '''
+    run each benchmark for each size, smallest first. a size is skipped when the last size run, grown by the order of
+    the benchmark, is expected to take longer than max_seconds
+
+    :param names: names of benchmarks to run, keys of BENCHMARKS
+    :param sizes: numbers of points to run each benchmark with
+    :param max_seconds: time budget of a single run
+    :param repeat: number of timed runs of each size, the fastest is kept
+    :param memory: also measure peak memory, in one more run
+    :return: dictionary {name: {n: {"seconds": float, "peak_bytes": int}}}, n as a string for JSON
+    '''
+
+    results = {}
+    for name in names:
+        make_input, function, order = BENCHMARKS[name]
+        results[name] = {}
+        last_n = last_seconds = None
+        for n in sorted(sizes):
+            if last_n is not None and last_seconds * (float(n) / last_n) ** order > max_seconds:
+                print("%-40s n=%-7d skipped, expected over %.0f s" % (name, n, max_seconds))
+                continue
+
+            argument = make_input(n)
+            seconds = time_call(function, argument, repeat)
+            result = {"seconds": seconds}
+            if memory:
+                result["peak_bytes"] = peak_memory(function, argument)
+            results[name][str(n)] = result
+            last_n, last_seconds = n, seconds
+
+            print("%-40s n=%-7d %10.6f s %12s" % (name, n, seconds,
+                                                   "%.1f MiB" % (result["peak_bytes"] / 2.0 ** 20) if memory else ""))
+
+    return results
+
+
+def compare_results(baseline, results, threshold=0.2):
+    '''
+    find runs slower, or using more peak memory, than the baseline by more than the threshold
+
+    :param baseline: results of an earlier run_benchmarks(), i.e. loaded from a JSON baseline
+    :param results: results of run_benchmarks()
+    :param threshold: allowed growth, 0.2 is 20% over the baseline
+    :return: list of tuples (name, n, measure, baseline value, new value) for each regression
+    '''
+
+    regressions = []
+    for name, sizes in results.items():
+        for n, result in sizes.items():
+            baseline_result = baseline.get(name, {}).get(n)
+            if baseline_result is None:
+                continue
+            for measure in ("seconds", "peak_bytes"):
+                if measure in result and baseline_result.get(measure) and \
+                        result[measure] > baseline_result[measure] * (1 + threshold):
+                    regressions.append((name, n, measure, baseline_result[measure], result[measure]))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark the public functions over a sweep of sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="numbers of points to run")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS),
+                        help="benchmarks to run, all by default")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="skip sizes expected to take longer")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of each size, the fastest is kept")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure peak memory")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET,
+                        help="fail if importing a public module takes longer, in seconds")
+    parser.add_argument("--imports-only", action="store_true",
+                        help="only check the import time and lazy imports of the public modules, without the sweep")
+    parser.add_argument("--checks", nargs="*", choices=sorted(CHECKS), default=None,
+                        help="only run these regression checks, all of them if none are given, without the sweep")
+    parser.add_argument("--save", help="write the results to this JSON file, to use as a baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare the results with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed growth over the baseline, 0.2 is 20%%")
+    args = parser.parse_args(argv)
+
+    if args.checks is not None:
+        return 1 if run_checks(args.checks or sorted(CHECKS)) else 0
+
+    imports, failed = check_imports(args.import_budget)
+    if args.imports_only:
+        return 1 if failed else 0
+
+    results = run_benchmarks(args.only, args.sizes, args.max_seconds, args.repeat, not args.no_memory)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"created": datetime.now(timezone.utc).isoformat(),
+                       "python": platform.python_version(),
+                       "numpy": np.__version__,
+                       "machine": platform.platform(),
+                       "imports": imports,
+                       "results": results}, f, indent=2)
+        print("saved baseline to %s" % args.save)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline["results"], results, args.threshold)
+        for name, n, measure, before, after in regressions:
+            print("REGRESSION %s n=%s %s: %g -> %g (%+.0f%%)" % (name, n, measure, before, after,
+                                                                100.0 * (after / before - 1)))
+        if regressions:
+            failed = True
+        else:
+            print("no regressions over %.0f%% against %s" % (100 * args.threshold, args.compare))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
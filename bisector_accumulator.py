@@ -0,0 +1,301 @@
+import numpy as np
+from math import atan2, hypot, pi
+from computation import calculate_symmetry_cartesian
+from reflection_engine import to_point_array
+
+
+class BisectorAccumulator(object):
+    """
+    A class used to count how many pairs of points share the same perpendicular bisector, like a Hough transform.
+    Each bisector is put in a bucket by its quantized canonical (angle, offset), and every pair of points votes for
+    the bucket of its bisector.
+
+    ...
+
+    Attributes
+    ----------
+    angle_resolution : float
+        width of an angle bucket, in radians
+    offset_resolution : float
+        width of an offset bucket, the offset being the signed distance from the origin to the line
+    origin : tuple
+        point (x, y) the offsets are measured from, i.e. the centroid of the points
+
+    Methods
+    -------
+    add_pair(point1, point2)
+        vote for the bisector of two points
+
+    add_points(points)
+        vote for the bisector of every pair of the given points
+
+    get_votes(key)
+        number of pairs that voted for a bucket
+
+    get_support(key)
+        number of pairs that voted for a bucket or one of its neighbouring buckets
+
+    get_line(key)
+        bisector of the first pair of points that voted for a bucket
+
+    get_bisectors(keys)
+        array of the coefficients (a, b, c) of get_line() for many buckets at once
+
+    supports(min_support=1)
+        list of (key, support) for each bucket, ordered by support
+
+    candidates(min_support=1)
+        list of (key, Line, support) for each bucket, ordered by support
+    """
+
+    def __init__(self, angle_resolution=1e-4, offset_resolution=0.01, origin=(0.0, 0.0)):
+        ########################
+        ### parameters check ###
+        ########################
+
+        try:
+            self.angle_resolution = float(angle_resolution)
+            self.offset_resolution = float(offset_resolution)
+            self.origin = (float(origin[0]), float(origin[1]))
+        except (ValueError, TypeError, IndexError) as e:
+            # reraise it with custom message
+            error_msg_output = "BisectorAccumulator: resolutions and origin must be numbers!"
+            print(error_msg_output)
+            e.args += (error_msg_output,)
+            raise
+
+        if self.angle_resolution <= 0 or self.offset_resolution <= 0:
+            raise ValueError("BisectorAccumulator: angle_resolution and offset_resolution must be greater than 0.")
+
+        # number of angle buckets in [0, pi), the bucket at pi is the same as the bucket at 0
+        self._angle_buckets = int(round(pi / self.angle_resolution))
+
+        # votes and the first pair of points that voted, for each bucket
+        self._votes = {}
+        self._pairs = {}
+
+    def _key(self, a, b, c):
+        # canonical direction of the normal (a, b) has an angle in [0, pi)
+        angle = atan2(b, a)
+        if angle < 0 or angle >= pi:
+            a, b, c = -a, -b, -c
+            angle = atan2(b, a)
+
+        offset = (a * self.origin[0] + b * self.origin[1] + c) / hypot(a, b)
+
+        angle_key = int(round(angle / self.angle_resolution))
+        offset_key = int(round(offset / self.offset_resolution))
+
+        # an angle rounded up to pi is the same line as angle 0, with the offset flipped
+        if angle_key >= self._angle_buckets:
+            return (0, -offset_key)
+
+        return (angle_key, offset_key)
+
+    def _keys(self, a, b, c):
+        # vectorized _key() for arrays of coefficients
+        angle = np.arctan2(b, a)
+        flip = (angle < 0) | (angle >= pi)
+        sign = np.where(flip, -1.0, 1.0)
+        a, b, c = a * sign, b * sign, c * sign
+        angle = np.where(flip, np.arctan2(b, a), angle)
+
+        offset = (a * self.origin[0] + b * self.origin[1] + c) / np.hypot(a, b)
+
+        angle_keys = np.rint(angle / self.angle_resolution).astype(np.int64)
+        offset_keys = np.rint(offset / self.offset_resolution).astype(np.int64)
+
+        wrap = angle_keys >= self._angle_buckets
+        angle_keys[wrap] = 0
+        offset_keys[wrap] = -offset_keys[wrap]
+
+        return angle_keys.tolist(), offset_keys.tolist()
+
+    def get_key(self, line):
+        '''
+        get the bucket of a line
+
+        :param line: Line object
+        :return: tuple (angle_key, offset_key)
+        '''
+        return self._key(*line.get_coefficients())
+
+    def add_pair(self, point1, point2):
+        '''
+        vote for the perpendicular bisector of two points. the same point twice has no bisector and is skipped
+
+        :param point1: tuple or list of one point (x, y), i.e. (23,-45.67)
+        :param point2: tuple or list of one point (x, y), i.e. (25,-45.67)
+        :return: tuple (angle_key, offset_key) of the bucket voted for, None if skipped
+        '''
+
+        x1, y1 = float(point1[0]), float(point1[1])
+        x2, y2 = float(point2[0]), float(point2[1])
+        if x1 == x2 and y1 == y2:
+            return None
+
+        # bisector: normal is the direction between the points, and it goes through the midpoint
+        a = x2 - x1
+        b = y2 - y1
+        c = -(a * (x1 + x2) / 2 + b * (y1 + y2) / 2)
+
+        key = self._key(a, b, c)
+        self._vote(key, (x1, y1), (x2, y2))
+
+        return key
+
+    def add_points(self, points):
+        '''
+        vote for the perpendicular bisector of every pair of the given points, one row of pairs at a time
+
+        :param points: list of points (x, y), or an array of shape (N, 2), i.e. [(23,-45.67), (25,-45.67)]
+        :return: None
+        '''
+
+        point_array = to_point_array(points)
+        point_list = point_array.tolist()
+
+        for point_i in range(len(point_array) - 1):
+            others = point_array[point_i + 1:]
+
+            a = others[:, 0] - point_array[point_i, 0]
+            b = others[:, 1] - point_array[point_i, 1]
+            c = -(a * (others[:, 0] + point_array[point_i, 0]) / 2 + b * (others[:, 1] + point_array[point_i, 1]) / 2)
+
+            # the same point twice has no bisector
+            keep = (a != 0) | (b != 0)
+            angle_keys, offset_keys = self._keys(a[keep], b[keep], c[keep])
+            point_js = (np.nonzero(keep)[0] + point_i + 1).tolist()
+
+            for key, point_j in zip(zip(angle_keys, offset_keys), point_js):
+                self._vote(key, point_list[point_i], point_list[point_j])
+
+    def _vote(self, key, point1, point2):
+        votes = self._votes.get(key)
+        if votes is None:
+            self._votes[key] = 1
+            self._pairs[key] = (tuple(point1), tuple(point2))
+        else:
+            self._votes[key] = votes + 1
+
+    def _neighbour_keys(self, key):
+        # the bucket and its 8 neighbours, wrapping the angle around pi
+        angle_key, offset_key = key
+        for d_angle in (-1, 0, 1):
+            for d_offset in (-1, 0, 1):
+                neighbour_angle = angle_key + d_angle
+                neighbour_offset = offset_key + d_offset
+                if neighbour_angle < 0 or neighbour_angle >= self._angle_buckets:
+                    neighbour_angle %= self._angle_buckets
+                    neighbour_offset = -neighbour_offset
+                yield (neighbour_angle, neighbour_offset)
+
+    def get_votes(self, key):
+        '''
+        :param key: tuple (angle_key, offset_key) of a bucket
+        :return: number of pairs of points that voted for the bucket
+        '''
+        return self._votes.get(key, 0)
+
+    def get_support(self, key):
+        '''
+        count the votes of a bucket and its neighbouring buckets. a bisector close to the edge of a bucket can be
+        rounded into a neighbouring one, so this is the most pairs of points that can share the line of the bucket
+
+        :param key: tuple (angle_key, offset_key) of a bucket
+        :return: number of pairs of points that voted for the bucket or its neighbours
+        '''
+        return sum(self._votes.get(neighbour, 0) for neighbour in set(self._neighbour_keys(key)))
+
+    def get_line(self, key):
+        '''
+        :param key: tuple (angle_key, offset_key) of a bucket
+        :return: Line object, the bisector of the first pair of points that voted for the bucket
+        '''
+        return calculate_symmetry_cartesian(*self._pairs[key])
+
+    def get_bisectors(self, keys):
+        '''
+        get the bisectors of many buckets at once, without making a Line object for each
+
+        :param keys: list of tuples (angle_key, offset_key) of buckets
+        :return: numpy array of shape (K, 3), (a, b, c) with a*x + b*y + c = 0 for the bisector of the first pair of
+            points that voted for each bucket, the same line as get_line() but not scaled like Line.get_coefficients()
+        '''
+
+        pairs = np.array([self._pairs[key] for key in keys], dtype=float).reshape(-1, 2, 2)
+        point1 = pairs[:, 0]
+        point2 = pairs[:, 1]
+
+        # normal is the direction between the points, and it goes through the midpoint
+        normals = point2 - point1
+        c = -(normals * (point1 + point2) / 2).sum(axis=1)
+
+        return np.column_stack((normals, c))
+
+    def supports(self, min_support=1):
+        '''
+        get the support of each bucket, ordered by support, most first
+
+        :param min_support: leave out buckets with less support
+        :return: list of tuples (key, support)
+        '''
+
+        keys = list(self._votes)
+        support_array = self._supports(keys)
+
+        # most support first, buckets with the same support in the order they were first voted for
+        order = np.argsort(-support_array, kind="stable")
+        order = order[support_array[order] >= min_support]
+
+        return [(keys[i], support) for i, support in zip(order.tolist(), support_array[order].tolist())]
+
+    def _supports(self, keys):
+        # vectorized get_support() for every bucket, each bucket and neighbour is coded as one integer to look it up
+        if not keys:
+            return np.zeros(0, dtype=np.int64)
+
+        key_array = np.array(keys, dtype=np.int64).reshape(-1, 2)
+        votes = np.array([self._votes[key] for key in keys], dtype=np.int64)
+        offset_min = int(key_array[:, 1].min())
+        width = int(key_array[:, 1].max()) - offset_min + 1
+
+        # with less than 3 angle buckets two neighbours can be the same bucket, and huge offsets overflow the codes
+        if self._angle_buckets < 3 or self._angle_buckets * width >= 2 ** 62:
+            return np.array([self.get_support(key) for key in keys], dtype=np.int64)
+
+        codes = key_array[:, 0] * width + (key_array[:, 1] - offset_min)
+        order = np.argsort(codes)
+        sorted_codes = codes[order]
+        sorted_votes = votes[order]
+
+        supports = np.zeros(len(keys), dtype=np.int64)
+        for d_angle in (-1, 0, 1):
+            for d_offset in (-1, 0, 1):
+                # the same wrapping of the angle around pi as _neighbour_keys()
+                neighbour_angles = key_array[:, 0] + d_angle
+                neighbour_offsets = key_array[:, 1] + d_offset
+                wrap = (neighbour_angles < 0) | (neighbour_angles >= self._angle_buckets)
+                neighbour_angles %= self._angle_buckets
+                neighbour_offsets[wrap] = -neighbour_offsets[wrap]
+
+                # offsets outside the range of the buckets have no votes
+                inside = np.flatnonzero((neighbour_offsets >= offset_min) & (neighbour_offsets < offset_min + width))
+                neighbour_codes = neighbour_angles[inside] * width + (neighbour_offsets[inside] - offset_min)
+                found = np.minimum(np.searchsorted(sorted_codes, neighbour_codes), len(sorted_codes) - 1)
+                hit = sorted_codes[found] == neighbour_codes
+                supports[inside[hit]] += sorted_votes[found[hit]]
+
+        return supports
+
+    def candidates(self, min_support=1):
+        '''
+        get a line for each bucket with its support, ordered by support, most first
+
+        :param min_support: leave out buckets with less support
+        :return: list of tuples (key, Line, support)
+        '''
+        return [(key, self.get_line(key), support) for key, support in self.supports(min_support)]
+
+    def __len__(self):
+        return len(self._votes)
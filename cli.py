@@ -0,0 +1,338 @@
+# command line batch runner, i.e.
+#   python cli.py symmetry shapes/*.csv --output results
+#   python cli.py valid shapes.ndjson --engine voting --workers 8 --output results
+#   python cli.py reflect points.npy --lines "y=2x+3" x-axis --output results
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from get_reflection_point import get_reflection_point
+from get_symmetry_line import get_symmetry_line, find_valid_symmetry_lines, ENGINE_OPTIONS
+from output_backends import FILE_FORMAT_OPTIONS
+
+# subcommands of the command line
+COMMAND_OPTIONS = {"symmetry", "valid", "reflect"}
+
+# file extensions of inputs, a CSV or .npy file holds one job (or one per slice of a 3D array), an NDJSON file one
+# job per line
+INPUT_EXTENSIONS = {".csv", ".ndjson", ".jsonl", ".npy"}
+
+# with workers, jobs are sent to the worker processes in chunks of about this many points (each job counts one more),
+# so sending many small jobs costs little next to running them, while a large job is sent on its own
+JOB_CHUNK_POINTS = 1 << 14
+
+# with workers, chunks of jobs in flight for each worker, so the jobs read ahead of the workers stay bounded
+CHUNKS_PER_WORKER = 2
+
+
+def expand_inputs(patterns):
+    '''
+    :param patterns: file paths or glob patterns, i.e. ["shapes/*.csv", "more.ndjson"]
+    :return: generator of the matching file paths, in the order given, each pattern's matches sorted. a pattern that
+        matches no file is given as it is, so it is reported as a failed job by iter_jobs()
+    '''
+
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        for path in matches or [pattern]:
+            yield path
+
+
+def read_csv_points(path):
+    '''
+    :param path: CSV file with one point per row, x then y, with or without a header row
+    :return: list of points (x, y)
+    '''
+
+    points = []
+    with open(path, newline="") as f:
+        for row_i, row in enumerate(csv.reader(f)):
+            if not row:
+                continue
+            try:
+                points.append((float(row[0]), float(row[1])))
+            except (ValueError, IndexError) as e:
+                # the first row can be a header
+                if row_i == 0:
+                    continue
+                # reraise it with custom message
+                error_msg_output = "read_csv_points: row %d of %s is not a point x,y!" % (row_i + 1, path)
+                print(error_msg_output)
+                e.args += (error_msg_output,)
+                raise
+
+    return points
+
+
+def read_lines_file(path):
+    '''
+    :param path: text or CSV file with one equation per line in its first column, i.e. y=2x+3 or x-axis
+    :return: list of equations
+    '''
+
+    with open(path, newline="") as f:
+        return [row[0].strip() for row in csv.reader(f) if row and row[0].strip()]
+
+
+def iter_jobs(paths):
+    '''
+    read the jobs of the input files. a file, or a line of an NDJSON file, that cannot be read is a failed job, so one
+    bad input does not stop the batch
+
+    a CSV file is one job, its points. a .npy file of shape (N, 2) is one job, and of shape (K, N, 2) is K jobs.
+    each line of an NDJSON file is one job, either a list of points or an object {"points": [...]} with an optional
+    "id" and, for reflect, an optional list of "lines"
+
+    :param paths: input file paths
+    :return: generator of (job_id, points, lines, error) tuples, lines is None unless the job gives its own. error is
+        None unless the job cannot be read, then points is None
+    '''
+
+    for path in paths:
+        name, extension = os.path.splitext(os.path.basename(path))
+        extension = extension.lower()
+
+        try:
+            if extension == ".csv":
+                yield name, read_csv_points(path), None, None
+
+            elif extension == ".npy":
+                array = np.load(path)
+                if array.ndim == 2:
+                    yield name, [tuple(point) for point in array.tolist()], None, None
+                elif array.ndim == 3:
+                    for job_i, job_points in enumerate(array.tolist()):
+                        yield "%s-%d" % (name, job_i), [tuple(point) for point in job_points], None, None
+                else:
+                    raise ValueError("iter_jobs: %s has shape %r, it must be (N, 2) or (K, N, 2)."
+                                     % (path, array.shape))
+
+            elif extension in (".ndjson", ".jsonl"):
+                with open(path) as f:
+                    for line_i, line in enumerate(f):
+                        if not line.strip():
+                            continue
+                        yield _read_ndjson_job("%s-%d" % (name, line_i + 1), line)
+
+            else:
+                raise ValueError("iter_jobs: %s must have one of the extensions %r."
+                                 % (path, sorted(INPUT_EXTENSIONS)))
+        except (OSError, ValueError, IndexError) as e:
+            yield name, None, None, _format_error(e)
+
+
+def _read_ndjson_job(job_id, line):
+    # (job_id, points, lines, error) of a line of an NDJSON file, see iter_jobs(). job_id is used if the line has no id
+    try:
+        job = json.loads(line)
+        if isinstance(job, list):
+            job = {"points": job}
+        job_id = str(job.get("id", job_id))
+        return job_id, [tuple(point) for point in job["points"]], job.get("lines"), None
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        return job_id, None, None, _format_error(e)
+
+
+def _format_error(e):
+    # error of a job in its summary
+    return "%s: %s" % (type(e).__name__, e)
+
+
+def run_job(command, job_id, points, lines, options, error=None):
+    '''
+    run one job, errors are caught so one bad job does not stop the batch
+
+    :param command: one of COMMAND_OPTIONS
+    :param job_id: name of the job, and of its output directory
+    :param points: list of points (x, y), None if the job cannot be read
+    :param lines: equations to reflect over for reflect, None to use options["lines"]
+    :param options: dictionary of the command line options
+    :param error: why the job cannot be read, see iter_jobs(). the job is not run, only summarized as failed
+    :return: dictionary {"job", "points", "results", "seconds", "output", "error"} summarizing the job
+    '''
+
+    if error is not None:
+        return {"job": job_id, "points": 0, "results": 0, "seconds": 0.0, "output": None, "error": error}
+
+    output_directory = os.path.join(options["output"], job_id) if options["output"] else None
+    summary = {"job": job_id, "points": len(points), "results": 0, "seconds": 0.0, "output": output_directory,
+               "error": None}
+
+    start = time.perf_counter()
+    try:
+        if command == "symmetry":
+            result = get_symmetry_line(points, rounding=options["rounding"], visualize=options["visualize"],
+                                       output_directory=output_directory, output_format="array", headless=True,
+                                       file_format=options["format"])
+        elif command == "valid":
+            result = find_valid_symmetry_lines(points, rounding=options["rounding"], visualize=options["visualize"],
+                                               output_directory=output_directory, tolerance=options["tolerance"],
+                                               relative_tolerance=options["relative_tolerance"],
+                                               engine=options["engine"], headless=True, file_format=options["format"])
+        else:
+            result = get_reflection_point(points, lines or options["lines"], rounding=options["rounding"],
+                                          visualize=options["visualize"], output_directory=output_directory,
+                                          headless=True, file_format=options["format"])
+        summary["results"] = len(result)
+    except Exception as e:
+        summary["error"] = _format_error(e)
+    summary["seconds"] = time.perf_counter() - start
+
+    return summary
+
+
+def _run_job_chunk(chunk):
+    # runs in a worker process of run_jobs()
+    return [run_job(*args) for args in chunk]
+
+
+def run_jobs(command, jobs, options, workers=1):
+    '''
+    run every job, on a pool of worker processes if workers is more than 1. the jobs are read as they are run, with
+    at most CHUNKS_PER_WORKER chunks of jobs in flight for each worker, so the batch does not have to fit in memory
+
+    :param command: one of COMMAND_OPTIONS
+    :param jobs: iterable of (job_id, points, lines, error) tuples, see iter_jobs()
+    :param options: dictionary of the command line options
+    :param workers: number of worker processes
+    :return: generator of job summaries, see run_job(), in the order of the jobs
+    '''
+
+    job_args = _iter_job_args(command, jobs, options)
+
+    if workers <= 1:
+        for args in job_args:
+            yield run_job(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # the chunks are given back in job order
+        pending = deque()
+        for chunk in _iter_job_chunks(job_args):
+            pending.append(executor.submit(_run_job_chunk, chunk))
+            while len(pending) > CHUNKS_PER_WORKER * workers:
+                for summary in pending.popleft().result():
+                    yield summary
+
+        while pending:
+            for summary in pending.popleft().result():
+                yield summary
+
+
+def _iter_job_args(command, jobs, options):
+    # run_job() arguments of each job. job ids name the output directories, so repeated ids get a suffix
+    seen = {}
+    for job_id, points, lines, error in jobs:
+        if job_id in seen:
+            seen[job_id] += 1
+            job_id = "%s-%d" % (job_id, seen[job_id])
+        else:
+            seen[job_id] = 0
+        yield command, job_id, points, lines, options, error
+
+
+def _iter_job_chunks(job_args):
+    # lists of run_job() arguments of about JOB_CHUNK_POINTS points
+    chunk = []
+    chunk_points = 0
+    for args in job_args:
+        chunk.append(args)
+        chunk_points += 1 + (len(args[2]) if args[2] is not None else 0)
+        if chunk_points >= JOB_CHUNK_POINTS:
+            yield chunk
+            chunk = []
+            chunk_points = 0
+
+    if chunk:
+        yield chunk
+
+
+def build_parser():
+    '''
+    :return: argparse.ArgumentParser of the command line
+    '''
+
+    parser = argparse.ArgumentParser(description="find lines of symmetry and reflections for batches of point sets")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    commands = {
+        "symmetry": "line of symmetry of every pair of points of each job",
+        "valid": "valid lines of symmetry of the whole set of points of each job",
+        "reflect": "points of each job reflected over lines of symmetry",
+    }
+    for command in sorted(commands):
+        subparser = subparsers.add_parser(command, help=commands[command])
+        subparser.add_argument("inputs", nargs="+",
+                               help="CSV, NDJSON or .npy files of points, or glob patterns matching them")
+        subparser.add_argument("--output", help="directory for the results, with one directory for each job")
+        subparser.add_argument("--format", choices=sorted(FILE_FORMAT_OPTIONS), default="csv",
+                               help="file format of the results written to --output")
+        subparser.add_argument("--workers", type=int, default=1, help="run the jobs on this many worker processes")
+        subparser.add_argument("--rounding", type=int, default=3, help="number of decimals to round results to")
+        subparser.add_argument("--visualize", action="store_true", help="save plots of the results with the output")
+        subparser.add_argument("--verbose", action="store_true", help="print a line for each job")
+
+        if command == "valid":
+            subparser.add_argument("--engine", choices=sorted(ENGINE_OPTIONS), default="pairwise",
+                                   help="how to find candidate lines of symmetry")
+            subparser.add_argument("--tolerance", type=float, default=0.01,
+                                   help="largest distance between a reflected point and a point to match")
+            subparser.add_argument("--relative-tolerance", type=float, default=None,
+                                   help="tolerance relative to the size of the points, overrides --tolerance")
+
+        if command == "reflect":
+            subparser.add_argument("--lines", nargs="+", default=[],
+                                   help="equations to reflect over, i.e. y=2x+3 x=4 x-axis")
+            subparser.add_argument("--lines-file", help="file with one equation per line, added to --lines")
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    options = {"output": args.output, "format": args.format, "rounding": args.rounding, "visualize": args.visualize,
+               "engine": getattr(args, "engine", None), "tolerance": getattr(args, "tolerance", None),
+               "relative_tolerance": getattr(args, "relative_tolerance", None), "lines": getattr(args, "lines", None)}
+
+    if args.command == "reflect":
+        if args.lines_file:
+            options["lines"] = options["lines"] + read_lines_file(args.lines_file)
+        if not options["lines"]:
+            options["lines"] = ["x-axis"]
+
+    if args.visualize and not args.output:
+        print("--visualize needs --output to save the plots to.", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    jobs = failed = points = results = 0
+    for summary in run_jobs(args.command, iter_jobs(expand_inputs(args.inputs)), options, args.workers):
+        jobs += 1
+        points += summary["points"]
+        results += summary["results"]
+        if summary["error"]:
+            failed += 1
+            print("job %s failed: %s" % (summary["job"], summary["error"]), file=sys.stderr)
+        elif args.verbose:
+            print("job %s: %d points, %d results, %.3f s" % (summary["job"], summary["points"], summary["results"],
+                                                              summary["seconds"]))
+    elapsed = time.perf_counter() - start
+
+    # throughput summary
+    print("%d jobs (%d failed), %d points, %d results in %.2f s: %.1f jobs/s, %.0f points/s" % (
+        jobs, failed, points, results, elapsed, jobs / elapsed if elapsed else 0.0,
+        points / elapsed if elapsed else 0.0))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
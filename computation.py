@@ -15,17 +15,17 @@ def calculate_symmetry_cartesian(point1, point2):
     :return: dictionary representing line of symmetry, i.e. {((23,-45.67), (25,-45.67)): "x=24"}
     '''
 
-    # step 1. find midpoint between two points
-    midpoint = get_midpoint(point1, point2)
+    # step 1. find midpoint between two points, it also checks the points
+    midpoint_x, midpoint_y = get_midpoint(point1, point2)
 
     # step 2. find line that make up the two points
-    line = get_line(point1, point2)
+    slope, _, _ = _line_numbers(float(point1[0]), float(point1[1]), float(point2[0]), float(point2[1]))
 
     # step 3. find the perpendicular slope for that line
-    perpendicular_m = get_perpendicular_slope(line.get_slope())
+    perpendicular_m = get_perpendicular_slope(slope)
 
     # step 4. find perpendicular line that goes through the midpoint
-    line_of_sym = point_slope(midpoint, perpendicular_m)
+    line_of_sym = Line.from_slope_intercept(*_point_slope_numbers(midpoint_x, midpoint_y, perpendicular_m))
 
     return line_of_sym
 
@@ -46,12 +46,21 @@ def calculate_reflection_cartesian(point, line_of_symmetry, rounding=None):
     :return: reflected point
     '''
 
+    if isinstance(line_of_symmetry, Line) is False:
+        raise TypeError("calculate_reflection_cartesian: line of symmetry %r must be a Line object." %
+                        (line_of_symmetry,))
+
+    # the numbers of the lines are passed between the steps, no Line object is created
+    line_numbers = (line_of_symmetry.get_slope(), line_of_symmetry.get_y_intercept(),
+                    line_of_symmetry.get_x_intercept())
+
     # step 1. get line perpendicular to line of symmetry
-    perpendicular_m = get_perpendicular_slope(line_of_symmetry.get_slope())
-    perpendicular_line = point_slope(point, perpendicular_m)
+    perpendicular_m = get_perpendicular_slope(line_numbers[0])
+    point_x, point_y = _point_numbers(point, "calculate_reflection_cartesian")
+    perpendicular_numbers = _point_slope_numbers(point_x, point_y, perpendicular_m)
 
     # step 2. get point where the line of symmetry and perpendicular line intersect
-    midpoint = get_intersection_point(line_of_symmetry, perpendicular_line)
+    midpoint = _intersection_numbers(line_numbers, perpendicular_numbers)
 
     # step 3. find new point equidistant from given point to intersection point along the perpendicular line
     reflected_point = get_endpoint(point, midpoint)
@@ -210,23 +219,7 @@ def get_line(point1, point2):
     ### calculate ###
     #################
 
-    slope_intercept_eq = ""
-    if (x1 - x2 == 0):
-        slope_intercept_eq = "x=%s" % x1
-    else:
-        # y = mx+b
-        # get m
-        m = (y1 - y2) / (x1 - x2)
-        # get b
-        b = (x1 * y2 - x2 * y1) / (x1 - x2)
-
-        # put in string format. if negative, string does not need a '+'
-        if (b >= 0):
-            slope_intercept_eq = "y=%sx+%s" % (m, b)
-        else:
-            slope_intercept_eq = "y=%sx%s" % (m, b)
-
-    return Line(slope_intercept_eq)
+    return Line.from_slope_intercept(*_line_numbers(x1, y1, x2, y2))
 
 
 def point_slope(point, slope):
@@ -262,28 +255,17 @@ def point_slope(point, slope):
     ### calculate ###
     #################
 
-    # it is a straight line of slope does not exist, i.e. x=-2
-    if slope == "DNE":
-        slope_intercept_eq = "x=%s" % x
-    else:
+    if slope != "DNE":
         # parameter check
         try:
-            m = float(slope)
+            slope = float(slope)
         except ValueError as e:
             error_msg_output = "point_slope: input slope %r is invalid!" % slope
             print(error_msg_output)
             e.args += (error_msg_output,)
             raise
 
-        # put in y-intercept form to put get a Line object
-        b = (-x * m) + y
-        # put in string format. if negative, string does not need a '+'
-        if (b >= 0):
-            slope_intercept_eq = "y=%sx+%s" % (m, b)
-        else:
-            slope_intercept_eq = "y=%sx%s" % (m, b)
-
-    return Line(slope_intercept_eq)
+    return Line.from_slope_intercept(*_point_slope_numbers(x, y, slope))
 
 
 def get_intersection_point(line1, line2):
@@ -310,45 +292,17 @@ def get_intersection_point(line1, line2):
     #################
     ### calculate ###
     #################
-    # get line information
-    line1_m = line1.get_slope()
-    line1_b = line1.get_y_intercept()
-
-    line2_m = line2.get_slope()
-    line2_b = line2.get_y_intercept()
-
-    if (line1_m == "DNE" and line1_b == "DNE"):
-        # line 1 is vertical, so intersection point x must be where x-axis intercepts line 1
-        x = line1.get_x_intercept()
 
-        # plug x in to find y
-        y = (line2_m * x) + line2_b
-
-    elif (line2_m == "DNE" and line2_b == "DNE"):
-        # line 2 is vertical, so intersection point x must be where x-axis intercepts line 2
-        x = line2.get_x_intercept()
-        y = line1_m * x + line1_b
-
-    else:
-        # find x by putting constants in one side and x on the other
-        left_m = line1_m - line2_m
-        right_b = line2_b - line1_b
-
-        # isolate x
-        try:
-            x = right_b / left_m
-        except ZeroDivisionError as e:
-            # reraise it with custom message
-            error_msg_output = "get_intersection_point: cannot find intersection points for %s and %s!" % \
-                               (line1.equation, line2.equation)
-            print(error_msg_output)
-            e.args += (error_msg_output,)
-            raise
-
-        # plug x back in line 1 or line 2 to find y
-        y = line1_m * x + line1_b
-
-    return (x, y)
+    try:
+        return _intersection_numbers((line1.get_slope(), line1.get_y_intercept(), line1.get_x_intercept()),
+                                     (line2.get_slope(), line2.get_y_intercept(), line2.get_x_intercept()))
+    except ZeroDivisionError as e:
+        # reraise it with custom message
+        error_msg_output = "get_intersection_point: cannot find intersection points for %s and %s!" % \
+                           (line1.equation, line2.equation)
+        print(error_msg_output)
+        e.args += (error_msg_output,)
+        raise
 
 
 def get_endpoint(point, midpoint):
@@ -405,3 +359,89 @@ def get_endpoint(point, midpoint):
     y = (midpoint_y * 2) - point_y
 
     return (x, y)
+
+
+##############################################################################
+### numeric kernel, lines are (slope, y_intercept, x_intercept) tuples #######
+##############################################################################
+# the steps above pass these tuples between each other, a Line, and its equation string, is only made for results
+
+
+def _point_numbers(point, function_name):
+    # x and y of a point as floats, with the parameter checks of the public functions
+    if isinstance(point, tuple) is False and isinstance(point, list) is False:
+        raise TypeError("%s: input point %r must be a tuple or a list." % (function_name, point))
+
+    try:
+        return float(point[0]), float(point[1])
+    except ValueError as e:
+        # reraise it with custom message
+        error_msg_output = "%s: point %r cannot be found!" % (function_name, point)
+        print(error_msg_output)
+        e.args += (error_msg_output,)
+        raise
+
+
+def _line_numbers(x1, y1, x2, y2):
+    '''
+    line through two points, see get_line()
+
+    :return: tuple (slope, y_intercept, x_intercept), slope and y_intercept are "DNE" if the line is vertical,
+        x_intercept is "DNE" if the line is horizontal
+    '''
+
+    if (x1 - x2 == 0):
+        return ("DNE", "DNE", x1)
+
+    # y = mx+b
+    m = (y1 - y2) / (x1 - x2)
+    b = (x1 * y2 - x2 * y1) / (x1 - x2)
+
+    return (m, b, "DNE" if m == 0 else (-b) / m)
+
+
+def _point_slope_numbers(x, y, slope):
+    '''
+    line through a point with a slope, see point_slope()
+
+    :return: tuple (slope, y_intercept, x_intercept), see _line_numbers()
+    '''
+
+    # it is a straight line of slope does not exist, i.e. x=-2
+    if slope == "DNE":
+        return ("DNE", "DNE", x)
+
+    b = (-x * slope) + y
+
+    return (slope, b, "DNE" if slope == 0 else (-b) / slope)
+
+
+def _intersection_numbers(line1, line2):
+    '''
+    point where two lines intersect, see get_intersection_point()
+
+    :param line1: tuple (slope, y_intercept, x_intercept), see _line_numbers()
+    :param line2: tuple (slope, y_intercept, x_intercept)
+    :return: tuple (x,y), raises ZeroDivisionError if the lines are parallel
+    '''
+
+    line1_m, line1_b, line1_x = line1
+    line2_m, line2_b, line2_x = line2
+
+    if line1_m == "DNE":
+        # line 1 is vertical, so intersection point x must be where x-axis intercepts line 1
+        x = line1_x
+        # plug x in to find y
+        y = (line2_m * x) + line2_b
+
+    elif line2_m == "DNE":
+        # line 2 is vertical, so intersection point x must be where x-axis intercepts line 2
+        x = line2_x
+        y = line1_m * x + line1_b
+
+    else:
+        # find x by putting constants in one side and x on the other, then plug x back in line 1 to find y
+        x = (line2_b - line1_b) / (line1_m - line2_m)
+        y = line1_m * x + line1_b
+
+    return (x, y)
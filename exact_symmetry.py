@@ -0,0 +1,160 @@
+from fractions import Fraction
+from math import gcd
+from numbers import Integral, Rational
+
+
+def to_exact_points(points):
+    '''
+    convert points with integer, Fraction, or exact decimal string coordinates, i.e. (2, Fraction(1, 3)) or
+    ("28.82", "-1.63"), into integer points, scaled by the least common multiple of the denominators. floats are only
+    accepted if they are whole numbers, any other float is not exact
+
+    :param points: tuple or list of points (x, y)
+    :return: tuple (list of integer points (x, y), scale), the integer points are the points times scale
+    '''
+
+    fraction_points = [(_to_fraction(point[0]), _to_fraction(point[1])) for point in points]
+
+    # least common multiple of every denominator
+    scale = 1
+    for x, y in fraction_points:
+        for denominator in (x.denominator, y.denominator):
+            scale = scale * denominator // gcd(scale, denominator)
+
+    return [(int(x * scale), int(y * scale)) for x, y in fraction_points], scale
+
+
+def _to_fraction(value):
+    # exact value of one coordinate
+    if isinstance(value, bool):
+        raise TypeError("to_exact_points: coordinate %r must be an integer, a Fraction or a number string." % value)
+
+    if isinstance(value, Integral):
+        return Fraction(int(value))
+
+    if isinstance(value, Rational):
+        return Fraction(value.numerator, value.denominator)
+
+    if isinstance(value, float) and value.is_integer():
+        return Fraction(int(value))
+
+    if isinstance(value, str):
+        try:
+            return Fraction(value.strip())
+        except ValueError as e:
+            # reraise it with custom message
+            error_msg_output = "to_exact_points: %s is not a valid exact number!" % value
+            print(error_msg_output)
+            e.args += (error_msg_output,)
+            raise
+
+    raise TypeError("to_exact_points: coordinate %r must be an integer, a Fraction or a number string." % (value,))
+
+
+def reduce_line(a, b, c):
+    '''
+    reduce integer coefficients of a line a*x + b*y + c = 0, so every line has one triple. the coefficients are divided
+    by their greatest common divisor, and the sign is set so the first non zero of a, b is positive
+
+    :param a: integer coefficient of x
+    :param b: integer coefficient of y
+    :param c: integer constant
+    :return: tuple (a, b, c) of integers
+    '''
+
+    divisor = gcd(gcd(a, b), c)
+    if a < 0 or (a == 0 and b < 0):
+        divisor = -divisor
+
+    return (a // divisor, b // divisor, c // divisor)
+
+
+def exact_bisector(point1, point2):
+    '''
+    get the perpendicular bisector of two integer points, the line of symmetry between them, without rounding.
+    it is 2(x2-x1)*x + 2(y2-y1)*y + (x1^2 + y1^2 - x2^2 - y2^2) = 0, reduced
+
+    :param point1: tuple of integers (x, y)
+    :param point2: tuple of integers (x, y)
+    :return: tuple (a, b, c) of integers, see reduce_line(). None if the points are the same point
+    '''
+
+    x1, y1 = point1
+    x2, y2 = point2
+    if x1 == x2 and y1 == y2:
+        return None
+
+    return reduce_line(2 * (x2 - x1), 2 * (y2 - y1), x1 * x1 + y1 * y1 - x2 * x2 - y2 * y2)
+
+
+def exact_reflection(point, line):
+    '''
+    reflect an integer point over a line with integer coefficients, without rounding.
+    (x', y') = (x, y) - 2 * (a*x + b*y + c) / (a^2 + b^2) * (a, b)
+
+    :param point: tuple of integers (x, y)
+    :param line: tuple (a, b, c) of integers
+    :return: tuple of integers (x', y'), None if the reflected point is not an integer point, so it cannot be any of
+        the points
+    '''
+
+    x, y = point
+    a, b, c = line
+
+    distance = a * x + b * y + c
+    if distance == 0:
+        return point
+
+    norm = a * a + b * b
+    shift_x, remainder_x = divmod(2 * a * distance, norm)
+    shift_y, remainder_y = divmod(2 * b * distance, norm)
+    if remainder_x or remainder_y:
+        return None
+
+    return (x - shift_x, y - shift_y)
+
+
+def find_exact_symmetry_lines(points, stats=None):
+    '''
+    find the valid lines of symmetry of a set of points with integer or rational coordinates, without any tolerance.
+    the points are scaled to integers, every pair gives its bisector as a reduced integer triple, so a line shared by
+    many pairs is checked once, and a line is valid if the reflection of every point is in the set of points
+
+    :param points: tuple or list of points (x, y), see to_exact_points()
+    :param stats: Stats object counting pairs, candidates, reflection lookups and early rejections, see stats.py
+    :return: list of tuples (a, b, c) of integers, a*x + b*y + c = 0 in the coordinates of the points, reduced,
+        in the order their first pair is found
+    '''
+
+    integer_points, scale = to_exact_points(points)
+    point_set = set(integer_points)
+
+    # every distinct point is checked once
+    unique_points = list(dict.fromkeys(integer_points))
+
+    valid_lines = []
+    candidates = set()
+    lookups = 0
+    for point_i, point1 in enumerate(integer_points):
+        for point2 in integer_points[point_i + 1:]:
+            line = exact_bisector(point1, point2)
+            if line is None or line in candidates:
+                continue
+            candidates.add(line)
+
+            for point in unique_points:
+                lookups += 1
+                if exact_reflection(point, line) not in point_set:
+                    break
+            else:
+                valid_lines.append(line)
+
+    if stats is not None:
+        stats.count("pairs", len(integer_points) * (len(integer_points) - 1) // 2)
+        stats.count("candidates", len(candidates))
+        stats.count("candidates_validated", len(candidates))
+        stats.count("reflection_lookups", lookups)
+        stats.count("early_rejections", len(candidates) - len(valid_lines))
+
+    # a*X + b*Y + c = 0 with X = scale*x is (a*scale)*x + (b*scale)*y + c = 0
+    return [reduce_line(a * scale, b * scale, c) for a, b, c in valid_lines]
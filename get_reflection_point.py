@@ -1,7 +1,11 @@
 # import objects and functions
-from Line import Line
-from computation import calculate_reflection_cartesian
-from output_options import write_reflection_to_csv, visualize_reflection
+import os
+
+import numpy as np
+from line_cache import parse_line, REFLECTION_CACHE
+from reflection_engine import reflect_points, to_point_array, open_point_array, AXIS_EQUATIONS
+from output_backends import get_backend, FILE_FORMAT_OPTIONS
+from stats import NULL_STATS
 
 # current options for coordinate planes
 COORDINATE_PLANE_OPTIONS = {"cartesian"}
@@ -9,8 +13,12 @@ COORDINATE_PLANE_OPTIONS = {"cartesian"}
 # options for get_reflection_point()
 LINE_OF_SYMMETRY_OPTIONS = {"x-axis", "y-axis"}
 
+# number of points reflect_point_file() reads, reflects and writes at a time
+REFLECTION_CHUNK_SIZE = 1 << 20
+
 def get_reflection_point(points, line_of_symmetry=['x-axis'], coordinate_plane="Cartesian", rounding=None,
-                         visualize=True, output_directory=None):
+                         visualize=True, output_directory=None, headless=False, render_workers=None, stats=None,
+                         file_format="csv"):
     '''
     reflecting given points given line(s) of symmetry, for each given point and line of symmetry
 
@@ -20,6 +28,12 @@ def get_reflection_point(points, line_of_symmetry=['x-axis'], coordinate_plane="
     :param rounding: round results using Python builtin's round()
     :param visualize: option to visualize points and line of symmetry
     :param output_directory: option to output results into a directory
+    :param headless: when visualizing, draw the plots without showing them
+    :param render_workers: if more than 1, draw the plots on this many worker processes, needs output_directory
+    :param stats: Stats object collecting the time of each stage and counts of points, lines and reflections, see
+        stats.py
+    :param file_format: format of the file written to output_directory, one of "csv", "csv.gz", "npy", "npz" or
+        "parquet", see output_options.write_table()
     :return: dictionary of line(s) of symmetry and and their reflected points
     '''
 
@@ -27,6 +41,9 @@ def get_reflection_point(points, line_of_symmetry=['x-axis'], coordinate_plane="
     ### parameters check ###
     ########################
 
+    if stats is None:
+        stats = NULL_STATS
+
     # points can be one point or list of points for multiple points to reflect
     if isinstance(points, tuple) is False and isinstance(points, list) is False:
         raise TypeError("points %r is not a valid list." % points)
@@ -39,32 +56,50 @@ def get_reflection_point(points, line_of_symmetry=['x-axis'], coordinate_plane="
     if coordinate_plane.lower() not in COORDINATE_PLANE_OPTIONS:
         raise ValueError("coordinate_plane must be in %r." % COORDINATE_PLANE_OPTIONS)
 
+    if file_format not in FILE_FORMAT_OPTIONS:
+        raise ValueError("get_reflection_point: file_format %r must be in %r." % (file_format, FILE_FORMAT_OPTIONS))
+
     ################################################################################
     ### calculate: reflect n number of times based on n number of symmetry lines ###
     ################################################################################
 
-    all_reflected_points = {}
-    for input_line in line_of_symmetry:
-        if isinstance(input_line, str) is False:
-            raise TypeError(
-                "symmetry: line of symmetry (%r) is detected as a %r. It must be a string containing %r or an equation in y-intercept (y=mx+b) form." % (
-                    input_line, type(input_line), LINE_OF_SYMMETRY_OPTIONS))
+    with stats.stage("parse_lines"):
+        lines = []
+        line_eqs = []
+        for input_line in line_of_symmetry:
+            if isinstance(input_line, str) is False:
+                raise TypeError(
+                    "symmetry: line of symmetry (%r) is detected as a %r. It must be a string containing %r or an equation in y-intercept (y=mx+b) form." % (
+                        input_line, type(input_line), LINE_OF_SYMMETRY_OPTIONS))
+
+            # "x-axis" is y=0 and "y-axis" is x=0
+            line_sym = AXIS_EQUATIONS.get(input_line.lower(), input_line)
 
-        line_sym = input_line
-        if input_line.lower() in LINE_OF_SYMMETRY_OPTIONS:
-            if input_line.lower() == "x-axis":
-                line_sym = "y=0"
-            elif line_sym.lower() == "y-axis":
-                line_sym = "x=0"
+            # custom Line object given equation, parsed once and then cached
+            lines.append(parse_line(line_sym))
+            line_eqs.append(line_sym)
 
-        # create custom Line object given equation
-        line = Line(line_sym)
+    # reflect all points over all lines of symmetry at once, shape (lines, points, 2)
+    with stats.stage("reflect"):
+        if REFLECTION_CACHE.maxsize:
+            reflected = _reflect_points_cached(points, lines)
+        else:
+            reflected = reflect_points(points, lines)
 
-        # reflect all points for the current line of symmetry
-        reflected_points_per_line = [calculate_reflection_cartesian(point, line, rounding) for point in points]
+    # view the reflected array as a list of points for each line of symmetry
+    with stats.stage("format"):
+        all_reflected_points = {}
+        for line_sym, reflected_points_per_line in zip(line_eqs, reflected.tolist()):
+            # if a rounding decimal number is provided
+            if rounding:
+                all_reflected_points[line_sym] = [(round(x, rounding), round(y, rounding))
+                                                  for x, y in reflected_points_per_line]
+            else:
+                all_reflected_points[line_sym] = [(x, y) for x, y in reflected_points_per_line]
 
-        # add to list of points for all symmetry lines
-        all_reflected_points[line_sym] = reflected_points_per_line
+    stats.count("points", reflected.shape[1])
+    stats.count("lines", len(lines))
+    stats.count("reflections", reflected.shape[0] * reflected.shape[1])
 
     ##########################
     ### writing out output ###
@@ -72,22 +107,165 @@ def get_reflection_point(points, line_of_symmetry=['x-axis'], coordinate_plane="
 
     new_dir = None
     if output_directory:
-        new_dir = write_reflection_to_csv(points, all_reflected_points, output_directory)
+        with stats.stage("write"):
+            new_dir = get_backend("write_reflection")(points, all_reflected_points, output_directory,
+                                                      file_format=file_format)
 
     if visualize:
-        # get ready to pass in parameters to the visualize function
-        slopes = []
-        y_intercepts = []
-        x_intercepts = []
-        for key in all_reflected_points.keys():
-            slope = Line(key).get_slope()
-            y_intercept = Line(key).get_y_intercept()
-            x_intercept = Line(key).get_x_intercept()
-            slopes.append(slope)
-            y_intercepts.append(y_intercept)
-            x_intercepts.append(x_intercept)
-
-        # pass into visualize function
-        visualize_reflection(points, all_reflected_points, slopes, y_intercepts, x_intercepts, new_dir)
+        with stats.stage("plot"):
+            # get ready to pass in parameters to the visualize function
+            slopes = []
+            y_intercepts = []
+            x_intercepts = []
+            for key in all_reflected_points.keys():
+                line = parse_line(key)
+                slopes.append(line.get_slope())
+                y_intercepts.append(line.get_y_intercept())
+                x_intercepts.append(line.get_x_intercept())
+
+            # pass into visualize function
+            visualize_reflection = get_backend("visualize_reflection")
+            visualize_reflection(points, all_reflected_points, slopes, y_intercepts, x_intercepts, new_dir, headless,
+                                 render_workers)
 
     return all_reflected_points
+
+
+def reflect_point_file(points_file, line_of_symmetry=['x-axis'], output_directory=".",
+                       chunk_size=REFLECTION_CHUNK_SIZE, stats=None):
+    '''
+    reflect the points of a file over line(s) of symmetry, file to file, for more points than fit in memory. the
+    input is memory-mapped and read chunk_size points at a time, and the reflected points of each line of symmetry are
+    written straight into their own memory-mapped .npy file, so memory use does not grow with the number of points
+
+    :param points_file: .npy file of shape (N, 2), raw float64 binary file of x, y pairs, array (i.e. np.memmap) or
+        buffer of float64, see open_point_array()
+    :param line_of_symmetry: equation in which the points reflect i.e. "x-axis", "y-axis", "y=2x+3", "y=-4", "x=239"
+    :param output_directory: directory in which the reflection/ directory of results is created
+    :param chunk_size: number of points reflected at a time
+    :param stats: Stats object collecting the time of each stage and counts of points, lines and reflections, see
+        stats.py
+    :return: dictionary of line(s) of symmetry and the path of the .npy file of their reflected points, read back with
+        np.load(path, mmap_mode="r")
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if stats is None:
+        stats = NULL_STATS
+
+    if isinstance(line_of_symmetry, str):
+        line_of_symmetry = [line_of_symmetry]
+
+    if isinstance(line_of_symmetry, list) is False:
+        raise TypeError("lines_of_symmetry %r have invalid string instances." % line_of_symmetry)
+
+    if isinstance(chunk_size, int) is False or chunk_size < 1:
+        raise ValueError("reflect_point_file: chunk_size %r must be a positive integer." % (chunk_size,))
+
+    point_array = open_point_array(points_file)
+
+    with stats.stage("parse_lines"):
+        # each distinct line is written once, "x-axis" is y=0 and "y-axis" is x=0
+        line_eqs = {}
+        for input_line in line_of_symmetry:
+            if isinstance(input_line, str) is False:
+                raise TypeError(
+                    "symmetry: line of symmetry (%r) is detected as a %r. It must be a string containing %r or an equation in y-intercept (y=mx+b) form." % (
+                        input_line, type(input_line), LINE_OF_SYMMETRY_OPTIONS))
+            line_sym = AXIS_EQUATIONS.get(input_line.lower(), input_line)
+            line_eqs.setdefault(line_sym, parse_line(line_sym))
+        coefficients = np.array([line.get_coefficients() for line in line_eqs.values()], dtype=float).reshape(-1, 3)
+
+    ####################################################
+    ### calculate and write out a chunk at a time ######
+    ####################################################
+
+    new_dir = os.path.join(output_directory, "reflection")
+    if not os.path.isdir(new_dir):
+        os.makedirs(new_dir)
+
+    output_paths = {line_sym: os.path.join(new_dir, "reflection_%s.npy" % line_sym) for line_sym in line_eqs}
+
+    # an output file over the input file would truncate it while it is still memory-mapped
+    input_path = _mapped_file(points_file, point_array)
+    if input_path is not None:
+        for path in output_paths.values():
+            if _is_same_file(path, input_path):
+                raise ValueError("reflect_point_file: output file %s is the input file, choose another "
+                                 "output_directory." % path)
+
+    outputs = [np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=point_array.shape)
+               for path in output_paths.values()]
+
+    for start in range(0, len(point_array), chunk_size):
+        with stats.stage("reflect"):
+            reflected = reflect_points(point_array[start:start + chunk_size], coefficients)
+        with stats.stage("write"):
+            for output, reflected_points in zip(outputs, reflected):
+                output[start:start + len(reflected_points)] = reflected_points
+
+    with stats.stage("write"):
+        for output in outputs:
+            output.flush()
+    del outputs
+
+    stats.count("points", len(point_array))
+    stats.count("lines", len(line_eqs))
+    stats.count("reflections", len(point_array) * len(line_eqs))
+
+    return output_paths
+
+
+def _mapped_file(points_file, point_array):
+    # path of the file the points are read from, None if they are not read from a file
+    if isinstance(points_file, (str, os.PathLike)):
+        return os.fspath(points_file)
+    return getattr(point_array, "filename", None)
+
+
+def _is_same_file(path1, path2):
+    # same path after following links, or the same file through another hard link
+    if os.path.realpath(path1) == os.path.realpath(path2):
+        return True
+    try:
+        return os.path.samefile(path1, path2)
+    except OSError:
+        # an output file that does not exist yet
+        return False
+
+
+def _reflect_points_cached(points, lines):
+    '''
+    reflect_points() through REFLECTION_CACHE, for hot repeated queries. only the (line, point) pairs that are not
+    cached are reflected, in one reflect_points() call for each line
+
+    :param points: points to reflect, anything accepted by to_point_array()
+    :param lines: list of Line objects
+    :return: numpy array of shape (L, N, 2), the same as reflect_points()
+    '''
+
+    point_array = to_point_array(points)
+    reflected = np.empty((len(lines), len(point_array), 2))
+
+    for line_i, line in enumerate(lines):
+        coefficients = line.get_coefficients()
+        keys = [(coefficients, x, y) for x, y in point_array.tolist()]
+
+        missing = []
+        for point_i, key in enumerate(keys):
+            reflected_point = REFLECTION_CACHE.get(key)
+            if reflected_point is None:
+                missing.append(point_i)
+            else:
+                reflected[line_i, point_i] = reflected_point
+
+        if missing:
+            computed = reflect_points(point_array[missing], [line])[0]
+            reflected[line_i, missing] = computed
+            for point_i, reflected_point in zip(missing, computed.tolist()):
+                REFLECTION_CACHE.put(keys[point_i], tuple(reflected_point))
+
+    return reflected
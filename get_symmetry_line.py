@@ -1,99 +1,135 @@
 # import objects and functions
+import numpy as np
+from collections import deque
+from fractions import Fraction
 from Line import Line
-from computation import calculate_symmetry_cartesian, calculate_reflection_cartesian
-from output_options import write_symmetry_to_csv, visualize_symmetry, visualize_valid_lines, write_valid_lines_csv
-from math import floor, ceil
+from line_cache import parse_line
+from computation import calculate_symmetry_cartesian, get_line, point_slope
+from reflection_engine import reflect_points, to_point_array, pack_point_sets, match_reflections
+from spatial_index import GridIndex, resolve_tolerance
+from bisector_accumulator import BisectorAccumulator
+from angular_sequence import encode_angular_sequence, mirror_axes
+from exact_symmetry import find_exact_symmetry_lines
+from output_backends import get_backend, FILE_FORMAT_OPTIONS
+from stats import NULL_STATS
 
 # current options for coordinate planes
 COORDINATE_PLANE_OPTIONS = {"cartesian"}
 
+# options for what get_symmetry_line() returns
+OUTPUT_FORMAT_OPTIONS = {"dict", "array"}
 
-def find_valid_symmetry_lines(points, coordinate_plane="Cartesian", rounding=3, visualize=True, output_directory=None):
+# options for how find_valid_symmetry_lines() gets the candidate lines of symmetry
+ENGINE_OPTIONS = {"pairwise", "centroid", "voting", "angular"}
+
+# number of point-to-line distances engine="voting" computes at once when counting the points on its candidate lines
+VOTING_BLOCK_SIZE = 1 << 20
+
+
+def find_valid_symmetry_lines(points, coordinate_plane="Cartesian", rounding=3, visualize=True, output_directory=None,
+                              tolerance=0.01, relative_tolerance=None, engine="pairwise", stats=None, headless=False,
+                              exact=False, file_format="csv"):
     '''
     find valid lines of symmetry that correspond with the entire set of input points.
 
     procedure:
-    1. find all lines of symmetry given each pair of points in the input set
+    1. find all lines of symmetry given each pair of points in the input set. with engine="centroid", only the O(n)
+    candidates that can pass through the centroid of the points are found instead, see get_centroid_candidate_lines().
+    with engine="voting", each distinct bisector is checked once, most shared first, and only if enough pairs of
+    points share it, see get_voting_candidate_lines()
     2. for each line found, if the rest of the points have a corresponding reflection point (or is on the line),
-    then it is a valid line of symmetry
+    then it is a valid line of symmetry. a reflected point corresponds with an input point if it is within tolerance
+    of it, found through a grid hash index of the input points
 
     :param points: list of tuples or list that represent points to get line of symmetry
     :param coordinate_plane: reflect points on which coordinate plane, i.e. "Cartesian"
     :param rounding: round output results using Python builtin's round()
     :param visualize: option to visualize points and line of symmetry
     :param output_directory: option to output results into a directory
+    :param tolerance: largest distance between a reflected point and an input point for them to correspond
+    :param relative_tolerance: if given, the tolerance is relative_tolerance times the largest side of the bounding box
+        of the points, and overrides tolerance
+    :param engine: how to get the candidate lines of symmetry, one of "pairwise", "centroid", "voting" or "angular"
+    :param stats: Stats object collecting the time of each stage and counts of pairs, candidates, reflection lookups
+        and early rejections, see stats.py
+    :param headless: when visualizing, draw the plot without showing it
+    :param exact: for points with integer, Fraction or exact decimal string coordinates, find the lines without
+        rounding or tolerance, see find_exact_symmetry_lines(). tolerance, relative_tolerance and engine are not used
+    :param file_format: format of the files written to output_directory, one of "csv", "csv.gz", "npy", "npz" or
+        "parquet", see output_options.write_table()
     :return: list of equations of valid lines of symmetry. empty list if none found.
     '''
 
-    # get all lines of symmetry first, error checking happens in get_symmetry_lines
-    output_dict, lines_of_symmetry = get_symmetry_line(points, coordinate_plane, visualize=False)
+    if stats is None:
+        stats = NULL_STATS
+
+    if engine not in ENGINE_OPTIONS:
+        raise ValueError("find_valid_symmetry_lines: engine %r must be in %r." % (engine, ENGINE_OPTIONS))
+
+    if file_format not in FILE_FORMAT_OPTIONS:
+        raise ValueError("find_valid_symmetry_lines: file_format %r must be in %r." % (file_format,
+                                                                                       FILE_FORMAT_OPTIONS))
+
+    with stats.stage("check_points"):
+        check_points(points, coordinate_plane, "find_valid_symmetry_lines")
 
     ########################################################
     ### calculate valid line of symmetry ###################
     ########################################################
 
-    # prepare, get rounded number of the input points to account for rounding errors for comparison
-    t_points = [tuple(t_point) for t_point in points]
-    points_float = [(float(p[0]), float(p[1])) for p in t_points]
-    points_round = [(round(p_float[0], 2), round(p_float[1], 2)) for p_float in points_float]
-
-    # holds output
-    valid_lines_of_sym = []
-    valid_line_eqs = []
-
-    # iterate each symmetry line found for each pair of points to see if other points reflect across it
-    # if all input points have a corresponding reflection, then it is a valid symmetry line
-    for line in lines_of_symmetry:
-        valid = []
-
-        no_point_combination = 0
-        for point in points:
-            # get the reflected point. if input point is on the line, then reflected point will be the same point
-            reflected_point = calculate_reflection_cartesian(point, line)
-
-            # get floor and ceiling of the calculated point up to 2 decimal places, so we can account rounding error
-            # reference for calculating floor and ceiling up to decimal places:
-            # https://stackoverflow.com/questions/50405017/how-to-round-up-a-number-to-x-decimal-places-in-python
-            floor_x = floor(reflected_point[0] * 100) / 100
-            floor_y = floor(reflected_point[1] * 100) / 100
-            ceil_x = ceil(reflected_point[0] * 100) / 100
-            ceil_y = ceil(reflected_point[1] * 100) / 100
-
-            # if reflected point is also an input
-            if reflected_point in points_round \
-                    or (floor_x, floor_y) in points_round or (ceil_x, ceil_y) in points_round \
-                    or (floor_x, ceil_y) in points_round or (ceil_x, floor_y) in points_round:
-                valid.append(True)
-            no_point_combination += 1
-
-        # if all points found a reflected point, then this is a valid line of symmetry
-        if (len(valid) == no_point_combination):
-            if line.equation not in valid_line_eqs:
-                valid_lines_of_sym.append(line)
-                valid_line_eqs.append(line.equation)
+    if exact:
+        # integer lines, checked with exact integer reflections and set lookups
+        with stats.stage("validate"):
+            valid_lines_of_sym = [Line(format_exact_line(line)) for line in find_exact_symmetry_lines(points, stats)]
+        stats.count("points", len(points))
+        stats.count("valid_lines", len(valid_lines_of_sym))
+        point_array = to_point_array([(float(Fraction(x)), float(Fraction(y))) for x, y in points])
+    else:
+        # prepare, index the input points so each reflected point is matched in O(1)
+        with stats.stage("index"):
+            point_index = GridIndex(points, tolerance, relative_tolerance)
+
+        with stats.stage("candidates"):
+            lines_of_symmetry = get_candidate_lines(point_index.points, point_index.tolerance, engine, stats=stats)
+
+        # holds output, the set keeps the lines already found so duplicates are skipped in O(1)
+        valid_lines_of_sym = []
+        valid_lines_found = set()
+
+        # iterate each symmetry line found for each pair of points to see if other points reflect across it
+        # if all input points have a corresponding reflection, then it is a valid symmetry line
+        with stats.stage("validate"):
+            lookups = point_index.lookups
+            validated = 0
+            for line in lines_of_symmetry:
+                if line in valid_lines_found:
+                    continue
+                validated += 1
+
+                # get the reflected points. if input point is on the line, then reflected point will be the same point
+                reflected_points = reflect_points(point_index.points, [line])[0]
+
+                # if all points found a reflected point, then this is a valid line of symmetry
+                if point_index.contains_all(reflected_points):
+                    valid_lines_of_sym.append(line)
+                    valid_lines_found.add(line)
+
+        stats.count("points", len(point_index.points))
+        stats.count("candidates", len(lines_of_symmetry))
+        stats.count("candidates_validated", validated)
+        stats.count("reflection_lookups", point_index.lookups - lookups)
+        # contains_all() stops at the first reflected point without a match
+        stats.count("early_rejections", validated - len(valid_lines_of_sym))
+        stats.count("valid_lines", len(valid_lines_of_sym))
+        point_array = point_index.points
 
     ########################################################
     ### ROUNDING RESULTS ###################################
     ########################################################
-    if rounding:
-        valid_line_eqs_round = []
-        for line_of_symmetry in valid_lines_of_sym:
-            b = line_of_symmetry.get_y_intercept()
-            m = line_of_symmetry.get_slope()
-            # put in string format. if negative, string does not need a '+'
-            if (b == "DNE" or m == "DNE"):
-                line_of_symmetry_output = "x=%s" % line_of_symmetry.get_x_intercept()
-            else:
-                b_round = round(b, rounding)
-                m_round = round(m, rounding)
-                if (b >= 0):
-                    line_of_symmetry_output = "y=%sx+%s" % (m_round, b_round)
-                else:
-                    line_of_symmetry_output = "y=%sx%s" % (m_round, b_round)
-            valid_line_eqs_round.append(line_of_symmetry_output)
-        valid_line_eqs = valid_line_eqs_round
-
-
+    with stats.stage("format"):
+        valid_line_eqs = [line.equation for line in valid_lines_of_sym]
+        if rounding:
+            valid_line_eqs = [format_line_equation(line, rounding) for line in valid_lines_of_sym]
 
     ########################################################
     ### PLOTTING POINTS AND LINES ##########################
@@ -101,49 +137,570 @@ def find_valid_symmetry_lines(points, coordinate_plane="Cartesian", rounding=3,
     new_dir = None
     # do we want to write out CSV file?
     if output_directory:
-        new_dir = write_valid_lines_csv(points, valid_line_eqs, output_directory)
+        with stats.stage("write"):
+            new_dir = get_backend("write_valid_lines")(points, valid_line_eqs, output_directory,
+                                                       file_format=file_format)
     if visualize:
-        #prepare to pass into function
-        slopes = [line.get_slope() for line in valid_lines_of_sym]
-        y_intercepts = [line.get_y_intercept() for line in valid_lines_of_sym]
-        x_intercepts = [line.get_x_intercept() for line in valid_lines_of_sym]
+        with stats.stage("plot"):
+            #prepare to pass into function
+            slopes = [line.get_slope() for line in valid_lines_of_sym]
+            y_intercepts = [line.get_y_intercept() for line in valid_lines_of_sym]
+            x_intercepts = [line.get_x_intercept() for line in valid_lines_of_sym]
 
-        visualize_valid_lines(points_round, valid_line_eqs, slopes, y_intercepts, x_intercepts, new_dir)
+            # round the input points for display
+            points_round = [(round(x, 2), round(y, 2)) for x, y in point_array.tolist()]
+            get_backend("visualize_valid_lines")(points_round, valid_line_eqs, slopes, y_intercepts, x_intercepts,
+                                                 new_dir, headless)
 
     return valid_line_eqs
 
 
-def get_symmetry_line(points, coordinate_plane="Cartesian", rounding=4, visualize=True, output_directory=None):
+def find_valid_symmetry_lines_batch(point_sets, coordinate_plane="Cartesian", rounding=3, tolerance=0.01,
+                                    relative_tolerance=None, engine="pairwise", workers=None, chunk_size=4096):
     '''
-    get line(s) of symmetry given list of points, fo each given set of points
+    find the valid lines of symmetry of many sets of points, the same as find_valid_symmetry_lines() on each set
+    without output_directory or visualize, with much less overhead for each small set
+
+    the options are checked once for the batch. the sets are packed a chunk at a time into ragged arrays, see
+    pack_point_sets(), and all candidate lines of a set are checked at once with match_reflections(). with workers,
+    the chunks are validated on a pool of worker processes kept between calls, see parallel_pairs.get_worker_pool()
+
+    :param point_sets: iterable of sets of points, each a list of points (x, y) or an array of shape (N, 2), N >= 2
+    :param coordinate_plane: reflect points on which coordinate plane, i.e. "Cartesian"
+    :param rounding: round output results using Python builtin's round()
+    :param tolerance: largest distance between a reflected point and an input point for them to correspond
+    :param relative_tolerance: if given, the tolerance of each set is relative_tolerance times the largest side of its
+        bounding box, and overrides tolerance
+    :param engine: how to get the candidate lines of symmetry, one of "pairwise", "centroid", "voting" or "angular"
+    :param workers: if more than 1, validate the chunks on this many worker processes
+    :param chunk_size: about how many points are packed into a chunk
+    :return: generator of lists of equations of valid lines of symmetry, one list for each set, in the order of the sets
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if engine not in ENGINE_OPTIONS:
+        raise ValueError("find_valid_symmetry_lines_batch: engine %r must be in %r." % (engine, ENGINE_OPTIONS))
+
+    if coordinate_plane.lower() not in COORDINATE_PLANE_OPTIONS:
+        raise ValueError("find_valid_symmetry_lines_batch: coordinate_plane must be in %r." % COORDINATE_PLANE_OPTIONS)
+
+    if isinstance(chunk_size, int) is False or chunk_size < 1:
+        raise ValueError("find_valid_symmetry_lines_batch: chunk_size %r must be an integer of at least 1." %
+                         (chunk_size,))
+
+    options = (rounding, tolerance, relative_tolerance, engine)
+    chunks = _iter_packed_chunks(point_sets, chunk_size)
+
+    if workers and workers > 1:
+        return _iter_batch_parallel(chunks, options, workers)
+
+    return (valid_lines for chunk in chunks for valid_lines in _valid_lines_of_packed(*chunk, *options))
+
+
+def _iter_packed_chunks(point_sets, chunk_size):
+    # pack the sets of points into chunks of about chunk_size points, see pack_point_sets()
+    point_arrays = []
+    chunk_points = 0
+    for set_i, point_set in enumerate(point_sets):
+        point_array = to_point_array(point_set)
+        if len(point_array) < 2:
+            raise ValueError("find_valid_symmetry_lines_batch: point set %d %r, there must be at least 2 points as "
+                             "input to find the line of symmetry" % (set_i, point_set))
+
+        point_arrays.append(point_array)
+        chunk_points += len(point_array)
+        if chunk_points >= chunk_size:
+            yield pack_point_sets(point_arrays)
+            point_arrays = []
+            chunk_points = 0
+
+    if point_arrays:
+        yield pack_point_sets(point_arrays)
+
+
+def _iter_batch_parallel(chunks, options, workers):
+    # validate the chunks on the long-lived pool, a few chunks for each worker at a time, in the order of the chunks
+    from parallel_pairs import get_worker_pool
+    pool = get_worker_pool(workers)
+
+    pending = deque()
+    for points, offsets in chunks:
+        pending.append(pool.submit(_valid_lines_of_packed, points, offsets, *options))
+        while len(pending) > 2 * workers:
+            for valid_lines in pending.popleft().result():
+                yield valid_lines
+
+    while pending:
+        for valid_lines in pending.popleft().result():
+            yield valid_lines
+
+
+def _valid_lines_of_packed(points, offsets, rounding, tolerance, relative_tolerance, engine):
+    # valid lines of symmetry of each set of points in a chunk, runs in the worker processes
+    return [_valid_lines_of_set(points[start:stop], rounding, tolerance, relative_tolerance, engine)
+            for start, stop in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _valid_lines_of_set(point_array, rounding, tolerance, relative_tolerance, engine):
+    # find_valid_symmetry_lines() for one set of points, checking every candidate line at once
+    tolerance = resolve_tolerance(point_array, tolerance, relative_tolerance)
+
+    if engine == "pairwise":
+        # the bisector of every pair of points at once, with the same coefficients as their Line objects
+        point_i, point_j = np.triu_indices(len(point_array), 1)
+        coefficients = np.stack(pair_line_coefficients(point_array, point_i, point_j), axis=1)
+        valid = match_reflections(point_array, coefficients, tolerance)
+
+        # Line objects are only made for the valid lines
+        point_list = point_array.tolist()
+        valid_lines = [calculate_symmetry_cartesian(point_list[i], point_list[j])
+                       for i, j in zip(point_i[valid].tolist(), point_j[valid].tolist())]
+    else:
+        candidates = get_candidate_lines(point_array, tolerance, engine)
+        valid = match_reflections(point_array, candidates, tolerance)
+        valid_lines = [line for line, is_valid in zip(candidates, valid.tolist()) if is_valid]
+
+    # the first of each line, in the order they are found
+    valid_lines = list(dict.fromkeys(valid_lines))
+
+    if rounding:
+        return [format_line_equation(line, rounding) for line in valid_lines]
+
+    return [line.equation for line in valid_lines]
+
+
+def format_line_equation(line, rounding=None):
+    '''
+    format a line as an equation in slope-intercept form, with its slope and intercept rounded
+
+    :param line: Line object
+    :param rounding: round the slope and intercept using Python builtin's round(), the equation of the line as is if None
+    :return: equation string, i.e. "y=0.32x-9.73", "x=30.0"
+    '''
+
+    if not rounding:
+        return line.equation
+
+    return format_equation(line.get_slope(), line.get_y_intercept(), line.get_x_intercept(), rounding)
+
+
+def format_equation(slope, y_intercept, x_intercept, rounding=None):
+    '''
+    format a line as an equation in slope-intercept form, with its slope and intercept rounded
+
+    :param slope: slope of the line, "DNE" if the line is vertical
+    :param y_intercept: y-intercept of the line, "DNE" if the line is vertical
+    :param x_intercept: x-intercept of the line, only used if the line is vertical
+    :param rounding: round the slope and intercept using Python builtin's round()
+    :return: equation string, i.e. "y=0.32x-9.73", "x=30.0"
+    '''
+
+    # put in string format. if negative, string does not need a '+'
+    if (y_intercept == "DNE" or slope == "DNE"):
+        return "x=%s" % x_intercept
+
+    m = slope
+    b = y_intercept
+    if rounding:
+        # adding 0.0 turns a negative zero into 0.0, so it is not written as "+-0.0"
+        b = round(b, rounding) + 0.0
+        m = round(m, rounding)
+
+    if (b >= 0):
+        return "y=%sx+%s" % (m, b)
+
+    return "y=%sx%s" % (m, b)
+
+
+def format_exact_line(line, rounding=None):
+    '''
+    format a line with integer coefficients, from find_exact_symmetry_lines(), as an equation in slope-intercept form
+
+    :param line: tuple (a, b, c) of integers, a*x + b*y + c = 0
+    :param rounding: round the slope and intercept using Python builtin's round()
+    :return: equation string, i.e. "y=0.5x+2.0", "x=30.0"
+    '''
+
+    a, b, c = line
+    if b == 0:
+        return format_equation("DNE", "DNE", float(Fraction(-c, a)), rounding)
+
+    slope = Fraction(-a, b)
+    y_intercept = Fraction(-c, b)
+    x_intercept = "DNE" if slope == 0 else float(-y_intercept / slope)
+
+    return format_equation(float(slope), float(y_intercept), x_intercept, rounding)
+
+
+def score_symmetry_lines(points, coordinate_plane="Cartesian", rounding=3, tolerance=0.01, relative_tolerance=None,
+                         min_score=0.5, engine="voting", stats=None):
+    '''
+    score candidate lines of symmetry by how much of the set of points they reflect, for noisy points where a line can be
+    almost, but not exactly, a line of symmetry
+
+    the score of a line is the fraction of the points whose reflection has an input point within tolerance, and the
+    mean residual is the mean distance from those reflections to their nearest input point. the nearest input points
+    are found through a grid hash index built once for the set of points
 
     :param points: list of tuples or list that represent points to get line of symmetry
     :param coordinate_plane: reflect points on which coordinate plane, i.e. "Cartesian"
-    :param rounding: round results using Python builtin's round()
-    :param visualize: option to visualize points and line of symmetry
-    :param output_directory: option to output results into a directory
-    :return: dictionary of given points and their resulting line(s) of symmetry,
-        list of Line objects of symmetry lines found
+    :param rounding: round output equations using Python builtin's round()
+    :param tolerance: largest distance between a reflected point and an input point for them to correspond
+    :param relative_tolerance: if given, the tolerance is relative_tolerance times the largest side of the bounding box
+        of the points, and overrides tolerance
+    :param min_score: leave out lines with a lower score, between 0 and 1
+    :param engine: how to get the candidate lines of symmetry, one of "pairwise", "centroid", "voting" or "angular"
+    :param stats: Stats object collecting the time of each stage and counts of pairs, candidates, reflection lookups
+        and early rejections, see stats.py
+    :return: list of dictionaries {"line_of_symmetry": equation, "score": score, "mean_residual": mean_residual},
+        ordered by score, highest first, then by mean residual, lowest first
     '''
 
     ########################
     ### parameters check ###
     ########################
 
+    if stats is None:
+        stats = NULL_STATS
+
+    if engine not in ENGINE_OPTIONS:
+        raise ValueError("score_symmetry_lines: engine %r must be in %r." % (engine, ENGINE_OPTIONS))
+
+    with stats.stage("check_points"):
+        check_points(points, coordinate_plane, "score_symmetry_lines")
+
+    try:
+        min_score = float(min_score)
+    except (ValueError, TypeError) as e:
+        # reraise it with custom message
+        error_msg_output = "score_symmetry_lines: min_score %r is invalid!" % (min_score,)
+        print(error_msg_output)
+        e.args += (error_msg_output,)
+        raise
+
+    if min_score < 0 or min_score > 1:
+        raise ValueError("score_symmetry_lines: min_score %r must be between 0 and 1." % min_score)
+
+    #################
+    ### calculate ###
+    #################
+
+    with stats.stage("index"):
+        point_index = GridIndex(points, tolerance, relative_tolerance)
+    n = len(point_index.points)
+
+    with stats.stage("candidates"):
+        lines_of_symmetry = get_candidate_lines(point_index.points, point_index.tolerance, engine, min_score, stats)
+
+    scored_lines = []
+    lines_scored = set()
+    early_rejections = 0
+    with stats.stage("score"):
+        for line in lines_of_symmetry:
+            if line in lines_scored:
+                continue
+            lines_scored.add(line)
+
+            reflected_points = reflect_points(point_index.points, [line])[0].tolist()
+
+            matched = 0
+            residual = 0.0
+            for point_i, reflected_point in enumerate(reflected_points):
+                nearest = point_index.query(reflected_point)
+                if nearest is not None:
+                    matched += 1
+                    residual += nearest[1]
+                # stop early if the rest of the points cannot bring the score up to min_score
+                elif matched + (n - point_i - 1) < min_score * n:
+                    early_rejections += 1
+                    break
+            else:
+                score = matched / n
+                if score >= min_score:
+                    scored_lines.append({"line_of_symmetry": format_line_equation(line, rounding),
+                                         "score": score,
+                                         "mean_residual": residual / matched if matched else 0.0})
+
+    stats.count("points", n)
+    stats.count("candidates", len(lines_of_symmetry))
+    stats.count("candidates_validated", len(lines_scored))
+    stats.count("reflection_lookups", point_index.lookups)
+    stats.count("early_rejections", early_rejections)
+    stats.count("valid_lines", len(scored_lines))
+
+    scored_lines.sort(key=lambda scored_line: (-scored_line["score"], scored_line["mean_residual"]))
+
+    return scored_lines
+
+
+def get_candidate_lines(points, tolerance=0.01, engine="pairwise", min_score=1.0, stats=None):
+    '''
+    get the candidate lines of symmetry of a set of points
+
+    :param points: array of shape (N, 2), or list of points, i.e. [(23,-45.67), (25,-45.67)]
+    :param tolerance: largest distance between a reflected point and an input point for them to correspond
+    :param engine: how to get the candidate lines of symmetry, one of "pairwise", "centroid", "voting" or "angular"
+    :param min_score: smallest fraction of the points a line must reflect onto points, only used to prune "voting"
+    :param stats: Stats object counting the pairs of points the candidates are found from
+    :return: list of Line objects of candidate lines of symmetry
+    '''
+
+    if engine == "centroid":
+        return get_centroid_candidate_lines(points, tolerance, stats)
+
+    if engine == "angular":
+        return get_angular_candidate_lines(points, tolerance, stats)
+
+    if engine == "voting":
+        return get_voting_candidate_lines(points, tolerance, min_score, stats)
+
+    # every pair of points, error checking happens in get_symmetry_lines
+    output_dict, lines_of_symmetry = get_symmetry_line(to_point_array(points).tolist(), rounding=None,
+                                                       visualize=False)
+    if stats is not None:
+        stats.count("pairs", len(lines_of_symmetry))
+
+    return lines_of_symmetry
+
+
+def get_centroid_candidate_lines(points, tolerance=0.01, stats=None):
+    '''
+    get the candidate lines of symmetry of a set of points, pruned with its centroid
+
+    any line of symmetry of a finite set of points passes through the centroid of the set. a reference point, the
+    one farthest from the centroid, is either reflected onto another point, so the line is the perpendicular bisector
+    of the two, or is on the line, so the line goes through it and the centroid. this gives at most n candidates
+    instead of the n(n-1)/2 bisectors of every pair
+
+    :param points: array of shape (N, 2), or list of points, i.e. [(23,-45.67), (25,-45.67)]
+    :param tolerance: largest distance from the centroid for a bisector to pass through it
+    :param stats: Stats object counting the pairs of points the candidates are found from
+    :return: list of Line objects of candidate lines of symmetry
+    '''
+
+    #################
+    ### calculate ###
+    #################
+
+    # symmetry is of the set of points, so repeated points count once. points already sorted and distinct, i.e. from
+    # a SymmetryIndex, are used as they are
+    point_array = to_point_array(points)
+    x = point_array[:, 0]
+    y = point_array[:, 1]
+    if ((x[1:] > x[:-1]) | ((x[1:] == x[:-1]) & (y[1:] > y[:-1]))).all():
+        unique_array = point_array
+    else:
+        unique_array = to_point_array(sorted(set(tuple(point) for point in point_array.tolist())))
+    centroid = tuple(unique_array.mean(axis=0).tolist())
+
+    # reference point farthest from the centroid
+    distances = np.hypot(unique_array[:, 0] - centroid[0], unique_array[:, 1] - centroid[1])
+    reference_i = int(distances.argmax())
+    reference = tuple(unique_array[reference_i].tolist())
+
+    # every point is the same point, every bisector is degenerate and the same line
+    if distances[reference_i] <= tolerance:
+        return [calculate_symmetry_cartesian(tuple(unique_array[0].tolist()), tuple(unique_array[-1].tolist()))]
+
+    if stats is not None:
+        stats.count("pairs", len(unique_array) - 1)
+
+    # the reference point is reflected onto another point, keep the bisectors through the centroid. the distance from
+    # the centroid to every bisector is found at once, a little over the tolerance so no line is missed for rounding,
+    # and only the bisectors near it are made into Line objects and checked again with their coefficients
+    normals = unique_array - reference
+    midpoints = (unique_array + reference) / 2
+    lengths = np.hypot(normals[:, 0], normals[:, 1])
+    lengths[reference_i] = 1.0
+    centroid_distances = np.abs(((centroid - midpoints) * normals).sum(axis=1)) / lengths
+    float_noise = 1e-9 * float(np.abs(unique_array).max())
+    loose_tolerance = tolerance * (1 + 1e-9) + float_noise
+    near_centroid = np.flatnonzero(centroid_distances <= loose_tolerance)
+
+    candidates = []
+    for point_i in near_centroid.tolist():
+        if point_i == reference_i:
+            continue
+
+        point = tuple(unique_array[point_i].tolist())
+        line_of_symmetry = calculate_symmetry_cartesian(reference, point)
+        a, b, c = line_of_symmetry.get_coefficients()
+        if abs(a * centroid[0] + b * centroid[1] + c) / np.hypot(a, b) <= tolerance:
+            candidates.append(line_of_symmetry)
+
+    # the reference point is on the line of symmetry. only a candidate if at least one point is off the line,
+    # the same as a bisector of a reflected pair of points. the centroid is a float mean, so on a vertical axis its x
+    # can be off by float noise, and get_line would give a huge slope instead of a vertical line
+    if abs(reference[0] - centroid[0]) <= float_noise:
+        line_through_centroid = point_slope(reference, "DNE")
+    else:
+        line_through_centroid = get_line(reference, centroid)
+    a, b, c = line_through_centroid.get_coefficients()
+    if (np.abs(unique_array @ (a, b) + c) / np.hypot(a, b) > tolerance).any():
+        candidates.append(line_through_centroid)
+
+    return candidates
+
+
+def get_voting_candidate_lines(points, tolerance=0.01, min_score=1.0, stats=None):
+    '''
+    get the candidate lines of symmetry of a set of points, one for each distinct perpendicular bisector
+
+    every pair of points votes for its bisector in a BisectorAccumulator, so pairs sharing a bisector give one
+    candidate. a line of symmetry reflects each point off the line onto another point, so it needs
+    2 * support + (points on the line) >= n, where support is the number of pairs voting for it. lines that cannot
+    cover min_score of the n points are left out
+
+    :param points: array of shape (N, 2), or list of points, i.e. [(23,-45.67), (25,-45.67)]
+    :param tolerance: offset resolution of the accumulator, and largest distance from a line for a point to be on it
+    :param min_score: smallest fraction of the points a candidate line must be able to cover, 1 for all of them
+    :param stats: Stats object counting the pairs of points voting, and the distinct bisectors they vote for
+    :return: list of Line objects of candidate lines of symmetry, ordered by support, most first
+    '''
+
+    #################
+    ### calculate ###
+    #################
+
+    # symmetry is of the set of points, so repeated points count once
+    unique_array = to_point_array(sorted(set(tuple(point) for point in to_point_array(points).tolist())))
+    n = len(unique_array)
+
+    # every point is the same point, its bisector with itself is the only candidate
+    if n == 1:
+        return [calculate_symmetry_cartesian(tuple(unique_array[0]), tuple(unique_array[0]))]
+
+    # an angle bucket turns a line by about how far the tolerance is across the whole set of points
+    extent = float(np.ptp(unique_array, axis=0).max())
+    accumulator = BisectorAccumulator(angle_resolution=tolerance / max(extent, tolerance), offset_resolution=tolerance,
+                                      origin=unique_array.mean(axis=0))
+    accumulator.add_points(unique_array)
+    if stats is not None:
+        stats.count("pairs", n * (n - 1) // 2)
+        stats.count("bisectors", len(accumulator))
+
+    supports = accumulator.supports()
+    support_array = np.array([support for key, support in supports], dtype=float)
+
+    # points on the line are reflected onto themselves, every other point needs a pair. lines with enough support
+    # cover the points without counting the ones on them, the others count them in blocks of lines at once
+    points_on_lines = np.zeros(len(supports), dtype=np.int64)
+    uncovered = np.flatnonzero(2 * support_array < min_score * n)
+    if len(uncovered):
+        bisectors = accumulator.get_bisectors([supports[i][0] for i in uncovered])
+        bisectors /= np.hypot(bisectors[:, 0], bisectors[:, 1])[:, None]
+
+        # a little over the tolerance, so no line is missed for rounding. lines that pass are counted again below
+        # with the coefficients of their Line object
+        loose_tolerance = tolerance * (1 + 1e-9) + 1e-9 * float(np.abs(unique_array).max())
+        block_size = max(1, VOTING_BLOCK_SIZE // n)
+        for start in range(0, len(uncovered), block_size):
+            block = bisectors[start:start + block_size]
+            distances = np.abs(unique_array @ block[:, :2].T + block[:, 2])
+            points_on_lines[uncovered[start:start + block_size]] = (distances <= loose_tolerance).sum(axis=0)
+
+    candidates = []
+    for (key, support), points_on_line in zip(supports, points_on_lines.tolist()):
+        if 2 * support + points_on_line < min_score * n:
+            continue
+
+        line = accumulator.get_line(key)
+        if 2 * support < min_score * n:
+            a, b, c = line.get_coefficients()
+            points_on_line = int((np.abs(unique_array @ (a, b) + c) / np.hypot(a, b) <= tolerance).sum())
+            if 2 * support + points_on_line < min_score * n:
+                continue
+        candidates.append(line)
+
+    return candidates
+
+
+def get_angular_candidate_lines(points, tolerance=0.01, stats=None):
+    '''
+    get the candidate lines of symmetry of a set of points from its angular sequence around the centroid, in
+    O(n log n)
+
+    every line of symmetry passes through the centroid and reverses the angular order of the points around it. the
+    points are encoded as the cyclic sequence of their radii and angle gaps, see encode_angular_sequence(), and each
+    rotation of the sequence equal to its reverse is an axis, found by string matching, see mirror_axes(). each axis
+    is made the same way as the other engines, as the perpendicular bisector of two points it mirrors, or the line
+    through the centroid and a point on it. radii and angles are quantized to the tolerance, so this is meant for exact
+    or nearly exact symmetry, "voting" is better for noisy points
+
+    :param points: array of shape (N, 2), or list of points, i.e. [(23,-45.67), (25,-45.67)]
+    :param tolerance: resolution of the radii, and of the angles at the farthest point from the centroid
+    :param stats: Stats object counting the symbols of the angular sequence
+    :return: list of Line objects of candidate lines of symmetry
+    '''
+
+    #################
+    ### calculate ###
+    #################
+
+    # symmetry is of the set of points, so repeated points count once
+    unique_array = np.unique(to_point_array(points), axis=0)
+
+    # every point is the same point, its bisector with itself is the only candidate
+    if len(unique_array) == 1:
+        return [calculate_symmetry_cartesian(tuple(unique_array[0]), tuple(unique_array[0]))]
+
+    centroid = tuple(unique_array.mean(axis=0).tolist())
+    classes, sequence = encode_angular_sequence(unique_array, centroid, tolerance)
+    if stats is not None:
+        stats.count("angular_symbols", len(sequence))
+
+    # every point is at the centroid, or on one ray from it, so there is no angular order to match
+    if len(classes) < 2:
+        return get_centroid_candidate_lines(unique_array, tolerance, stats)
+
+    candidates = []
+    for p in mirror_axes(sequence):
+        k = p // 2
+        if p % 2:
+            # the axis splits the gap between class k and the next class, the two classes mirror each other
+            point1, point2 = classes[k][0], classes[(k + 1) % len(classes)][0]
+        else:
+            # the axis goes along class k, the classes on each side of it mirror each other
+            point1, point2 = classes[k - 1][0], classes[(k + 1) % len(classes)][0]
+
+        # only two classes, on opposite rays, and the axis goes along them. every point is on the line, which is not a
+        # candidate of the other engines either, see get_centroid_candidate_lines()
+        if point1 == point2:
+            continue
+
+        candidates.append(calculate_symmetry_cartesian(tuple(unique_array[point1].tolist()),
+                                                       tuple(unique_array[point2].tolist())))
+
+    return candidates
+
+
+def check_points(points, coordinate_plane="Cartesian", function_name="check_points"):
+    '''
+    check that points are a valid list of 2D points on a supported coordinate plane, raise an error if not
+
+    :param points: list of tuples or list that represent points
+    :param coordinate_plane: coordinate plane of the points, i.e. "Cartesian"
+    :param function_name: name of the calling function, used in the error messages
+    :return: None
+    '''
+
     # points can be one point or list of points for multiple points to reflect
     if isinstance(points, list) is False:
-        raise TypeError("get_symmetry_line: points {} must be a valid list.".format(points))
+        raise TypeError("{}: points {} must be a valid list.".format(function_name, points))
 
     if len(points) < 2:
         raise ValueError(
-            "get_symmetry_line: points {}, there must be at least 2 points as input to find the line of symmetry".format(
-                points))
+            "{}: points {}, there must be at least 2 points as input to find the line of symmetry".format(
+                function_name, points))
 
     # check if points passed in are valid points
     if all(isinstance(p, (tuple, list)) and len(p) == 2 for p in points) is False:
         raise TypeError(
-            "get_symmetry_line: points {} must include valid 2D points in a tuple or a list, i.e. (2,5) or [-352.54,-2343.5]".format(
-                points))
+            "{}: points {} must include valid 2D points in a tuple or a list, i.e. (2,5) or [-352.54,-2343.5]".format(
+                function_name, points))
 
     # check that each point is a int, float, or a str that is a digit
     p_components = [p_component for p in points for p_component in p if ((isinstance(p_component, (int, float)) or (
@@ -154,52 +711,129 @@ def get_symmetry_line(points, coordinate_plane="Cartesian", rounding=4, visualiz
             float(p_comp)
         except ValueError as e:
             # reraise it with custom message
-            error_msg_output = "get_symmetry_line: {} is not a valid digit!".format(p_comp)
+            error_msg_output = "{}: {} is not a valid digit!".format(function_name, p_comp)
             print(error_msg_output)
             e.args += (error_msg_output,)
             raise
 
     # coordinate plane must be the ones given
     if coordinate_plane.lower() not in COORDINATE_PLANE_OPTIONS:
-        raise ValueError("get_symmetry_line: coordinate_plane must be in {}.".format(COORDINATE_PLANE_OPTIONS))
+        raise ValueError("{}: coordinate_plane must be in {}.".format(function_name, COORDINATE_PLANE_OPTIONS))
+
+
+def iter_symmetry_lines(points, coordinate_plane="Cartesian", workers=None):
+    '''
+    lazily get the line of symmetry of each pair of points, in the same order as get_symmetry_line(), without keeping
+    any of them. points are checked when this is called, the lines are calculated as they are iterated over
+
+    i.e. stream every line to a CSV:
+    records = (((points[i], points[j]), line.equation) for i, j, line in iter_symmetry_lines(points))
+    write_symmetry_to_csv(records, output_directory)
+
+    :param points: list of tuples or list that represent points to get line of symmetry
+    :param coordinate_plane: reflect points on which coordinate plane, i.e. "Cartesian"
+    :param workers: if more than 1, calculate the lines on this many worker processes, in the same order
+    :return: generator of (i, j, line) records, where line is the Line object of symmetry of points[i] and points[j]
+    '''
+
+    check_points(points, coordinate_plane, "iter_symmetry_lines")
+
+    if workers and workers > 1:
+        # the process pool is only imported when it is used
+        from parallel_pairs import iter_symmetry_lines_parallel
+        return iter_symmetry_lines_parallel(points, workers)
+
+    return _iter_pairs(points)
+
+
+def _iter_pairs(points):
+    # line of symmetry for each pair of points, i < j
+    for point_i in range(len(points)):
+        point1 = tuple(points[point_i])
+        for point_j in range(point_i + 1, len(points)):
+            yield point_i, point_j, calculate_symmetry_cartesian(point1, tuple(points[point_j]))
+
+
+def get_symmetry_line(points, coordinate_plane="Cartesian", rounding=4, visualize=True, output_directory=None,
+                      workers=None, output_format="dict", dtype=np.float64, per_pair_plots=False, headless=False,
+                      render_workers=None, stats=None, file_format="csv"):
+    '''
+    get line(s) of symmetry given list of points, fo each given set of points
+
+    :param points: list of tuples or list that represent points to get line of symmetry
+    :param coordinate_plane: reflect points on which coordinate plane, i.e. "Cartesian"
+    :param rounding: round results using Python builtin's round()
+    :param visualize: option to visualize points and line of symmetry
+    :param output_directory: option to output results into a directory
+    :param workers: if more than 1, calculate the lines on this many worker processes, see iter_symmetry_lines()
+    :param output_format: "dict" for the dictionary and list of Line objects below, or "array" for a structured array,
+        see symmetry_lines_array()
+    :param dtype: float type of the coefficients of the "array" output format, i.e. np.float32 or np.float64
+    :param per_pair_plots: when visualizing, also plot each pair of points with its line of symmetry
+    :param headless: when visualizing, draw the plots without showing them, see render_symmetry_aggregate()
+    :param render_workers: if more than 1, draw the plots of each pair on this many worker processes, needs
+        output_directory
+    :param stats: Stats object collecting the time of each stage and the count of pairs, see stats.py
+    :param file_format: format of the file written to output_directory, one of "csv", "csv.gz", "npy", "npz" or
+        "parquet", see output_options.write_table()
+    :return: dictionary of given points and their resulting line(s) of symmetry,
+        list of Line objects of symmetry lines found.
+        with output_format="array", a structured array with fields (i, j, a, b, c) instead
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if stats is None:
+        stats = NULL_STATS
+
+    with stats.stage("check_points"):
+        check_points(points, coordinate_plane, "get_symmetry_line")
+
+    if output_format not in OUTPUT_FORMAT_OPTIONS:
+        raise ValueError("get_symmetry_line: output_format %r must be in %r." % (output_format, OUTPUT_FORMAT_OPTIONS))
+
+    if file_format not in FILE_FORMAT_OPTIONS:
+        raise ValueError("get_symmetry_line: file_format %r must be in %r." % (file_format, FILE_FORMAT_OPTIONS))
 
     ########################################################
     ### calculate: get a line of symmetry for each point ###
     ########################################################
 
-    lines_of_symmetry_dict = {}
-    all_lines_of_sym = []
-    for point_i in range(len(points)):
-        next_i = point_i + 1
-        for point_j in range(next_i, len(points)):
-            # get ready to pass into calulating function
-            point1 = tuple(points[point_i])
-            point2 = tuple(points[point_j])
-
-            # calculate
-            line_of_symmetry = calculate_symmetry_cartesian(point1, point2)
-
-            all_lines_of_sym.append(line_of_symmetry)
-            # what to output
-            line_of_symmetry_output = line_of_symmetry.equation
-
-            # rounding result
-            if rounding:
-                b = line_of_symmetry.get_y_intercept()
-                m = line_of_symmetry.get_slope()
-                # put in string format. if negative, string does not need a '+'
-                if (b == "DNE" or m == "DNE"):
-                    line_of_symmetry_output = "x=%s" % line_of_symmetry.get_x_intercept()
-                else:
-                    b_round = round(b, rounding)
-                    m_round = round(m, rounding)
-                    if (b >= 0):
-                        line_of_symmetry_output = "y=%sx+%s" % (m_round, b_round)
-                    else:
-                        line_of_symmetry_output = "y=%sx%s" % (m_round, b_round)
-
-            # add to data structure with all lines
-            lines_of_symmetry_dict[(point1, point2)] = line_of_symmetry_output
+    if output_format == "array":
+        with stats.stage("bisectors"):
+            symmetry_array = symmetry_lines_array(points, dtype)
+        stats.count("pairs", len(symmetry_array))
+
+        # equations are only formatted when they are written out or plotted
+        if not (output_directory or visualize):
+            return symmetry_array
+
+        with stats.stage("format"):
+            equations = format_symmetry_array(symmetry_array, rounding)
+            lines_of_symmetry_dict = {(tuple(points[point_i]), tuple(points[point_j])): equation
+                                      for (point_i, point_j), equation in zip(symmetry_array[["i", "j"]].tolist(),
+                                                                              equations)}
+    else:
+        lines_of_symmetry_dict = {}
+        all_lines_of_sym = []
+        if workers and workers > 1:
+            # the process pool is only imported when it is used
+            from parallel_pairs import iter_symmetry_lines_parallel
+            pairs = iter_symmetry_lines_parallel(points, workers)
+        else:
+            pairs = _iter_pairs(points)
+
+        # lines are formatted as they are found, the stage holds both
+        with stats.stage("bisectors"):
+            for point_i, point_j, line_of_symmetry in pairs:
+                all_lines_of_sym.append(line_of_symmetry)
+
+                # add to data structure with all lines, rounding result
+                lines_of_symmetry_dict[(tuple(points[point_i]), tuple(points[point_j]))] = format_line_equation(
+                    line_of_symmetry, rounding)
+        stats.count("pairs", len(all_lines_of_sym))
 
     ##########################
     ### writing out output ###
@@ -208,23 +842,126 @@ def get_symmetry_line(points, coordinate_plane="Cartesian", rounding=4, visualiz
     new_dir = None
     # do we want to write out CSV file?
     if output_directory:
-        new_dir = write_symmetry_to_csv(lines_of_symmetry_dict, output_directory)
+        with stats.stage("write"):
+            new_dir = get_backend("write_symmetry")(lines_of_symmetry_dict, output_directory, file_format=file_format)
 
     # do we want to visualize?
     if visualize:
-        # get ready to pass in parameters to the visualize function
-        slopes = []
-        y_intercepts = []
-        x_intercepts = []
-        for line in lines_of_symmetry_dict.values():
-            slope = Line(line).get_slope()
-            y_intercept = Line(line).get_y_intercept()
-            x_intercept = Line(line).get_x_intercept()
-            slopes.append(slope)
-            y_intercepts.append(y_intercept)
-            x_intercepts.append(x_intercept)
-
-        # pass into visualize function
-        visualize_symmetry(lines_of_symmetry_dict, slopes, y_intercepts, x_intercepts, new_dir)
+        with stats.stage("plot"):
+            # get ready to pass in parameters to the visualize function
+            slopes = []
+            y_intercepts = []
+            x_intercepts = []
+            for line in lines_of_symmetry_dict.values():
+                parsed_line = parse_line(line)
+                slope = parsed_line.get_slope()
+                y_intercept = parsed_line.get_y_intercept()
+                x_intercept = parsed_line.get_x_intercept()
+                slopes.append(slope)
+                y_intercepts.append(y_intercept)
+                x_intercepts.append(x_intercept)
+
+            # pass into visualize function
+            visualize_symmetry = get_backend("visualize_symmetry")
+            visualize_symmetry(lines_of_symmetry_dict, slopes, y_intercepts, x_intercepts, new_dir, per_pair_plots,
+                               headless, render_workers)
+
+    if output_format == "array":
+        return symmetry_array
 
     return lines_of_symmetry_dict, all_lines_of_sym
+
+
+def symmetry_lines_array(points, dtype=np.float64):
+    '''
+    get the line of symmetry of each pair of points as a structured array, one record per pair in the same order as
+    get_symmetry_line(). each record is (i, j, a, b, c), the line of symmetry of points[i] and points[j] in the canonical
+    general form a*x + b*y + c = 0 of Line.get_coefficients(). 20 bytes per pair with float32, 32 with float64,
+    and filterable with numpy, i.e. array[array["b"] == 0] for the vertical lines
+
+    :param points: list of points (x, y), or an array of shape (N, 2), i.e. [(23,-45.67), (25,-45.67)]
+    :param dtype: float type of the coefficients, i.e. np.float32 or np.float64
+    :return: numpy structured array with fields i, j, a, b, c
+    '''
+
+    point_array = to_point_array(points)
+    n = len(point_array)
+
+    # smallest index type that holds every point index
+    index_dtype = np.int32 if n < 2 ** 31 else np.int64
+    symmetry_array = np.empty(n * (n - 1) // 2, dtype=[("i", index_dtype), ("j", index_dtype), ("a", dtype),
+                                                       ("b", dtype), ("c", dtype)])
+
+    #################
+    ### calculate ###
+    #################
+
+    # one row of pairs (i, j > i) at a time
+    start = 0
+    for point_i in range(n - 1):
+        point_js = np.arange(point_i + 1, n)
+        stop = start + len(point_js)
+
+        rows = symmetry_array[start:stop]
+        rows["i"] = point_i
+        rows["j"] = point_js
+        rows["a"], rows["b"], rows["c"] = pair_line_coefficients(point_array, point_i, point_js)
+
+        start = stop
+
+    return symmetry_array
+
+
+def pair_line_coefficients(point_array, point_i, point_j):
+    '''
+    get the line of symmetry of pairs of points in the canonical general form a*x + b*y + c = 0, with the same steps,
+    and so the same floats, as calculate_symmetry_cartesian() and Line.get_coefficients()
+
+    :param point_array: array of shape (N, 2)
+    :param point_i: index, or array of indices, of the first point of each pair
+    :param point_j: array of indices of the second point of each pair
+    :return: tuple of arrays (a, b, c), one value for each pair
+    '''
+
+    x1 = point_array[point_i, 0]
+    y1 = point_array[point_i, 1]
+    x2 = point_array[point_j, 0]
+    y2 = point_array[point_j, 1]
+
+    # step 1. find midpoint between two points
+    midpoint_x = (x1 + x2) / 2
+    midpoint_y = (y1 + y2) / 2
+
+    # step 2. and 3. perpendicular slope of the line between the points. a vertical line between the points
+    # has a horizontal line of symmetry, and a horizontal line between the points has a vertical one
+    vertical = x1 - x2 == 0
+    horizontal = (y1 - y2 == 0) & ~vertical
+    # step 4. line through the midpoint, y = mx + b -> -mx + y - b = 0, or x = midpoint_x -> x - midpoint_x = 0
+    # the slope and intercept of the vertical lines of symmetry are not used, so their division errors are ignored
+    with np.errstate(divide="ignore", invalid="ignore"):
+        perpendicular_m = np.where(vertical, 0.0, -1 / ((y1 - y2) / (x1 - x2)))
+        b = (-midpoint_x * perpendicular_m) + midpoint_y
+
+    return (np.where(horizontal, 1.0, 0.0 - perpendicular_m),
+            np.where(horizontal, 0.0, 1.0),
+            np.where(horizontal, 0.0 - midpoint_x, 0.0 - b))
+
+
+def format_symmetry_array(symmetry_array, rounding=None):
+    '''
+    format the lines of a structured array from symmetry_lines_array() as equations in slope-intercept form
+
+    :param symmetry_array: numpy structured array with fields a, b, c
+    :param rounding: round the slope and intercept using Python builtin's round()
+    :return: list of equation strings, i.e. ["y=0.32x-9.73", "x=30.0"]
+    '''
+
+    equations = []
+    for a, b, c in zip(symmetry_array["a"].tolist(), symmetry_array["b"].tolist(), symmetry_array["c"].tolist()):
+        if b == 0:
+            # vertical line, a*x + c = 0
+            equations.append(format_equation("DNE", "DNE", 0.0 - c / a, rounding))
+        else:
+            equations.append(format_equation(0.0 - a / b, 0.0 - c / b, None, rounding))
+
+    return equations
@@ -0,0 +1,198 @@
+import threading
+from collections import OrderedDict
+
+from Line import Line
+
+# default number of parsed lines kept by LINE_CACHE
+LINE_CACHE_SIZE = 1024
+
+# default number of reflected points kept by REFLECTION_CACHE, 0 turns it off
+REFLECTION_CACHE_SIZE = 0
+
+
+class LRUCache(object):
+    """
+    A class used to keep the results of the last maxsize keys used, dropping the least recently used key when it is
+    full. It counts hits, misses and evictions, and can be cleared or resized at any time, i.e. between jobs. A lock
+    makes it safe to share between threads.
+
+    ...
+
+    Attributes
+    ----------
+    maxsize : int
+        largest number of keys kept, 0 keeps nothing
+    hits : int
+        number of lookups finding their key
+    misses : int
+        number of lookups not finding their key
+    evictions : int
+        number of keys dropped to make room
+
+    Methods
+    -------
+    get(key, default=None)
+        the value of a key, default if it is not cached
+
+    put(key, value)
+        cache the value of a key
+
+    get_or_compute(key, compute)
+        the value of a key, computed with compute(key) and cached if it is not cached
+
+    clear()
+        drop every key and reset the counts
+
+    resize(maxsize)
+        change maxsize, dropping the least recently used keys over it
+
+    as_dict()
+        the size and counts as a dictionary
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = _check_maxsize(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.as_dict())
+
+    def get(self, key, default=None):
+        '''
+        :param key: hashable key
+        :param default: returned if the key is not cached
+        :return: value of the key, which becomes the most recently used
+        '''
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        '''
+        :param key: hashable key
+        :param value: value of the key
+        :return: None
+        '''
+        if self.maxsize == 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        '''
+        :param key: hashable key
+        :param compute: function of the key returning its value, only called if the key is not cached
+        :return: value of the key
+        '''
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(key)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        '''
+        drop every key and reset the counts
+        :return: None
+        '''
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def resize(self, maxsize):
+        '''
+        :param maxsize: new largest number of keys kept, 0 keeps nothing
+        :return: None
+        '''
+        with self._lock:
+            self.maxsize = _check_maxsize(maxsize)
+            self._evict()
+
+    def as_dict(self):
+        '''
+        :return: dictionary {"size", "maxsize", "hits", "misses", "evictions"}
+        '''
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+    def _evict(self):
+        # drop the least recently used keys over maxsize, the lock must be held
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+# marks a key not found, None can be a cached value
+_MISSING = object()
+
+
+def _check_maxsize(maxsize):
+    if isinstance(maxsize, int) is False or isinstance(maxsize, bool) or maxsize < 0:
+        raise ValueError("LRUCache: maxsize %r must be an integer of at least 0." % (maxsize,))
+    return maxsize
+
+
+# equation string -> Line object
+LINE_CACHE = LRUCache(LINE_CACHE_SIZE)
+
+# (line coefficients, x, y) -> reflected point (x, y), off unless sized with configure_caches()
+REFLECTION_CACHE = LRUCache(REFLECTION_CACHE_SIZE)
+
+
+def parse_line(equation):
+    '''
+    get the Line object of an equation, parsed once and then taken from LINE_CACHE
+
+    :param equation: equation in slope-intercept form, x=x1, or y=y1, i.e. "y=2x+8", see Line
+    :return: Line object, shared with the other callers of the same equation
+    '''
+    return LINE_CACHE.get_or_compute(equation, Line)
+
+
+def configure_caches(line_cache_size=None, reflection_cache_size=None):
+    '''
+    resize the caches, i.e. configure_caches(reflection_cache_size=100000) to turn on the reflection cache
+
+    :param line_cache_size: number of parsed lines kept, None leaves it as it is
+    :param reflection_cache_size: number of reflected points kept, 0 turns it off, None leaves it as it is
+    :return: None
+    '''
+    if line_cache_size is not None:
+        LINE_CACHE.resize(line_cache_size)
+    if reflection_cache_size is not None:
+        REFLECTION_CACHE.resize(reflection_cache_size)
+
+
+def clear_caches():
+    '''
+    drop everything cached and reset the counts, i.e. between jobs
+    :return: None
+    '''
+    LINE_CACHE.clear()
+    REFLECTION_CACHE.clear()
+
+
+def cache_stats():
+    '''
+    :return: dictionary {"lines": LINE_CACHE.as_dict(), "reflections": REFLECTION_CACHE.as_dict()}
+    '''
+    return {"lines": LINE_CACHE.as_dict(), "reflections": REFLECTION_CACHE.as_dict()}
@@ -0,0 +1,73 @@
+from importlib import import_module
+
+# file formats the write backends can output, see output_options.write_table()
+FILE_FORMAT_OPTIONS = {"csv", "csv.gz", "npy", "npz", "parquet"}
+
+# output backends by name, as (module name, function name). a module is only imported the first time one of its
+# backends is used, so plain calculations never import matplotlib
+OUTPUT_BACKENDS = {
+    "write_symmetry": ("output_options", "write_symmetry_to_csv"),
+    "write_valid_lines": ("output_options", "write_valid_lines_csv"),
+    "write_reflection": ("output_options", "write_reflection_to_csv"),
+    "visualize_symmetry": ("plot_options", "visualize_symmetry"),
+    "visualize_valid_lines": ("plot_options", "visualize_valid_lines"),
+    "visualize_reflection": ("plot_options", "visualize_reflection"),
+}
+
+# backends already imported, by name
+_loaded_backends = {}
+
+
+def register_backend(name, module_name, function_name):
+    '''
+    add or replace an output backend, i.e. register_backend("visualize_symmetry", "my_plots", "plot_symmetry").
+    the module is not imported until the backend is used
+
+    :param name: name of the backend, one of the keys of OUTPUT_BACKENDS to replace a built-in backend
+    :param module_name: name of the module holding the function, importable with import_module()
+    :param function_name: name of the function in the module, called with the arguments of the backend it replaces.
+        the write backends are also given file_format, one of FILE_FORMAT_OPTIONS, as a keyword
+    :return: None
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if isinstance(name, str) is False or isinstance(module_name, str) is False or \
+            isinstance(function_name, str) is False:
+        raise TypeError("register_backend: name %r, module_name %r and function_name %r must be strings." %
+                        (name, module_name, function_name))
+
+    OUTPUT_BACKENDS[name] = (module_name, function_name)
+    _loaded_backends.pop(name, None)
+
+
+def get_backend(name):
+    '''
+    get the function of an output backend, importing its module the first time
+
+    :param name: name of the backend, one of the keys of OUTPUT_BACKENDS
+    :return: function of the backend
+    '''
+
+    backend = _loaded_backends.get(name)
+    if backend is not None:
+        return backend
+
+    if name not in OUTPUT_BACKENDS:
+        raise ValueError("get_backend: backend %r must be in %r." % (name, sorted(OUTPUT_BACKENDS)))
+
+    module_name, function_name = OUTPUT_BACKENDS[name]
+    try:
+        backend = getattr(import_module(module_name), function_name)
+    except (ImportError, AttributeError) as e:
+        # reraise it with custom message
+        error_msg_output = "get_backend: backend %r cannot be loaded from %s.%s!" % (name, module_name, function_name)
+        print(error_msg_output)
+        e.args += (error_msg_output,)
+        raise
+
+    _loaded_backends[name] = backend
+
+    return backend
@@ -1,416 +1,28 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 import csv
-from itertools import cycle
+import gzip
+import shutil
+import tempfile
+import zipfile
+from itertools import islice
+from line_cache import parse_line
+from output_backends import FILE_FORMAT_OPTIONS
 
+# number of rows the write functions hold in memory at a time
+CHUNK_SIZE = 65536
 
-def visualize_valid_lines(points, lines, slopes, y_intercepts, x_intercepts, output_dir=None):
-    '''
-    visualize points, line(s) of symmetry, and points reflected over line(s) of symmetry
-
-    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format.
-    :param slopes: slopes for each line of symmetry in the values of lines_points
-    :param y_intercepts: y-intercept for each line of symmetry in the values of lines_points
-    :param x_intercepts: x-intercept for each line of symmetry in the values of lines_points
-    :param output_dir: directory to output the resulting figure, if any
-    :return: None
-    '''
-
-    # get min and max of the reflected points and points to set the range of the map
-    x_min = min([float(key_point[0])
-                 for key_point in points])
-    x_max = max([float(key_point[0])
-                 for key_point in points])
-
-    y_min = min([float(key_point[1])
-                 for key_point in points])
-    y_max = max([float(key_point[1])
-                 for key_point in points])
-
-    range_min = min(x_min, y_min)
-    range_max = max(x_max, y_max)
-
-    # indexing for lines, keeping track of which line currently being looked at
-    line_i = 0
-
-    # aggregate dataframe to later plot all points and lines
-    all_points = []
-    all_x_lines = []
-    all_y_lines = []
-    all_lines_of_sym = []
 
-    ########################
-    ### individual plots ###
-    ########################
-
-    for line in lines:
-        m = slopes[line_i]
-        b = y_intercepts[line_i]
-        if (m != "DNE" and b != "DNE"):
-            # extend line pass the range
-            line_x_vals = np.linspace(range_min - 100, range_max + 100, 100)
-            line_y_vals = (m * line_x_vals) + b
-        else:
-            # vertical line
-            line_x_vals = [x_intercepts[line_i]] * 100
-            line_y_vals = np.linspace(range_min - 100, range_max + 100, 100)
-        # adding to aggregate dataframes to later plot all points and lines
-        all_x_lines.append(line_x_vals)
-        all_y_lines.append(line_y_vals)
-        all_lines_of_sym.append(line)
-
-        line_i += 1
-    all_x_vals = []
-    all_y_vals = []
-    for point in points:
-        # x values and y value currently being looked at
-        all_x_vals.append(float(point[0]))
-        all_y_vals.append(float(point[1]))
-
-    # plotting
-    # initializing figure
-    points_str = '__'.join(str(p[0]) + '_' + str(p[1]) for p in points)
-    file_name = "symmetry_%s.png" % (points_str)
-
-    fig = plt.figure(file_name)
-    ax = plt.gca()
-
-    # set limits for display
-    buffer = int((range_max - range_min) / 20)
-    if buffer == 0:
-        buffer = 1
-    plt.xlim([range_min - buffer, range_max + buffer])
-    plt.ylim([range_min - buffer, range_max + buffer])
-
-    # set increments so x and y are on the same scale, integers so it's cleaner
-    plt.xticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-    plt.yticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-
-    # labeling the axes
-    plt.xlabel("x")
-    plt.ylabel("y")
-
-    # draw x- and y- axis
-    ax.axhline(y=0, color='k')
-    ax.axvline(x=0, color='k')
-
-    # plot line and points
-    for i in range(len(all_x_lines)):
-        plt.plot(all_x_lines[i], all_y_lines[i], '--', color="green", label=lines[i])
-    plt.scatter(all_x_vals, all_y_vals, c="orange", marker='o', label="Given Points")
-
-    # annotate the points
-    for point_xy in zip(all_x_vals, all_y_vals):
-        ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
-
-    # custom plot functions
-    plt.title("valid lines %r" % (points,))
-    plt.grid()
-    plt.legend()
-
-    # save figure
-    if output_dir:
-        plt.savefig(os.path.join(output_dir, file_name))
-
-    plt.show()
-    plt.close()
-
-    return
-
-
-def visualize_symmetry(lines_of_symmetry_dict, slopes, y_intercepts, x_intercepts, output_dir=None):
-    '''
-    visualize points, line(s) of symmetry, and points reflected over line(s) of symmetry
-
-    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format.
-    :param slopes: slopes for each line of symmetry in the values of lines_points
-    :param y_intercepts: y-intercept for each line of symmetry in the values of lines_points
-    :param x_intercepts: x-intercept for each line of symmetry in the values of lines_points
-    :param output_dir: directory to output the resulting figure, if any
-    :return: None
+def write_valid_lines_csv(points, lines, output_directory, file_format="csv"):
     '''
-    # get min and max of the reflected points and points to set the range of the map
-    x_min = min([float(key_point[0])
-                 for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
-    x_max = max([float(key_point[0]) for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
-
-    y_min = min([float(key_point[1]) for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
-    y_max = max([float(key_point[1]) for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
-
-    range_min = min(x_min, y_min)
-    range_max = max(x_max, y_max)
-
-    # indexing for lines, keeping track of which line currently being looked at
-    line_i = 0
-
-    # aggregate dataframe to later plot all points and lines
-    all_points = []
-    all_x_lines = []
-    all_y_lines = []
-    all_lines_of_sym = []
-
-    ########################
-    ### individual plots ###
-    ########################
-
-    for points, line_of_symmetry in lines_of_symmetry_dict.items():
-        point1 = points[0]
-        point2 = points[1]
-        m = slopes[line_i]
-        b = y_intercepts[line_i]
-        if (m != "DNE" and b != "DNE"):
-            # extend line pass the range
-            line_x_vals = np.linspace(range_min - 100, range_max + 100, 100)
-            line_y_vals = (m * line_x_vals) + b
-        else:
-            # vertical line
-            line_x_vals = [x_intercepts[line_i]] * 100
-            line_y_vals = np.linspace(range_min - 100, range_max + 100, 100)
-        # x values and y value currently being looked at
-        point_x_vals = float(point1[0]), float(point2[0])
-        point_y_vals = float(point1[1]), float(point2[1])
-
-        # adding to aggregate dataframes to later plot all points and lines
-        if point1 not in all_points:
-            all_points.append(point1)
-        if point2 not in all_points:
-            all_points.append(point2)
-        all_x_lines.append(line_x_vals)
-        all_y_lines.append(line_y_vals)
-        all_lines_of_sym.append(line_of_symmetry)
-
-        line_i += 1
-
-        # plotting
-        # initializing figure
-        points_str = '_'.join(str(v) for v in points[0]) + '__' + '_'.join(str(v) for v in points[1])
-        file_name = "symmetry_%s.png" % (points_str)
-
-        fig = plt.figure(file_name)
-        ax = plt.gca()
-
-        # set limits for display
-        buffer = int((range_max - range_min) / 20)
-        if buffer == 0:
-            buffer = 1
-        plt.xlim([range_min - buffer, range_max + buffer])
-        plt.ylim([range_min - buffer, range_max + buffer])
-
-        # set increments so x and y are on the same scale, integers so it's cleaner
-        plt.xticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-        plt.yticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-
-        # labeling the axes
-        plt.xlabel("x")
-        plt.ylabel("y")
-
-        # draw x- and y- axis
-        ax.axhline(y=0, color='k')
-        ax.axvline(x=0, color='k')
-
-        # plot line and points
-        plt.plot(line_x_vals, line_y_vals, '--', color="green", label=line_of_symmetry)
-        plt.scatter(point_x_vals, point_y_vals, c="orange", marker='o', label="Given Points")
-
-        # annotate the points
-        for point_xy in zip(point_x_vals, point_y_vals):
-            ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
-
-        # custom plot functions
-        plt.title("line of symmetry for %r" % (points,))
-        plt.grid()
-        plt.legend()
-
-        # save figure
-        if output_dir:
-            plt.savefig(os.path.join(output_dir, file_name))
-
-        plt.show()
-        plt.close()
-
-    ######################
-    ### aggregate plot ###
-    ######################
-
-    fig = plt.figure("aggregate symmetry for all given points")
-    ax = plt.gca()
-
-    # set limits for display
-    buffer = int((range_max - range_min) / 20)
-    if buffer == 0:
-        buffer = 1
-    plt.xlim([range_min - buffer, range_max + buffer])
-    plt.ylim([range_min - buffer, range_max + buffer])
-
-    # set increments so x and y are on the same scale, integers so it's cleaner
-    plt.xticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-    plt.yticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-
-    # labeling the axes
-    plt.xlabel("x")
-    plt.ylabel("y")
-
-    # draw x- and y- axis
-    ax.axhline(y=0, color='k')
-    ax.axvline(x=0, color='k')
-
-    # get all the x and ys in separate structure
-    all_x_points = []
-    all_y_points = []
-    for point in all_points:
-        all_x_points.append(float(point[0]))
-        all_y_points.append(float(point[1]))
-
-    # setting colors
-    color_range = np.arange(len(all_points))
-    # changing colors: https://stackoverflow.com/questions/37890412/increment-matplotlib-color-cycle
-    prop_cycle = plt.rcParams['axes.prop_cycle']
-    colors = cycle(prop_cycle.by_key()['color'])
-
-    # plot all the lines and all the points
-    for line in range(len(all_x_lines)):
-        plt.plot(all_x_lines[line], all_y_lines[line], '--', color=next(colors), label=all_lines_of_sym[line])
-    plt.scatter(all_x_points, all_y_points, c=color_range, marker='o', label="Given Points")
-
-    # annotate the points
-    for point_xy in zip(all_x_points, all_y_points):
-        ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
-
-    # custom plot functions
-    plt.title("aggregate line of symmetry for all points")
-    plt.grid()
-    plt.legend(bbox_to_anchor=(1.04, 1), loc='upper left', prop={'size': 6})
-    plt.tight_layout(rect=[0, 0, 0.75, 1])
-    # save figure
-    if output_dir:
-        plt.savefig(os.path.join(output_dir, file_name), bbox_inches="tight")
-
-    plt.show()
-    plt.close()
-
-    return
-
-
-def visualize_reflection(points, all_reflected_points, slopes, y_intercepts, x_intercepts, output_dir=None):
-    '''
-    visualize  reflection from given points to newly reflected points and lines of symmetry
+    write out points, and their line(s) of symmetry, into valid_symmetry.<file_format> with a line_of_symmetry column and
+    given_points.<file_format> with given_x and given_y columns
 
     :param points: given points, in tuple or list
-    :param all_reflected_points: a dictionary resulted from symmetry(), i.e. {"y=2x+2", [(3,3),(-2,-8)]}
-    :param slopes: slope for each line of symmetry in the keys of all_reflected_points
-    :param y_intercepts: y-intercept for each line of symmetry in the keys of all_reflected_points
-    :param x_intercepts: x_intercept for each line of symmetry in the keys of all_reflected_points
-    :param output_dir: save PNG of the plot if given output directory path
-    :return: None
-    '''
-
-    # get min and max of the reflected points and points to set the range of the map
-    x_min = min([values[0] for list_of_values in all_reflected_points.values() for values in list_of_values])
-    x_max = max([values[0] for list_of_values in all_reflected_points.values() for values in list_of_values])
-
-    y_min = min([values[1] for list_of_values in all_reflected_points.values() for values in list_of_values])
-    y_max = max([values[1] for list_of_values in all_reflected_points.values() for values in list_of_values])
-
-    range_min = min(x_min, y_min)
-    range_max = max(x_max, y_max)
-
-    line_i = 0
-    # make a plot for each line of symmetry
-    for key, vals in all_reflected_points.items():
-
-        # parse line and points in proper format
-        # line of symmetry
-        m = slopes[line_i]
-        b = y_intercepts[line_i]
-        if (m != "DNE" and b != "DNE"):
-            # extend line pass the range
-            line_x_vals = np.linspace(range_min - 100, range_max + 100, 100)
-            line_y_vals = (m * line_x_vals) + b
-
-        else:
-            # vertical line
-            line_x_vals = [x_intercepts[line_i]] * 100
-            line_y_vals = np.linspace(range_min - 100, range_max + 100, 100)
-
-        # given points
-        point_x_vals = [p[0] for p in points]
-        point_y_vals = [p[1] for p in points]
-
-        # reflected points
-        reflected_x_vals = []
-        reflected_y_vals = []
-        for val in vals:
-            x = val[0]
-            y = val[1]
-            reflected_x_vals.append(x)
-            reflected_y_vals.append(y)
-
-        # increment so next graph will get the correct slope and intercepts
-        line_i += 1
-
-        # initializing figure
-        fig = plt.figure("reflection_%s.png" % key)
-        ax = plt.gca()
-
-        # set limits for display
-        buffer = int((range_max - range_min) / 20)
-        if buffer == 0:
-            buffer = 1
-        plt.xlim([range_min - buffer, range_max + buffer])
-        plt.ylim([range_min - buffer, range_max + buffer])
-
-        # set increments so x and y are on the same scale, integers so it's cleaner
-        plt.xticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-        plt.yticks(np.arange(range_min - buffer, range_max + buffer, (range_max - range_min) / 10))
-
-        # labeling the axes
-        plt.xlabel("x")
-        plt.ylabel("y")
-
-        # draw x- and y- axis
-        ax.axhline(y=0, color='k')
-        ax.axvline(x=0, color='k')
-
-        color_range = np.arange(len(point_x_vals))
-
-        # plot
-        line_sym_plot = ax.plot(line_x_vals, line_y_vals, '--', color="green", label=key)
-        plt.scatter(point_x_vals, point_y_vals, c=color_range, marker='o')
-        reflected_points = plt.scatter(reflected_x_vals, reflected_y_vals, c=color_range, marker='o')
-        # differentiate the reflected points
-        reflected_points.set_facecolor('none')
-
-        # annotate the points
-        for point_xy in zip(point_x_vals, point_y_vals):
-            ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
-        for reflected_xy in zip(reflected_x_vals, reflected_y_vals):
-            ax.annotate('(%s, %s)' % reflected_xy, xy=reflected_xy, textcoords='data')
-        # custom plot functions
-        plt.title("reflected points for %r" % key)
-        plt.grid()
-
-        # custom legends
-        line1 = plt.Line2D(range(1), range(1), color="black", marker='o', linestyle='None', label='Given Points')
-        line2 = plt.Line2D(range(1), range(1), color="black", marker='o', markerfacecolor="none", linestyle='None',
-                           label='Reflected Points')
-        ax.legend(handles=[line_sym_plot[0], line1, line2])
-
-        # save figure
-        if output_dir:
-            plt.savefig(os.path.join(output_dir, "reflection_%s.png" % key))
-
-        plt.show()
-        plt.close()
-
-
-def write_valid_lines_csv(points, lines, output_directory):
-    '''
-    write out points, and their line(s) of symmetry into a CSV
-
-    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format.
-    :param output_directory: directory path to output CSV
-    :return: path in which the CSV is outputted
+    :param lines: equations of the valid lines of symmetry, in a list or any iterable
+    :param output_directory: directory path to output the files
+    :param file_format: one of FILE_FORMAT_OPTIONS, see write_table()
+    :return: path in which the files are outputted
     '''
 
     # create a new directory for results
@@ -418,29 +30,24 @@ def write_valid_lines_csv(points, lines, output_directory):
     if not os.path.isdir(new_dir):
         os.makedirs(new_dir)
 
-    # write out dictionary into CSV
-    with open(os.path.join(new_dir, 'valid_symmetry.csv'), 'w') as f:
-        # create writer and define column names
-        writer = csv.DictWriter(f, fieldnames=["given_points", "line_of_symmetry"])
-        writer.writeheader()
-
-        if not lines:
-            writer.writerow({"given_points": points, "line_of_symmetry": "None"})
-        else:
-            # write out line by line
-            for line in lines:
-                writer.writerow({"given_points": points, "line_of_symmetry": line})
+    write_table(os.path.join(new_dir, "valid_symmetry"), ["line_of_symmetry"],
+                ((line,) for line in lines), file_format, line_column="line_of_symmetry")
+    write_table(os.path.join(new_dir, "given_points"), ["given_x", "given_y"],
+                ((float(point[0]), float(point[1])) for point in points), file_format)
 
     return new_dir
 
 
-def write_symmetry_to_csv(lines_of_symmetry_dict, output_directory):
+def write_symmetry_to_csv(lines_of_symmetry_dict, output_directory, file_format="csv"):
     '''
-    write out points, and their line(s) of symmetry into a CSV
-
-    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format.
-    :param output_directory: directory path to output CSV
-    :return: path in which the CSV is outputted
+    write out points, and their line(s) of symmetry, into symmetry.<file_format> with columns
+    point_1_x, point_1_y, point_2_x, point_2_y, line_of_symmetry
+
+    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format,
+        or any iterable of ((x1,y1), (y1,y2)), line_of_symmetry) records, i.e. a generator, written as it is iterated
+    :param output_directory: directory path to output the file
+    :param file_format: one of FILE_FORMAT_OPTIONS, see write_table()
+    :return: path in which the file is outputted
     '''
 
     # create a new directory for results
@@ -448,27 +55,29 @@ def write_symmetry_to_csv(lines_of_symmetry_dict, output_directory):
     if not os.path.isdir(new_dir):
         os.makedirs(new_dir)
 
-    # write out dictionary into CSV
-    with open(os.path.join(new_dir, 'symmetry.csv'), 'w') as f:
-        # create writer and define column names
-        writer = csv.DictWriter(f, fieldnames=["point_1", "point_2", "line_of_symmetry"])
-        writer.writeheader()
+    records = lines_of_symmetry_dict
+    if isinstance(records, dict):
+        records = records.items()
 
-        # write out line by line
-        for key, val in lines_of_symmetry_dict.items():
-            writer.writerow({"point_1": key[0], "point_2": key[1], "line_of_symmetry": val})
+    rows = ((float(key[0][0]), float(key[0][1]), float(key[1][0]), float(key[1][1]), val) for key, val in records)
+    write_table(os.path.join(new_dir, "symmetry"), ["point_1_x", "point_1_y", "point_2_x", "point_2_y",
+                                                    "line_of_symmetry"], rows, file_format,
+                line_column="line_of_symmetry")
 
     return new_dir
 
 
-def write_reflection_to_csv(points, all_reflected_points, output_directory):
+def write_reflection_to_csv(points, all_reflected_points, output_directory, file_format="csv"):
     '''
-    write out points, line of symmetry, and the resulting reflected points into a CSV
+    write out points, line of symmetry, and the resulting reflected points, into reflection.<file_format> with columns
+    line_of_symmetry, given_x, given_y, reflected_x, reflected_y
 
     :param points: given points, in tuple or list
-    :param all_reflected_points: a dictionary resulted from symmetry(), i.e. {"y=2x+2", [(3,3),(-2,-8)]}
-    :param output_directory: directory path to output CSV
-    :return: path in which the CSV is outputted
+    :param all_reflected_points: a dictionary resulted from symmetry(), i.e. {"y=2x+2", [(3,3),(-2,-8)]},
+        or any iterable of (line_of_symmetry, reflected_points) records, written as it is iterated
+    :param output_directory: directory path to output the file
+    :param file_format: one of FILE_FORMAT_OPTIONS, see write_table()
+    :return: path in which the file is outputted
     '''
 
     # create a new directory for results
@@ -476,18 +85,162 @@ def write_reflection_to_csv(points, all_reflected_points, output_directory):
     if not os.path.isdir(new_dir):
         os.makedirs(new_dir)
 
-    # write out dictionary into CSV
-    with open(os.path.join(new_dir, 'reflection.csv'), 'w') as f:
-        # create writer and define column names
-        writer = csv.DictWriter(f, fieldnames=["line_of_symmetry", "given_points", "reflected_points"])
-        writer.writeheader()
+    records = all_reflected_points
+    if isinstance(records, dict):
+        records = records.items()
 
-        # write out line by line
-        for key in all_reflected_points:
-            i = 0
-            for reflected_point in all_reflected_points[key]:
-                writer.writerow(
-                    {"line_of_symmetry": key, "given_points": points[i], "reflected_points": reflected_point})
-                i += 1
+    # each reflected point is written next to the given point it is reflected from
+    rows = ((key, float(point[0]), float(point[1]), float(reflected_point[0]), float(reflected_point[1]))
+            for key, reflected_points in records for point, reflected_point in zip(points, reflected_points))
+    write_table(os.path.join(new_dir, "reflection"), ["line_of_symmetry", "given_x", "given_y", "reflected_x",
+                                                      "reflected_y"], rows, file_format,
+                line_column="line_of_symmetry")
 
     return new_dir
+
+
+def write_table(file_path, columns, rows, file_format="csv", line_column=None, chunk_size=CHUNK_SIZE):
+    '''
+    write rows into a file, chunk_size rows at a time, so rows from a generator are never all in memory
+
+    file formats:
+    "csv": text, one row per line
+    "csv.gz": gzip compressed csv
+    "npy": NumPy structured array, one record per row
+    "npz": NumPy archive with one array per column, read back with np.load(path)[column]
+    "parquet": columnar Parquet file, needs pyarrow
+
+    :param file_path: path of the file without its extension, the extension of the file format is added
+    :param columns: column names, in row order
+    :param rows: iterable of tuples, one value per column. values are numbers, except in line_column
+    :param file_format: one of FILE_FORMAT_OPTIONS
+    :param line_column: name of the column holding equations of lines, i.e. "y=2x+8". NumPy formats have no text
+        columns, so it is written as the canonical coefficients of the line in columns a, b, c instead
+    :param chunk_size: number of rows written at a time
+    :return: path of the written file
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if file_format not in FILE_FORMAT_OPTIONS:
+        raise ValueError("write_table: file_format %r must be in %r." % (file_format, FILE_FORMAT_OPTIONS))
+
+    file_path = "%s.%s" % (file_path, file_format)
+    chunks = _iter_chunks(rows, chunk_size)
+
+    ###############
+    ### writing ###
+    ###############
+
+    if file_format in ("csv", "csv.gz"):
+        if file_format == "csv.gz":
+            f = gzip.open(file_path, "wt", newline="")
+        else:
+            f = open(file_path, "w", newline="")
+
+        with f:
+            # create writer and define column names, then write out a chunk of rows at a time
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for chunk in chunks:
+                writer.writerows(chunk)
+
+        return file_path
+
+    if file_format == "parquet":
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            # reraise it with custom message
+            error_msg_output = "write_table: file_format 'parquet' needs pyarrow to be installed!"
+            print(error_msg_output)
+            e.args += (error_msg_output,)
+            raise
+
+        # one row group per chunk, columns keep their names and numbers stay numbers
+        schema = pyarrow.schema([(column, pyarrow.string() if column == line_column else pyarrow.float64())
+                                 for column in columns])
+        with pyarrow.parquet.ParquetWriter(file_path, schema) as writer:
+            for chunk in chunks:
+                writer.write_table(pyarrow.Table.from_arrays(
+                    [pyarrow.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)],
+                    schema=schema))
+
+        return file_path
+
+    # NumPy formats, the line column becomes its coefficients
+    dtype = []
+    for column in columns:
+        if column == line_column:
+            dtype += [("a", np.float64), ("b", np.float64), ("c", np.float64)]
+        else:
+            dtype.append((column, np.float64))
+    dtype = np.dtype(dtype)
+
+    record_chunks = (np.array([_numeric_row(row, columns, line_column) for row in chunk], dtype=dtype)
+                     for chunk in chunks)
+
+    if file_format == "npy":
+        with open(file_path, "wb") as f:
+            _write_npy(f, dtype, record_chunks)
+    else:
+        # stream each column into its own temporary file, then into its own array of the archive
+        column_files = {name: tempfile.TemporaryFile() for name in dtype.names}
+        try:
+            count = 0
+            for record_chunk in record_chunks:
+                for name, column_file in column_files.items():
+                    column_file.write(np.ascontiguousarray(record_chunk[name]).tobytes())
+                count += len(record_chunk)
+
+            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                for name, column_file in column_files.items():
+                    column_file.seek(0)
+                    with archive.open(name + ".npy", "w", force_zip64=True) as member:
+                        np.lib.format.write_array_header_1_0(
+                            member, {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                                     "fortran_order": False, "shape": (count,)})
+                        shutil.copyfileobj(column_file, member)
+        finally:
+            for column_file in column_files.values():
+                column_file.close()
+
+    return file_path
+
+
+def _iter_chunks(rows, chunk_size):
+    # lists of up to chunk_size rows
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _numeric_row(row, columns, line_column):
+    # row with the equation in line_column replaced by the canonical coefficients of the line
+    numeric_row = []
+    for column, value in zip(columns, row):
+        if column == line_column:
+            numeric_row.extend(parse_line(value).get_coefficients())
+        else:
+            numeric_row.append(value)
+    return tuple(numeric_row)
+
+
+def _write_npy(f, dtype, record_chunks):
+    # .npy needs the number of records in its header, so records go to a temporary file first, then after the header
+    with tempfile.TemporaryFile() as records_file:
+        count = 0
+        for record_chunk in record_chunks:
+            records_file.write(record_chunk.tobytes())
+            count += len(record_chunk)
+
+        np.lib.format.write_array_header_1_0(
+            f, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (count,)})
+        records_file.seek(0)
+        shutil.copyfileobj(records_file, f)
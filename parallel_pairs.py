@@ -0,0 +1,175 @@
+import atexit
+from collections import deque
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from computation import calculate_symmetry_cartesian
+from reflection_engine import to_point_array
+
+# points shared with the worker processes, and the same points as tuples, set by _attach_points() in each worker
+_shared_points = None
+_shared_point_list = None
+_shared_memory = None
+
+# most pairs in a row block of iter_symmetry_lines_parallel(), so the Line objects of the blocks in flight stay bounded
+PARALLEL_BLOCK_PAIRS = 1 << 16
+
+# long-lived pool of worker processes, and its number of workers, see get_worker_pool()
+_worker_pool = None
+_worker_pool_size = 0
+
+
+def balanced_row_blocks(n, blocks):
+    '''
+    split the rows of the upper-triangular pair space of n points into contiguous blocks holding about the same
+    number of pairs. row i holds the n-1-i pairs (i, j) with j > i
+
+    :param n: number of points
+    :param blocks: number of blocks wanted
+    :return: list of (start, stop) row ranges, in row order, covering rows 0 to n-1
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if isinstance(n, int) is False or isinstance(blocks, int) is False:
+        raise TypeError("balanced_row_blocks: n %r and blocks %r must be integers." % (n, blocks))
+
+    if blocks < 1:
+        raise ValueError("balanced_row_blocks: blocks %r must be at least 1." % blocks)
+
+    #################
+    ### calculate ###
+    #################
+
+    total_pairs = n * (n - 1) // 2
+    row_blocks = []
+    start = 0
+    pairs_so_far = 0
+    for row in range(n):
+        pairs_so_far += n - 1 - row
+        # close the block once it reaches its share of all pairs
+        if pairs_so_far * blocks >= total_pairs * (len(row_blocks) + 1) and len(row_blocks) < blocks - 1:
+            row_blocks.append((start, row + 1))
+            start = row + 1
+
+    if start < n:
+        row_blocks.append((start, n))
+
+    return row_blocks
+
+
+def _attach_points(name, shape):
+    # runs once in each worker process, keep a view of the shared points for the life of the worker
+    global _shared_points, _shared_point_list, _shared_memory
+    _shared_memory = shared_memory.SharedMemory(name=name)
+    _shared_points = np.ndarray(shape, dtype=np.float64, buffer=_shared_memory.buf)
+    _shared_point_list = [tuple(point) for point in _shared_points.tolist()]
+
+
+def _row_block_lines(row_block):
+    # line of symmetry for every pair in a block of rows, in pair order
+    start, stop = row_block
+    point_list = _shared_point_list
+
+    lines = []
+    for point_i in range(start, stop):
+        for point_j in range(point_i + 1, len(point_list)):
+            lines.append(calculate_symmetry_cartesian(point_list[point_i], point_list[point_j]))
+
+    return lines
+
+
+def iter_symmetry_lines_parallel(points, workers, blocks_per_worker=4, block_pairs=PARALLEL_BLOCK_PAIRS):
+    '''
+    get the line of symmetry of each pair of points on a pool of worker processes, in the same order as the serial
+    iter_symmetry_lines(). the points are passed once to the workers through shared memory, and the pairs are split into
+    row blocks of about the same size. only about 2 blocks for each worker are in flight at a time, so like the serial
+    generator the memory used does not grow with the number of pairs
+
+    :param points: list of points (x, y), or an array of shape (N, 2), i.e. [(23,-45.67), (25,-45.67)]
+    :param workers: number of worker processes
+    :param blocks_per_worker: number of row blocks for each worker, more blocks balance the load better
+    :param block_pairs: most pairs in a row block, more points make more blocks. a row longer than it is one block
+    :return: generator of (i, j, line) records, where line is the Line object of symmetry of points[i] and points[j]
+    '''
+
+    point_array = to_point_array(points)
+    n = len(point_array)
+
+    # copy the points into shared memory once, the workers read them without copying
+    points_memory = shared_memory.SharedMemory(create=True, size=max(point_array.nbytes, 1))
+    try:
+        np.ndarray(point_array.shape, dtype=np.float64, buffer=points_memory.buf)[:] = point_array
+
+        total_pairs = n * (n - 1) // 2
+        blocks = max(workers * blocks_per_worker, -(-total_pairs // block_pairs))
+        row_blocks = balanced_row_blocks(n, blocks)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_points,
+                                 initargs=(points_memory.name, point_array.shape)) as executor:
+            # the blocks are given back in row order, so the pairs come out in the serial order
+            pending = deque()
+            for row_block in row_blocks:
+                pending.append((row_block, executor.submit(_row_block_lines, row_block)))
+                while len(pending) > 2 * workers:
+                    for record in _block_records(n, *pending.popleft()):
+                        yield record
+
+            while pending:
+                for record in _block_records(n, *pending.popleft()):
+                    yield record
+    finally:
+        points_memory.close()
+        points_memory.unlink()
+
+
+def _block_records(n, row_block, future):
+    # (i, j, line) records of a row block, the lines are let go of as they are yielded
+    start, stop = row_block
+    lines = future.result()
+    lines.reverse()
+    for point_i in range(start, stop):
+        for point_j in range(point_i + 1, n):
+            yield point_i, point_j, lines.pop()
+
+
+def get_worker_pool(workers):
+    '''
+    get a pool of worker processes kept between calls, so the workers start, and import numpy, only once. asking for a
+    different number of workers replaces the pool. the pool is shut down at exit, or by shutdown_worker_pool()
+
+    :param workers: number of worker processes
+    :return: concurrent.futures.ProcessPoolExecutor
+    '''
+
+    global _worker_pool, _worker_pool_size
+
+    if isinstance(workers, int) is False or workers < 1:
+        raise ValueError("get_worker_pool: workers %r must be an integer of at least 1." % (workers,))
+
+    if _worker_pool is None or _worker_pool_size != workers:
+        shutdown_worker_pool()
+        _worker_pool = ProcessPoolExecutor(max_workers=workers)
+        _worker_pool_size = workers
+
+    return _worker_pool
+
+
+def shutdown_worker_pool():
+    '''
+    shut down the pool of get_worker_pool(), waiting for its work to finish. the next get_worker_pool() starts a new one
+
+    :return: None
+    '''
+
+    global _worker_pool, _worker_pool_size
+
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
+        _worker_pool = None
+        _worker_pool_size = 0
+
+
+atexit.register(shutdown_worker_pool)
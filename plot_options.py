@@ -0,0 +1,490 @@
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, repeat
+
+# file name of the figure with all lines of symmetry
+AGGREGATE_FILE_NAME = "symmetry_aggregate.png"
+
+
+def visualize_valid_lines(points, lines, slopes, y_intercepts, x_intercepts, output_dir=None, headless=False):
+    '''
+    visualize points, line(s) of symmetry, and points reflected over line(s) of symmetry
+
+    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format.
+    :param slopes: slopes for each line of symmetry in the values of lines_points
+    :param y_intercepts: y-intercept for each line of symmetry in the values of lines_points
+    :param x_intercepts: x-intercept for each line of symmetry in the values of lines_points
+    :param output_dir: directory to output the resulting figure, if any
+    :param headless: draw the figure on the Agg backend without showing it
+    :return: None
+    '''
+
+    # get min and max of the reflected points and points to set the range of the map
+    x_min = min([float(key_point[0])
+                 for key_point in points])
+    x_max = max([float(key_point[0])
+                 for key_point in points])
+
+    y_min = min([float(key_point[1])
+                 for key_point in points])
+    y_max = max([float(key_point[1])
+                 for key_point in points])
+
+    range_min = min(x_min, y_min)
+    range_max = max(x_max, y_max)
+
+    all_x_vals = []
+    all_y_vals = []
+    for point in points:
+        # x values and y value currently being looked at
+        all_x_vals.append(float(point[0]))
+        all_y_vals.append(float(point[1]))
+
+    # plotting
+    # initializing figure
+    points_str = '__'.join(str(p[0]) + '_' + str(p[1]) for p in points)
+    file_name = "symmetry_%s.png" % (points_str)
+
+    fig, ax = _new_figure(file_name, headless)
+    _setup_axes(ax, range_min, range_max)
+
+    # plot line and points
+    for line_i, line in enumerate(lines):
+        line_x_vals, line_y_vals = _line_values(slopes[line_i], y_intercepts[line_i], x_intercepts[line_i],
+                                                range_min, range_max)
+        ax.plot(line_x_vals, line_y_vals, '--', color="green", label=line)
+    ax.scatter(all_x_vals, all_y_vals, c="orange", marker='o', label="Given Points")
+
+    # annotate the points
+    for point_xy in zip(all_x_vals, all_y_vals):
+        ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
+
+    # custom plot functions
+    ax.set_title("valid lines %r" % (points,))
+    ax.grid()
+    ax.legend()
+
+    _finish_figure(fig, output_dir, file_name, headless)
+
+    return
+
+
+def visualize_symmetry(lines_of_symmetry_dict, slopes, y_intercepts, x_intercepts, output_dir=None, per_pair=False,
+                       headless=False, render_workers=None):
+    '''
+    visualize points, line(s) of symmetry, and points reflected over line(s) of symmetry
+
+    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format.
+    :param slopes: slopes for each line of symmetry in the values of lines_points
+    :param y_intercepts: y-intercept for each line of symmetry in the values of lines_points
+    :param x_intercepts: x-intercept for each line of symmetry in the values of lines_points
+    :param output_dir: directory to output the resulting figure, if any
+    :param per_pair: also make a figure for each pair of points before the aggregate figure
+    :param headless: draw the figures on the Agg backend without showing them, the aggregate figure is drawn by
+        render_symmetry_aggregate()
+    :param render_workers: if more than 1, draw the figures of the pairs on this many worker processes, see
+        render_figures()
+    :return: None, or the aggregate matplotlib Figure if headless
+    '''
+
+    # get min and max of the reflected points and points to set the range of the map
+    x_min = min([float(key_point[0])
+                 for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
+    x_max = max([float(key_point[0]) for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
+
+    y_min = min([float(key_point[1]) for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
+    y_max = max([float(key_point[1]) for key_points in lines_of_symmetry_dict.keys() for key_point in key_points])
+
+    range_min = min(x_min, y_min)
+    range_max = max(x_max, y_max)
+
+    ########################
+    ### individual plots ###
+    ########################
+
+    # individual plots are only made when asked for
+    if per_pair:
+        figure_args = [(points, line_of_symmetry, slopes[line_i], y_intercepts[line_i], x_intercepts[line_i],
+                        range_min, range_max)
+                       for line_i, (points, line_of_symmetry) in enumerate(lines_of_symmetry_dict.items())]
+        render_figures(draw_symmetry_pair, figure_args, output_dir, headless, render_workers)
+
+    ######################
+    ### aggregate plot ###
+    ######################
+
+    if headless:
+        return render_symmetry_aggregate(lines_of_symmetry_dict, slopes, y_intercepts, x_intercepts, output_dir)
+
+    fig, ax = _new_figure("aggregate symmetry for all given points", headless)
+    _setup_axes(ax, range_min, range_max)
+
+    # every point once, in the order they are first found
+    all_points = list(dict.fromkeys(key_point for key_points in lines_of_symmetry_dict for key_point in key_points))
+
+    # get all the x and ys in separate structure
+    all_x_points = []
+    all_y_points = []
+    for point in all_points:
+        all_x_points.append(float(point[0]))
+        all_y_points.append(float(point[1]))
+
+    # setting colors
+    color_range = np.arange(len(all_points))
+    # changing colors: https://stackoverflow.com/questions/37890412/increment-matplotlib-color-cycle
+    prop_cycle = plt.rcParams['axes.prop_cycle']
+    colors = cycle(prop_cycle.by_key()['color'])
+
+    # plot all the lines and all the points
+    for line_i, line_of_symmetry in enumerate(lines_of_symmetry_dict.values()):
+        line_x_vals, line_y_vals = _line_values(slopes[line_i], y_intercepts[line_i], x_intercepts[line_i],
+                                                range_min, range_max)
+        ax.plot(line_x_vals, line_y_vals, '--', color=next(colors), label=line_of_symmetry)
+    ax.scatter(all_x_points, all_y_points, c=color_range, marker='o', label="Given Points")
+
+    # annotate the points
+    for point_xy in zip(all_x_points, all_y_points):
+        ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
+
+    # custom plot functions
+    ax.set_title("aggregate line of symmetry for all points")
+    ax.grid()
+    ax.legend(bbox_to_anchor=(1.04, 1), loc='upper left', prop={'size': 6})
+    fig.tight_layout(rect=[0, 0, 0.75, 1])
+
+    _finish_figure(fig, output_dir, AGGREGATE_FILE_NAME, headless, bbox_inches="tight")
+
+    return
+
+
+def draw_symmetry_pair(points, line_of_symmetry, m, b, x_intercept, range_min, range_max, output_dir=None,
+                       headless=False):
+    '''
+    draw the figure of one pair of points and their line of symmetry
+
+    :param points: tuple of the two points ((x1,y1), (x2,y2))
+    :param line_of_symmetry: line of symmetry of the points, used as its label
+    :param m: slope of the line of symmetry, "DNE" if vertical
+    :param b: y-intercept of the line of symmetry, "DNE" if vertical
+    :param x_intercept: x-intercept of the line of symmetry
+    :param range_min: smallest x or y shown
+    :param range_max: largest x or y shown
+    :param output_dir: directory to output the resulting figure, if any
+    :param headless: draw the figure on the Agg backend without showing it
+    :return: None
+    '''
+
+    point1 = points[0]
+    point2 = points[1]
+    line_x_vals, line_y_vals = _line_values(m, b, x_intercept, range_min, range_max)
+
+    # x values and y value currently being looked at
+    point_x_vals = float(point1[0]), float(point2[0])
+    point_y_vals = float(point1[1]), float(point2[1])
+
+    # initializing figure
+    points_str = '_'.join(str(v) for v in points[0]) + '__' + '_'.join(str(v) for v in points[1])
+    file_name = "symmetry_%s.png" % (points_str)
+
+    fig, ax = _new_figure(file_name, headless)
+    _setup_axes(ax, range_min, range_max)
+
+    # plot line and points
+    ax.plot(line_x_vals, line_y_vals, '--', color="green", label=line_of_symmetry)
+    ax.scatter(point_x_vals, point_y_vals, c="orange", marker='o', label="Given Points")
+
+    # annotate the points
+    for point_xy in zip(point_x_vals, point_y_vals):
+        ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
+
+    # custom plot functions
+    ax.set_title("line of symmetry for %r" % (points,))
+    ax.grid()
+    ax.legend()
+
+    _finish_figure(fig, output_dir, file_name, headless)
+
+
+def render_symmetry_aggregate(lines_of_symmetry_dict, slopes, y_intercepts, x_intercepts, output_dir=None):
+    '''
+    render all points and line(s) of symmetry in one figure, without pyplot or a window, so it works on machines
+    without a display. all lines are drawn as one LineCollection of segments clipped to the plot, and all points as one
+    scatter, so the figure takes about the same time for 10 or 500,000 lines
+
+    :param lines_of_symmetry_dict: dictionary outputted by symmetry(), in {((x1,y1), (y1,y2)): line_of_symmetry} format.
+    :param slopes: slopes for each line of symmetry in the values of lines_points
+    :param y_intercepts: y-intercept for each line of symmetry in the values of lines_points
+    :param x_intercepts: x-intercept for each line of symmetry in the values of lines_points
+    :param output_dir: directory to output the resulting figure as AGGREGATE_FILE_NAME, if any
+    :return: matplotlib Figure
+    '''
+
+    # every point once, in the order they are first found
+    all_points = list(dict.fromkeys(key_point for key_points in lines_of_symmetry_dict for key_point in key_points))
+    point_array = np.array([(float(point[0]), float(point[1])) for point in all_points]).reshape(-1, 2)
+
+    # get min and max of the points to set the range of the map
+    range_min = float(point_array.min()) if len(point_array) else 0.0
+    range_max = float(point_array.max()) if len(point_array) else 1.0
+
+    # initializing figure, drawn by the Agg canvas
+    fig, ax = _new_figure(AGGREGATE_FILE_NAME, headless=True)
+    view_min, view_max = _setup_axes(ax, range_min, range_max)
+
+    # plot all the lines and all the points
+    # many lines are drawn more transparent so where they cross stays readable
+    segments = clip_lines_to_box(slopes, y_intercepts, x_intercepts, view_min, view_max)
+    alpha = max(0.02, min(1.0, 100.0 / max(len(segments), 1)))
+    ax.add_collection(LineCollection(segments, linestyles='--', linewidths=0.5, colors="green", alpha=alpha,
+                                     label="Lines of Symmetry"))
+    ax.scatter(point_array[:, 0], point_array[:, 1], c="orange", marker='o', zorder=3, label="Given Points")
+
+    # custom plot functions
+    ax.set_title("aggregate line of symmetry for all points")
+    ax.grid()
+    ax.legend()
+
+    # save figure
+    if output_dir:
+        fig.savefig(os.path.join(output_dir, AGGREGATE_FILE_NAME), bbox_inches="tight")
+
+    return fig
+
+
+def clip_lines_to_box(slopes, y_intercepts, x_intercepts, box_min, box_max):
+    '''
+    get the segment of each line inside the square box [box_min, box_max] x [box_min, box_max], from the analytic
+    intersections of the line with the sides of the box
+
+    :param slopes: slope of each line, "DNE" for a vertical line
+    :param y_intercepts: y-intercept of each line, "DNE" for a vertical line
+    :param x_intercepts: x-intercept of each line, only used for vertical lines
+    :param box_min: smallest x and y of the box
+    :param box_max: largest x and y of the box
+    :return: numpy array of shape (lines inside the box, 2, 2), the two endpoints of each segment
+    '''
+
+    vertical = np.array([m == "DNE" or b == "DNE" for m, b in zip(slopes, y_intercepts)], dtype=bool)
+
+    # each line as a point plus a direction, (0, b) + t * (1, m), or (x, 0) + t * (0, 1) if vertical
+    start = np.zeros((len(vertical), 2))
+    direction = np.zeros((len(vertical), 2))
+    start[:, 0] = [x if is_vertical else 0.0 for x, is_vertical in zip(x_intercepts, vertical)]
+    start[:, 1] = [0.0 if is_vertical else b for b, is_vertical in zip(y_intercepts, vertical)]
+    direction[:, 0] = np.where(vertical, 0.0, 1.0)
+    direction[:, 1] = [1.0 if is_vertical else m for m, is_vertical in zip(slopes, vertical)]
+
+    # range of t inside the box along both axes, Liang-Barsky clipping
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_1 = (box_min - start) / direction
+        t_2 = (box_max - start) / direction
+    t_low = np.where(direction == 0, -np.inf, np.minimum(t_1, t_2)).max(axis=1)
+    t_high = np.where(direction == 0, np.inf, np.maximum(t_1, t_2)).min(axis=1)
+
+    # a line parallel to an axis is outside the box if it is outside the range of that axis
+    outside = ((direction == 0) & ((start < box_min) | (start > box_max))).any(axis=1)
+    inside = ~outside & (t_low <= t_high)
+
+    segments = np.stack([start + t_low[:, None] * direction, start + t_high[:, None] * direction], axis=1)
+
+    return segments[inside]
+
+
+def visualize_reflection(points, all_reflected_points, slopes, y_intercepts, x_intercepts, output_dir=None,
+                         headless=False, render_workers=None):
+    '''
+    visualize  reflection from given points to newly reflected points and lines of symmetry
+
+    :param points: given points, in tuple or list
+    :param all_reflected_points: a dictionary resulted from symmetry(), i.e. {"y=2x+2", [(3,3),(-2,-8)]}
+    :param slopes: slope for each line of symmetry in the keys of all_reflected_points
+    :param y_intercepts: y-intercept for each line of symmetry in the keys of all_reflected_points
+    :param x_intercepts: x_intercept for each line of symmetry in the keys of all_reflected_points
+    :param output_dir: save PNG of the plot if given output directory path
+    :param headless: draw the figures on the Agg backend without showing them
+    :param render_workers: if more than 1, draw the figures on this many worker processes, see render_figures()
+    :return: None
+    '''
+
+    # get min and max of the reflected points and points to set the range of the map
+    x_min = min([values[0] for list_of_values in all_reflected_points.values() for values in list_of_values])
+    x_max = max([values[0] for list_of_values in all_reflected_points.values() for values in list_of_values])
+
+    y_min = min([values[1] for list_of_values in all_reflected_points.values() for values in list_of_values])
+    y_max = max([values[1] for list_of_values in all_reflected_points.values() for values in list_of_values])
+
+    range_min = min(x_min, y_min)
+    range_max = max(x_max, y_max)
+
+    # make a plot for each line of symmetry
+    figure_args = [(key, points, vals, slopes[line_i], y_intercepts[line_i], x_intercepts[line_i], range_min, range_max)
+                   for line_i, (key, vals) in enumerate(all_reflected_points.items())]
+    render_figures(draw_reflection, figure_args, output_dir, headless, render_workers)
+
+
+def draw_reflection(key, points, reflected_points, m, b, x_intercept, range_min, range_max, output_dir=None,
+                    headless=False):
+    '''
+    draw the figure of the given points reflected over one line of symmetry
+
+    :param key: equation of the line of symmetry, i.e. "y=2x+2"
+    :param points: given points, in tuple or list
+    :param reflected_points: the given points reflected over the line, in the same order
+    :param m: slope of the line of symmetry, "DNE" if vertical
+    :param b: y-intercept of the line of symmetry, "DNE" if vertical
+    :param x_intercept: x-intercept of the line of symmetry
+    :param range_min: smallest x or y shown
+    :param range_max: largest x or y shown
+    :param output_dir: save PNG of the plot if given output directory path
+    :param headless: draw the figure on the Agg backend without showing it
+    :return: None
+    '''
+
+    # parse line and points in proper format
+    # line of symmetry
+    line_x_vals, line_y_vals = _line_values(m, b, x_intercept, range_min, range_max)
+
+    # given points
+    point_x_vals = [p[0] for p in points]
+    point_y_vals = [p[1] for p in points]
+
+    # reflected points
+    reflected_x_vals = [val[0] for val in reflected_points]
+    reflected_y_vals = [val[1] for val in reflected_points]
+
+    # initializing figure
+    file_name = "reflection_%s.png" % key
+    fig, ax = _new_figure(file_name, headless)
+    _setup_axes(ax, range_min, range_max)
+
+    color_range = np.arange(len(point_x_vals))
+
+    # plot
+    line_sym_plot = ax.plot(line_x_vals, line_y_vals, '--', color="green", label=key)
+    ax.scatter(point_x_vals, point_y_vals, c=color_range, marker='o')
+    reflected_plot = ax.scatter(reflected_x_vals, reflected_y_vals, c=color_range, marker='o')
+    # differentiate the reflected points
+    reflected_plot.set_facecolor('none')
+
+    # annotate the points
+    for point_xy in zip(point_x_vals, point_y_vals):
+        ax.annotate('(%s, %s)' % point_xy, xy=point_xy, textcoords='data')
+    for reflected_xy in zip(reflected_x_vals, reflected_y_vals):
+        ax.annotate('(%s, %s)' % reflected_xy, xy=reflected_xy, textcoords='data')
+    # custom plot functions
+    ax.set_title("reflected points for %r" % key)
+    ax.grid()
+
+    # custom legends
+    line1 = Line2D(range(1), range(1), color="black", marker='o', linestyle='None', label='Given Points')
+    line2 = Line2D(range(1), range(1), color="black", marker='o', markerfacecolor="none", linestyle='None',
+                   label='Reflected Points')
+    ax.legend(handles=[line_sym_plot[0], line1, line2])
+
+    _finish_figure(fig, output_dir, file_name, headless)
+
+
+def render_figures(draw_function, figure_args, output_dir=None, headless=False, render_workers=None):
+    '''
+    draw one figure for each tuple of arguments. every figure has its own Figure and Axes, so with render_workers the
+    figures are spread over a pool of worker processes and drawn at the same time
+
+    :param draw_function: module level function drawing one figure, called as
+        draw_function(*args, output_dir=output_dir, headless=headless), i.e. draw_reflection
+    :param figure_args: list of tuples of arguments, one for each figure
+    :param output_dir: directory to output the resulting figures, if any
+    :param headless: draw the figures on the Agg backend without showing them
+    :param render_workers: if more than 1, draw the figures on this many worker processes. they are always headless,
+        a worker process cannot show a window, so output_dir is needed
+    :return: None
+    '''
+
+    if not render_workers or render_workers <= 1:
+        for args in figure_args:
+            draw_function(*args, output_dir=output_dir, headless=headless)
+        return
+
+    if not output_dir:
+        raise ValueError("render_figures: render_workers %r needs an output_dir to save the figures to." %
+                         render_workers)
+
+    # a few figures per task, so sending the arguments costs little next to drawing
+    chunk_size = max(1, len(figure_args) // (render_workers * 4))
+    with ProcessPoolExecutor(max_workers=render_workers) as executor:
+        for _ in executor.map(_draw_headless, repeat(draw_function), figure_args, repeat(output_dir),
+                              chunksize=chunk_size):
+            pass
+
+
+def _draw_headless(draw_function, args, output_dir):
+    # runs in a worker process of render_figures()
+    draw_function(*args, output_dir=output_dir, headless=True)
+
+
+def _new_figure(name, headless):
+    # a headless figure has its own Agg canvas and is never known to pyplot, so it can be drawn on any thread or
+    # process. otherwise pyplot keeps the figure so it can be shown in a window
+    if headless:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+    else:
+        fig = plt.figure(name)
+
+    return fig, fig.add_subplot()
+
+
+def _setup_axes(ax, range_min, range_max):
+    # limits, ticks, labels and x- and y- axis shared by all figures, returns the limits shown
+
+    # set limits for display
+    buffer = int((range_max - range_min) / 20)
+    if buffer == 0:
+        buffer = 1
+    view_min = range_min - buffer
+    view_max = range_max + buffer
+    ax.set_xlim([view_min, view_max])
+    ax.set_ylim([view_min, view_max])
+
+    # set increments so x and y are on the same scale
+    if range_max > range_min:
+        ax.set_xticks(np.arange(view_min, view_max, (range_max - range_min) / 10))
+        ax.set_yticks(np.arange(view_min, view_max, (range_max - range_min) / 10))
+
+    # labeling the axes
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+
+    # draw x- and y- axis
+    ax.axhline(y=0, color='k')
+    ax.axvline(x=0, color='k')
+
+    return view_min, view_max
+
+
+def _line_values(m, b, x_intercept, range_min, range_max):
+    # x and y values along a line, extended pass the range
+    if (m != "DNE" and b != "DNE"):
+        line_x_vals = np.linspace(range_min - 100, range_max + 100, 100)
+        line_y_vals = (m * line_x_vals) + b
+    else:
+        # vertical line
+        line_x_vals = [x_intercept] * 100
+        line_y_vals = np.linspace(range_min - 100, range_max + 100, 100)
+
+    return line_x_vals, line_y_vals
+
+
+def _finish_figure(fig, output_dir, file_name, headless, **savefig_kwargs):
+    # save figure, and show it unless headless
+    if output_dir:
+        fig.savefig(os.path.join(output_dir, file_name), **savefig_kwargs)
+
+    if not headless:
+        plt.show()
+        plt.close(fig)
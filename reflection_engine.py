@@ -0,0 +1,324 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from Line import Line
+from line_cache import parse_line
+
+# equations of the axes, accepted wherever a line of symmetry is given as a string
+AXIS_EQUATIONS = {"x-axis": "y=0", "y-axis": "x=0"}
+
+# number of composed reflection matrices kept by compose_reflections()
+COMPOSITION_CACHE_SIZE = 256
+
+
+def line_coefficients(line):
+    '''
+    get the coefficients (a, b, c) of a line in general form a*x + b*y + c = 0
+
+    i.e. y=2x+8 -> (-2.0, 1.0, -8.0), x=3 -> (1.0, 0.0, -3.0)
+
+    :param line: Line object
+    :return: tuple (a, b, c) of floats
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if isinstance(line, Line) is False:
+        raise TypeError("line_coefficients: input line %r must be a Line object." % line)
+
+    return line.get_coefficients()
+
+
+def to_line(line):
+    '''
+    :param line: Line object, "x-axis", "y-axis" or an equation in slope-intercept form, i.e. "y=2x+8"
+    :return: Line object
+    '''
+
+    if isinstance(line, Line):
+        return line
+
+    if isinstance(line, str) is False:
+        raise TypeError("to_line: line %r must be a Line object or a string, i.e. \"x-axis\" or \"y=2x+8\"." %
+                        (line,))
+
+    return parse_line(AXIS_EQUATIONS.get(line.lower(), line))
+
+
+def to_point_array(points):
+    '''
+    convert points into a (N, 2) float array
+
+    :param points: tuple or list of points (x, y), or an array of shape (N, 2), i.e. [(23,-45.67), ("2", "5")]
+    :return: numpy array of shape (N, 2)
+    '''
+
+    try:
+        point_array = np.asarray(points, dtype=float)
+    except (ValueError, TypeError) as e:
+        # reraise it with custom message
+        error_msg_output = "to_point_array: points %r must be valid 2D points, i.e. [(2,5), (-352.54,-2343.5)]" % (
+            points,)
+        print(error_msg_output)
+        e.args += (error_msg_output,)
+        raise
+
+    # no points given
+    if point_array.size == 0:
+        return point_array.reshape(0, 2)
+
+    if point_array.ndim != 2 or point_array.shape[1] != 2:
+        raise ValueError(
+            "to_point_array: points %r must be valid 2D points, i.e. [(2,5), (-352.54,-2343.5)]" % (points,))
+
+    return point_array
+
+
+def open_point_array(source):
+    '''
+    get an (N, 2) float64 array over a source of points without reading it into memory, so it can be processed a
+    chunk at a time
+
+    sources:
+    .npy file path: memory-mapped with np.load(mmap_mode="r")
+    any other file path: raw float64 binary, x and y of each point one after the other, memory-mapped with np.memmap
+    numpy array of shape (N, 2), i.e. a np.memmap: used as it is
+    any other object with the buffer protocol, i.e. bytes, bytearray, mmap.mmap: viewed as float64 with no copy
+
+    :param source: one of the sources above
+    :return: numpy array of shape (N, 2)
+    '''
+
+    if isinstance(source, np.ndarray):
+        point_array = source
+    elif isinstance(source, (str, os.PathLike)):
+        try:
+            if os.fspath(source).lower().endswith(".npy"):
+                point_array = np.load(source, mmap_mode="r")
+            elif os.path.getsize(source) == 0:
+                # np.memmap cannot map an empty file
+                point_array = np.empty((0, 2))
+            else:
+                point_array = np.memmap(source, dtype=np.float64, mode="r")
+        except (OSError, ValueError) as e:
+            # reraise it with custom message
+            error_msg_output = "open_point_array: points cannot be read from %s!" % (source,)
+            print(error_msg_output)
+            e.args += (error_msg_output,)
+            raise
+    else:
+        try:
+            point_array = np.frombuffer(source, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            # reraise it with custom message
+            error_msg_output = "open_point_array: source %r must be a file path, an array or a buffer of float64." % (
+                type(source),)
+            print(error_msg_output)
+            e.args += (error_msg_output,)
+            raise
+
+    # raw binary holds x, y, x, y, ...
+    if point_array.ndim == 1 and point_array.size % 2 == 0:
+        point_array = point_array.reshape(-1, 2)
+
+    if point_array.ndim != 2 or point_array.shape[1] != 2:
+        raise ValueError("open_point_array: points of shape %r must be of shape (N, 2)." % (point_array.shape,))
+
+    return point_array
+
+
+def pack_point_sets(point_arrays):
+    '''
+    pack sets of points into ragged arrays, one array holding the points of every set one after the other, and the
+    offsets where each set starts, so set k is points[offsets[k]:offsets[k + 1]]
+
+    :param point_arrays: list of arrays of shape (N_k, 2), i.e. from to_point_array()
+    :return: tuple (points, offsets), numpy arrays of shape (sum of N_k, 2) and (number of sets + 1,)
+    '''
+
+    offsets = np.zeros(len(point_arrays) + 1, dtype=np.int64)
+    np.cumsum([len(point_array) for point_array in point_arrays], out=offsets[1:])
+
+    if not point_arrays:
+        return np.empty((0, 2)), offsets
+
+    return np.concatenate(point_arrays), offsets
+
+
+def reflect_points(points, lines):
+    '''
+    reflect every point over every line in one batched operation
+
+    closed form reflection of (x, y) over a*x + b*y + c = 0:
+    d = (a*x + b*y + c) / (a^2 + b^2)
+    (x', y') = (x - 2*a*d, y - 2*b*d)
+
+    :param points: points to reflect, anything accepted by to_point_array(), i.e. [(23,-45.67), (25,-45.67)]
+    :param lines: list of Line objects, or an array of shape (L, 3) holding (a, b, c) for each line
+    :return: numpy array of shape (L, N, 2), the reflected points for each line
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    point_array = to_point_array(points)
+
+    if isinstance(lines, np.ndarray):
+        coefficients = np.asarray(lines, dtype=float).reshape(-1, 3)
+    else:
+        coefficients = np.array([line_coefficients(line) for line in lines], dtype=float).reshape(-1, 3)
+
+    #################
+    ### calculate ###
+    #################
+
+    a = coefficients[:, 0:1]
+    b = coefficients[:, 1:2]
+    c = coefficients[:, 2:3]
+
+    # signed distance of each point to each line, scaled by the length of the normal, shape (L, N). each element is
+    # worked out on its own, so a line gives the same reflection whether it comes alone or with other lines
+    d = (a * point_array[:, 0] + b * point_array[:, 1] + c) / (a * a + b * b)
+
+    # move each point twice its distance along the normal (a, b) of the line
+    reflected = np.empty((len(coefficients), len(point_array), 2))
+    reflected[:, :, 0] = point_array[:, 0] - 2 * d * a
+    reflected[:, :, 1] = point_array[:, 1] - 2 * d * b
+
+    return reflected
+
+
+def match_reflections(points, lines, tolerance):
+    '''
+    check for each line if every point reflected over it is within tolerance of one of the points, the same test as
+    GridIndex.contains_all() on reflect_points(), for all lines at once. the points are reflected a block at a time,
+    1, 2, 4, ... points, over the lines still matching, so most lines that are not lines of symmetry are dropped after
+    the first few points. every reflected point is compared with every point, so it is meant for small sets of points
+
+    :param points: points to reflect, anything accepted by to_point_array(), i.e. [(23,-45.67), (25,-45.67)]
+    :param lines: list of Line objects, or an array of shape (L, 3) holding (a, b, c) for each line
+    :param tolerance: largest distance between a reflected point and a point for them to match
+    :return: numpy boolean array of shape (L,), True for the lines of symmetry
+    '''
+
+    point_array = to_point_array(points)
+
+    if isinstance(lines, np.ndarray):
+        coefficients = np.asarray(lines, dtype=float).reshape(-1, 3)
+    else:
+        coefficients = np.array([line_coefficients(line) for line in lines], dtype=float).reshape(-1, 3)
+
+    #################
+    ### calculate ###
+    #################
+
+    # indices of the lines every point so far matched for
+    matching = np.arange(len(coefficients))
+    start = 0
+    block_size = 1
+    while start < len(point_array) and len(matching):
+        reflected = reflect_points(point_array[start:start + block_size], coefficients[matching])
+
+        # distance from each reflected point to each point, shape (lines, points in block, N)
+        dx = reflected[:, :, None, 0] - point_array[:, 0]
+        dy = reflected[:, :, None, 1] - point_array[:, 1]
+        distances = np.sqrt(dx ** 2 + dy ** 2)
+
+        matching = matching[(distances <= tolerance).any(axis=2).all(axis=1)]
+        start += block_size
+        block_size *= 2
+
+    matched = np.zeros(len(coefficients), dtype=bool)
+    matched[matching] = True
+
+    return matched
+
+
+def reflection_matrix(line):
+    '''
+    get the 3x3 affine matrix reflecting points over a line, in homogeneous coordinates (x, y, 1)
+
+    for a*x + b*y + c = 0 and n = a^2 + b^2:
+    | 1 - 2a^2/n   -2ab/n      -2ac/n |
+    | -2ab/n       1 - 2b^2/n  -2bc/n |
+    | 0            0           1      |
+
+    :param line: Line object, "x-axis", "y-axis" or an equation, see to_line()
+    :return: numpy array of shape (3, 3)
+    '''
+
+    return _reflection_matrix(line_coefficients(to_line(line))).copy()
+
+
+def compose_reflections(lines):
+    '''
+    get one 3x3 affine matrix doing a chain of reflections, over the first line, then over the second line, and so on.
+    the matrices of the last COMPOSITION_CACHE_SIZE chains are cached by the coefficients of their lines, so an
+    already seen chain costs no matrix products. an empty chain is the identity
+
+    :param lines: list of Line objects, "x-axis", "y-axis" or equations, see to_line()
+    :return: numpy array of shape (3, 3), read only since it can be shared with other calls
+    '''
+
+    if isinstance(lines, (str, Line)):
+        lines = [lines]
+
+    return _compose_coefficients(tuple(line_coefficients(to_line(line)) for line in lines))
+
+
+def apply_affine(points, matrix):
+    '''
+    transform every point with an affine matrix in one pass, i.e. one from compose_reflections()
+
+    :param points: points to transform, anything accepted by to_point_array(), i.e. [(23,-45.67), (25,-45.67)]
+    :param matrix: numpy array of shape (3, 3), or (L, 3, 3) for L matrices
+    :return: numpy array of shape (N, 2), or (L, N, 2) for L matrices
+    '''
+
+    point_array = to_point_array(points)
+    matrix = np.asarray(matrix, dtype=float)
+
+    if matrix.shape[-2:] != (3, 3):
+        raise ValueError("apply_affine: matrix of shape %r must be of shape (3, 3) or (L, 3, 3)." % (matrix.shape,))
+
+    # (x', y') = A (x, y) + t, with A the top left 2x2 block and t the top right column
+    return point_array @ np.swapaxes(matrix[..., :2, :2], -1, -2) + matrix[..., None, :2, 2]
+
+
+def reflect_points_chain(points, lines):
+    '''
+    reflect every point over a chain of lines, over the first line, then over the second line, and so on, with one
+    batched transform instead of one reflection pass per line
+
+    :param points: points to reflect, anything accepted by to_point_array(), i.e. [(23,-45.67), (25,-45.67)]
+    :param lines: list of Line objects, "x-axis", "y-axis" or equations, see to_line()
+    :return: numpy array of shape (N, 2), the points after the last reflection
+    '''
+
+    return apply_affine(points, compose_reflections(lines))
+
+
+def _reflection_matrix(coefficients):
+    # reflection matrix of a line given its coefficients (a, b, c)
+    a, b, c = coefficients
+    scale = -2.0 / (a * a + b * b)
+
+    return np.array([[1.0 + scale * a * a, scale * a * b, scale * a * c],
+                     [scale * a * b, 1.0 + scale * b * b, scale * b * c],
+                     [0.0, 0.0, 1.0]])
+
+
+@lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _compose_coefficients(chain):
+    # chain is a tuple of (a, b, c) tuples, hashable so the composed matrix can be cached
+    matrix = np.eye(3)
+    for coefficients in chain:
+        # the later reflection is applied to the result of the earlier ones
+        matrix = _reflection_matrix(coefficients) @ matrix
+    matrix.flags.writeable = False
+
+    return matrix
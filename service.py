@@ -0,0 +1,497 @@
+# local HTTP/JSON service, concurrent requests are collected into batches and computed together, i.e.
+#   python service.py --port 8765 --workers 4
+#   curl -X POST localhost:8765/reflect -d '{"points": [[1, 2], [3, 4]], "lines": ["y=2x+3", "x-axis"]}'
+#   curl -X POST localhost:8765/valid -d '{"points": [[1, 0], [-1, 0], [0, 2]], "engine": "voting"}'
+#   curl localhost:8765/metrics
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+from get_reflection_point import get_reflection_point
+from get_symmetry_line import find_valid_symmetry_lines_batch, ENGINE_OPTIONS
+from line_cache import cache_stats
+
+# seconds a batch waits for more requests after its first one
+DEFAULT_WINDOW = 0.005
+
+# largest number of requests computed in one batch
+DEFAULT_MAX_BATCH = 256
+
+# number of latencies kept for each endpoint, the percentiles are over the most recent ones
+LATENCY_SAMPLES = 10000
+
+# largest request body accepted, in bytes
+MAX_BODY_SIZE = 64 * 2 ** 20
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(ValueError):
+    # error in a request, answered with its HTTP status
+    def __init__(self, message, status=400):
+        super(RequestError, self).__init__(message)
+        self.status = status
+
+
+##########################################################
+### batch computations, run in the executor ##############
+##########################################################
+
+def parse_reflect_request(body):
+    '''
+    :param body: JSON object {"points": [[x, y], ...], "lines": ["y=2x+3", "x-axis", ...], "rounding": 3}, lines
+        default to ["x-axis"] and rounding to None
+    :return: dictionary {"points", "lines", "rounding"}
+    '''
+
+    if isinstance(body, dict) is False or isinstance(body.get("points"), list) is False:
+        raise RequestError("reflect: body must be a JSON object with a list of points, i.e. {\"points\": [[1, 2]]}.")
+
+    lines = body.get("lines", ["x-axis"])
+    if isinstance(lines, str):
+        lines = [lines]
+    if isinstance(lines, list) is False or not all(isinstance(line, str) for line in lines):
+        raise RequestError("reflect: lines %r must be a list of equations, i.e. [\"y=2x+3\", \"x-axis\"]." % (lines,))
+
+    rounding = body.get("rounding")
+    if rounding is not None and (isinstance(rounding, int) is False or isinstance(rounding, bool)):
+        raise RequestError("reflect: rounding %r must be an integer." % (rounding,))
+
+    return {"points": body["points"], "lines": lines, "rounding": rounding}
+
+
+def parse_valid_request(body):
+    '''
+    :param body: JSON object {"points": [[x, y], ...], "rounding": 3, "tolerance": 0.01, "relative_tolerance": null,
+        "engine": "pairwise"}, the options default to the ones of find_valid_symmetry_lines()
+    :return: dictionary {"points", "rounding", "tolerance", "relative_tolerance", "engine"}
+    '''
+
+    if isinstance(body, dict) is False or isinstance(body.get("points"), list) is False:
+        raise RequestError("valid: body must be a JSON object with a list of points, i.e. {\"points\": [[1, 2]]}.")
+
+    request = {"points": body["points"], "rounding": body.get("rounding", 3), "tolerance": body.get("tolerance", 0.01),
+               "relative_tolerance": body.get("relative_tolerance"), "engine": body.get("engine", "pairwise")}
+
+    if request["engine"] not in ENGINE_OPTIONS:
+        raise RequestError("valid: engine %r must be in %r." % (request["engine"], sorted(ENGINE_OPTIONS)))
+
+    for name in ("tolerance", "relative_tolerance"):
+        if request[name] is not None and (isinstance(request[name], (int, float)) is False or
+                                          isinstance(request[name], bool)):
+            raise RequestError("valid: %s %r must be a number." % (name, request[name]))
+
+    return request
+
+
+def reflect_batch(requests):
+    '''
+    reflect the points of many requests. requests over the same lines with the same rounding are put together and
+    reflected with one get_reflection_point() call, then split back into one result for each request
+
+    :param requests: list of requests, see parse_reflect_request()
+    :return: list of dictionaries {line of symmetry: reflected points}, one for each request, in order
+    '''
+
+    groups = {}
+    for request_i, request in enumerate(requests):
+        groups.setdefault((tuple(request["lines"]), request["rounding"]), []).append(request_i)
+
+    results = [None] * len(requests)
+    for (lines, rounding), request_indices in groups.items():
+        points = [point for request_i in request_indices for point in requests[request_i]["points"]]
+        reflected = get_reflection_point(points, list(lines), rounding=rounding, visualize=False)
+
+        # each request gets back the slice of its own points
+        start = 0
+        for request_i in request_indices:
+            stop = start + len(requests[request_i]["points"])
+            results[request_i] = {line_sym: reflected_points[start:stop]
+                                  for line_sym, reflected_points in reflected.items()}
+            start = stop
+
+    return results
+
+
+def valid_batch(requests, workers=None):
+    '''
+    find the valid lines of symmetry of many requests. requests with the same options are put together into one
+    find_valid_symmetry_lines_batch() call
+
+    :param requests: list of requests, see parse_valid_request()
+    :param workers: if more than 1, find_valid_symmetry_lines_batch() validates on this many worker processes
+    :return: list of lists of equations, one for each request, in order
+    '''
+
+    groups = {}
+    for request_i, request in enumerate(requests):
+        options = (request["rounding"], request["tolerance"], request["relative_tolerance"], request["engine"])
+        groups.setdefault(options, []).append(request_i)
+
+    results = [None] * len(requests)
+    for (rounding, tolerance, relative_tolerance, engine), request_indices in groups.items():
+        lines = find_valid_symmetry_lines_batch([requests[request_i]["points"] for request_i in request_indices],
+                                                rounding=rounding, tolerance=tolerance,
+                                                relative_tolerance=relative_tolerance, engine=engine, workers=workers)
+        for request_i, valid_lines in zip(request_indices, lines):
+            results[request_i] = valid_lines
+
+    return results
+
+
+##########################################################
+### batching and metrics #################################
+##########################################################
+
+class MicroBatcher(object):
+    """
+    A class used to collect requests arriving at the same time into batches. A batch starts with the first request
+    waiting, takes every request arriving within the window, up to max_batch, and runs them with one call of
+    run_batch in the executor, so the event loop keeps accepting requests meanwhile. Requests arriving while a batch
+    runs wait for the next batch.
+
+    ...
+
+    Attributes
+    ----------
+    batches : int
+        number of batches run
+    batched_requests : int
+        number of requests run in batches
+    max_queue_depth : int
+        most requests waiting at once
+
+    Methods
+    -------
+    start()
+        start taking batches, from a running event loop
+
+    submit(request)
+        coroutine, the result of the request once its batch is run
+
+    queue_depth()
+        number of requests waiting for a batch
+    """
+
+    def __init__(self, run_batch, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH, executor=None):
+        '''
+        :param run_batch: function of a list of requests returning a list of results, one for each request in order
+        :param window: seconds a batch waits for more requests after its first one
+        :param max_batch: largest number of requests in a batch
+        :param executor: concurrent.futures executor running the batches, None for the default executor of the loop
+        '''
+        if isinstance(max_batch, int) is False or max_batch < 1:
+            raise ValueError("MicroBatcher: max_batch %r must be a positive integer." % (max_batch,))
+
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+
+        self.batches = 0
+        self.batched_requests = 0
+        self.max_queue_depth = 0
+
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, request):
+        '''
+        :param request: one request, passed to run_batch with the other requests of its batch
+        :return: the result of the request, or raises the error of the request
+        '''
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((request, future))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.window > 0 and self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            requests = [request for request, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.run_batch, requests)
+            except Exception:
+                # one bad request fails its whole batch, so run each request on its own to only fail the bad ones
+                results = []
+                for request in requests:
+                    try:
+                        results.append((await loop.run_in_executor(self.executor, self.run_batch, [request]))[0])
+                    except Exception as e:
+                        results.append(e)
+
+            self.batches += 1
+            self.batched_requests += len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class EndpointMetrics(object):
+    """
+    A class used to collect the latency of the requests of an endpoint, with counts of requests and errors
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, seconds, error=False):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.latencies.append(seconds)
+
+    def as_dict(self):
+        '''
+        :return: dictionary {"requests", "errors", "p50_ms", "p99_ms"}, the percentiles are None before any request
+        '''
+        p50 = p99 = None
+        if self.latencies:
+            p50, p99 = (1000 * np.percentile(np.fromiter(self.latencies, dtype=float), [50, 99])).tolist()
+        return {"requests": self.requests, "errors": self.errors, "p50_ms": p50, "p99_ms": p99}
+
+
+##########################################################
+### HTTP server ##########################################
+##########################################################
+
+class SymmetryService(object):
+    """
+    A class used to serve get_reflection_point() and find_valid_symmetry_lines() over HTTP/JSON on localhost, with
+    micro-batching of concurrent requests, see MicroBatcher.
+
+    ...
+
+    Endpoints
+    ---------
+    POST /reflect
+        {"points": [[x, y], ...], "lines": ["y=2x+3", ...], "rounding": 3} -> {"reflected": {line: [[x, y], ...]}}
+
+    POST /valid
+        {"points": [[x, y], ...], "rounding": 3, "tolerance": 0.01, "relative_tolerance": null, "engine": "pairwise"}
+        -> {"lines": ["x=0.0", ...]}
+
+    GET /metrics
+        p50 and p99 latency, requests and errors of each endpoint, with the queue depth and batches of its batcher,
+        and the hits, misses and evictions of the line caches, see line_cache.py
+
+    Methods
+    -------
+    serve_forever()
+        coroutine, serve until cancelled
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH, workers=None):
+        '''
+        :param host: address to listen on, localhost by default
+        :param port: port to listen on, 0 for any free port, see the port attribute once serving
+        :param window: seconds a batch waits for more requests after its first one
+        :param max_batch: largest number of requests in a batch
+        :param workers: if more than 1, /valid batches are validated on this many worker processes
+        '''
+        self.host = host
+        self.port = port
+
+        # one thread for each batcher, so a slow batch of one endpoint does not hold up the other
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._batchers = {
+            "/reflect": (parse_reflect_request, "reflected",
+                         MicroBatcher(reflect_batch, window, max_batch, self._executor)),
+            "/valid": (parse_valid_request, "lines",
+                       MicroBatcher(partial(valid_batch, workers=workers), window, max_batch, self._executor)),
+        }
+        self.metrics = {path: EndpointMetrics() for path in self._batchers}
+        self._started = None
+        self._server = None
+
+    def metrics_dict(self):
+        '''
+        :return: dictionary {"uptime_seconds", "endpoints": {path: {"requests", "errors", "p50_ms", "p99_ms",
+            "queue_depth", "max_queue_depth", "batches", "mean_batch_size"}}, "caches": cache_stats()}
+        '''
+        endpoints = {}
+        for path, (_, _, batcher) in self._batchers.items():
+            endpoint = self.metrics[path].as_dict()
+            endpoint.update({"queue_depth": batcher.queue_depth(), "max_queue_depth": batcher.max_queue_depth,
+                             "batches": batcher.batches,
+                             "mean_batch_size": batcher.batched_requests / batcher.batches if batcher.batches else None})
+            endpoints[path] = endpoint
+
+        return {"uptime_seconds": time.monotonic() - self._started if self._started else 0.0, "endpoints": endpoints,
+                "caches": cache_stats()}
+
+    async def start(self):
+        for _, _, batcher in self._batchers.values():
+            batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started = time.monotonic()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for _, _, batcher in self._batchers.values():
+            await batcher.stop()
+        self._executor.shutdown(wait=False)
+
+    async def serve_forever(self):
+        await self.start()
+        print("serving on http://%s:%d" % (self.host, self.port))
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except RequestError as e:
+                    await _write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, body, keep_alive = request
+                status, response = await self._respond(method, path, body)
+                await _write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, path, body):
+        # status and JSON response of one request
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"error": "%s must be requested with GET." % path}
+            return 200, self.metrics_dict()
+
+        if path not in self._batchers:
+            return 404, {"error": "%s is not one of /reflect, /valid or /metrics." % path}
+        if method != "POST":
+            return 405, {"error": "%s must be requested with POST." % path}
+
+        parse_request, result_name, batcher = self._batchers[path]
+        start = time.perf_counter()
+        try:
+            try:
+                request = parse_request(json.loads(body or b"null"))
+            except json.JSONDecodeError as e:
+                raise RequestError("body is not valid JSON: %s" % e)
+            status, response = 200, {result_name: await batcher.submit(request)}
+        except (ValueError, TypeError) as e:
+            status, response = getattr(e, "status", 400), {"error": "%s: %s" % (type(e).__name__, e)}
+        except Exception as e:
+            status, response = 500, {"error": "%s: %s" % (type(e).__name__, e)}
+        self.metrics[path].record(time.perf_counter() - start, error=status != 200)
+
+        return status, response
+
+
+async def _read_request(reader):
+    # (method, path, body, keep alive) of the next HTTP request of a connection, None once the connection is closed
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError("request line %r is not valid HTTP." % request_line[:100])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise RequestError("Content-Length %r must be an integer." % headers["content-length"])
+    if length > MAX_BODY_SIZE:
+        raise RequestError("body of %d bytes is over the limit of %d bytes." % (length, MAX_BODY_SIZE), 413)
+    body = await reader.readexactly(length) if length > 0 else b""
+
+    # HTTP/1.1 keeps the connection open unless asked not to, HTTP/1.0 only if asked to
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+
+    return method.upper(), target.split("?", 1)[0], body, keep_alive
+
+
+async def _write_response(writer, status, response, keep_alive):
+    payload = json.dumps(response).encode()
+    writer.write(("HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\nConnection: %s\r\n\r\n" %
+                  (status, HTTP_REASONS.get(status, ""), len(payload), "keep-alive" if keep_alive else "close")
+                  ).encode("latin-1") + payload)
+    await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="serve reflections and lines of symmetry over HTTP/JSON, batching "
+                                                 "concurrent requests")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW * 1000,
+                        help="milliseconds a batch waits for more requests after its first one")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="largest number of requests in a batch")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="validate /valid batches on this many worker processes")
+    args = parser.parse_args(argv)
+
+    service = SymmetryService(args.host, args.port, args.window_ms / 1000.0, args.max_batch, args.workers)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import numpy as np
+from math import floor, sqrt
+from reflection_engine import to_point_array
+
+
+def resolve_tolerance(points, tolerance=0.01, relative_tolerance=None):
+    '''
+    get the absolute tolerance for a set of points
+
+    :param points: array of shape (N, 2)
+    :param tolerance: absolute tolerance, the largest distance between two points for them to match
+    :param relative_tolerance: if given, the tolerance is relative_tolerance times the largest side of the
+        bounding box of the points, and overrides the absolute tolerance
+    :return: float, the tolerance, greater than 0
+    '''
+
+    ########################
+    ### parameters check ###
+    ########################
+
+    if relative_tolerance is not None:
+        try:
+            relative_tolerance = float(relative_tolerance)
+        except ValueError as e:
+            # reraise it with custom message
+            error_msg_output = "resolve_tolerance: relative_tolerance %r is invalid!" % relative_tolerance
+            print(error_msg_output)
+            e.args += (error_msg_output,)
+            raise
+
+        # scale by the size of the point set, a single point (or a set of equal points) has a size of 1
+        extent = float(np.ptp(points, axis=0).max()) if len(points) else 0.0
+        tolerance = relative_tolerance * (extent if extent > 0 else 1.0)
+
+    try:
+        tolerance = float(tolerance)
+    except (ValueError, TypeError) as e:
+        # reraise it with custom message
+        error_msg_output = "resolve_tolerance: tolerance %r is invalid!" % (tolerance,)
+        print(error_msg_output)
+        e.args += (error_msg_output,)
+        raise
+
+    if tolerance <= 0:
+        raise ValueError("resolve_tolerance: tolerance %r must be greater than 0." % tolerance)
+
+    return tolerance
+
+
+class GridIndex(object):
+    """
+    A class used to find input points near a query point, by hashing the points into a grid of square cells
+    as wide as the tolerance. A point within the tolerance of a query point is always in the query point's cell
+    or one of its 8 neighbouring cells, so each lookup is O(1) on average.
+
+    ...
+
+    Points can be inserted and removed after the index is built. An index returned by insert() or query() stays the
+    same until its point is removed, so after a removal it is no longer the row of the point in points. The index of
+    a removed point is given to the next inserted point, so the index does not grow with every insert and remove.
+
+    ...
+
+    Attributes
+    ----------
+    points : numpy array
+        the indexed points, shape (N, 2), in the order of their indices
+    tolerance : float
+        the largest distance between a query point and an indexed point for them to match
+    lookups : int
+        number of queries made, for stats
+
+    Methods
+    -------
+    query(point)
+        index and distance of the nearest indexed point within tolerance of the given point, None if there is none
+
+    contains(point)
+        whether an indexed point is within tolerance of the given point
+
+    contains_all(points)
+        whether every given point has an indexed point within tolerance
+
+    insert(point)
+        index one more point
+
+    remove(index)
+        stop indexing a point
+    """
+
+    def __init__(self, points, tolerance=0.01, relative_tolerance=None):
+        '''
+        :param points: tuple or list of points (x, y), or an array of shape (N, 2), i.e. [(23,-45.67), ("2", "5")]
+        :param tolerance: absolute tolerance, the largest distance between two points for them to match
+        :param relative_tolerance: if given, the tolerance is relative_tolerance times the largest side of the
+            bounding box of the points, and overrides the absolute tolerance
+        '''
+
+        self._points = to_point_array(points)
+        self.tolerance = resolve_tolerance(self._points, tolerance, relative_tolerance)
+        self.lookups = 0
+
+        ######################
+        ### build the grid ###
+        ######################
+
+        # plain python coordinates are much faster to look up one at a time than numpy rows, a removed point is None
+        # and its index is in _free until insert() reuses it
+        self._coordinates = self._points.tolist()
+        self._free = []
+        self._count = len(self._coordinates)
+        self._cells = {}
+        for i, (x, y) in enumerate(self._coordinates):
+            self._cells.setdefault(self._cell(x, y), []).append(i)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def points(self):
+        # the array is rebuilt after points are inserted or removed, the first time it is used
+        if self._points is None:
+            self._points = to_point_array([point for point in self._coordinates if point is not None])
+        return self._points
+
+    def insert(self, point):
+        '''
+        index one more point
+
+        :param point: tuple or list (x, y)
+        :return: int, index of the point, as returned by query()
+        '''
+        x = float(point[0])
+        y = float(point[1])
+
+        if self._free:
+            index = self._free.pop()
+            self._coordinates[index] = [x, y]
+        else:
+            index = len(self._coordinates)
+            self._coordinates.append([x, y])
+        self._cells.setdefault(self._cell(x, y), []).append(index)
+        self._count += 1
+        self._points = None
+
+        return index
+
+    def remove(self, index):
+        '''
+        stop indexing a point
+
+        :param index: index of the point, as returned by insert() or query()
+        :return: tuple (x, y) of the removed point
+        '''
+        if not 0 <= index < len(self._coordinates) or self._coordinates[index] is None:
+            raise ValueError("GridIndex: index %r is not an indexed point." % (index,))
+
+        x, y = self._coordinates[index]
+        cell = self._cell(x, y)
+        self._cells[cell].remove(index)
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+        self._coordinates[index] = None
+        self._free.append(index)
+        self._count -= 1
+        self._points = None
+
+        return (x, y)
+
+    def _cell(self, x, y):
+        # grid cell a coordinate falls into
+        return (floor(x / self.tolerance), floor(y / self.tolerance))
+
+    def query(self, point):
+        '''
+        find the nearest indexed point within tolerance of the given point
+
+        :param point: tuple or list (x, y)
+        :return: tuple (index, distance) of the nearest indexed point, None if no point is within tolerance
+        '''
+
+        self.lookups += 1
+        x = float(point[0])
+        y = float(point[1])
+        cell_x, cell_y = self._cell(x, y)
+
+        nearest = None
+        nearest_distance = self.tolerance
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for i in self._cells.get((cell_x + dx, cell_y + dy), ()):
+                    indexed_x, indexed_y = self._coordinates[i]
+                    distance = sqrt((indexed_x - x) ** 2 + (indexed_y - y) ** 2)
+                    if distance <= nearest_distance:
+                        nearest = i
+                        nearest_distance = distance
+
+        if nearest is None:
+            return None
+
+        return (nearest, nearest_distance)
+
+    def contains(self, point):
+        '''
+        check if an indexed point is within tolerance of the given point
+
+        :param point: tuple or list (x, y)
+        :return: True if a point is found, False otherwise
+        '''
+        return self.query(point) is not None
+
+    def contains_all(self, points):
+        '''
+        check if every given point has an indexed point within tolerance, stops at the first point without one
+
+        :param points: iterable of points (x, y), or an array of shape (N, 2)
+        :return: True if all points are found, False otherwise
+        '''
+
+        if isinstance(points, np.ndarray):
+            points = points.tolist()
+
+        for point in points:
+            if self.query(point) is None:
+                return False
+
+        return True
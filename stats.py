@@ -0,0 +1,117 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+class Stats(object):
+    """
+    A class used to collect the wall time of each stage of a call, and counts of the work it did, i.e. pairs of points
+    generated, candidate lines validated, reflection lookups and early rejections. Pass one to the stats option of
+    the public functions, then read it back with as_dict() or to_json(). The same collector can be passed to several
+    calls, timings and counts add up.
+
+    ...
+
+    Attributes
+    ----------
+    timings : dict
+        seconds spent in each stage, by stage name
+    counts : dict
+        count of each kind of work, by name
+
+    Methods
+    -------
+    stage(name)
+        context manager adding the wall time of the block to the stage
+
+    count(name, n=1)
+        add n to a count
+
+    as_dict()
+        the timings and counts as a dictionary
+
+    to_json(**kwargs)
+        the timings and counts as a JSON string
+
+    reset()
+        forget all timings and counts
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counts = {}
+
+    @contextmanager
+    def stage(self, name):
+        '''
+        time a block of code, i.e. with stats.stage("validate"): ...
+
+        :param name: name of the stage, time spent in the same stage more than once adds up
+        '''
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        '''
+        :param name: name of the count, i.e. "pairs"
+        :param n: number to add to the count
+        :return: None
+        '''
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def as_dict(self):
+        '''
+        :return: dictionary {"timings": {stage: seconds}, "counts": {name: count}}
+        '''
+        return {"timings": dict(self.timings), "counts": dict(self.counts)}
+
+    def to_json(self, **kwargs):
+        '''
+        :param kwargs: passed to json.dumps(), i.e. indent=2
+        :return: string, as_dict() in JSON
+        '''
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def reset(self):
+        '''
+        forget all timings and counts
+        :return: None
+        '''
+        self.timings.clear()
+        self.counts.clear()
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.as_dict())
+
+
+class _NullStage(object):
+    # context manager doing nothing, shared by every stage of NullStats
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullStats(Stats):
+    """
+    A Stats collector that records nothing, used when no collector is given so the public functions run the same
+    code either way. Stages and counts cost about one method call each.
+    """
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def count(self, name, n=1):
+        return None
+
+
+# collector used by the public functions when stats is not given
+NULL_STATS = NullStats()
@@ -0,0 +1,227 @@
+import numpy as np
+from bisect import bisect_left
+from get_symmetry_line import get_centroid_candidate_lines, format_line_equation
+from reflection_engine import reflect_points, to_point_array
+from spatial_index import GridIndex, resolve_tolerance
+from stats import NULL_STATS
+
+
+class SymmetryIndex(object):
+    """
+    A class used to keep the valid lines of symmetry of a set of points that changes one point at a time, i.e. in an
+    interactive editor, without running find_valid_symmetry_lines() on the whole set after each change.
+
+    It holds the points, a GridIndex of them, and an array of the distinct points in sorted order. Adding, removing
+    or moving a point only inserts it into or removes it from the grid and the array, in O(n) at most, so the pairs
+    of points are never rebuilt. The valid lines are found when they are asked for, once after each change: the
+    candidate lines through the centroid, see get_centroid_candidate_lines(), are found in one pass over the array,
+    and each is checked by looking up the reflection of every point in the grid. The lines are the same as
+    find_valid_symmetry_lines(engine="centroid") gives.
+
+    ...
+
+    Attributes
+    ----------
+    tolerance : float
+        the largest distance between a reflected point and a point for them to match
+
+    Methods
+    -------
+    add(point)
+        add a point, returns its id
+
+    remove(point_id)
+        remove a point
+
+    move(point_id, point)
+        move a point to a new position
+
+    get_point(point_id)
+        position of a point
+
+    valid_lines(stats=None)
+        Line objects of the valid lines of symmetry of the current points
+
+    equations(rounding=3)
+        equations of the valid lines of symmetry, formatted like find_valid_symmetry_lines()
+    """
+
+    def __init__(self, points=(), tolerance=0.01):
+        '''
+        :param points: tuple or list of points (x, y) to start with, or an array of shape (N, 2)
+        :param tolerance: absolute tolerance, the largest distance between a reflected point and a point to match
+        '''
+
+        point_array = to_point_array(points)
+        self.tolerance = resolve_tolerance(point_array, tolerance)
+        self._grid = GridIndex([], self.tolerance)
+
+        # position and grid index of each point, by id
+        self._points = {}
+        self._grid_indices = {}
+        self._next_id = 0
+
+        # number of ids at each distinct position, and the distinct positions sorted, as a list and as an array
+        self._counts = {}
+        self._sorted_points = []
+        self._sorted_array = np.empty((0, 2))
+
+        # valid lines of the current points, None until asked for after a change
+        self._valid_lines = None
+
+        for point in point_array.tolist():
+            self._insert(self._new_id(), tuple(point))
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, point_id):
+        return point_id in self._points
+
+    def __repr__(self):
+        return "%s(%d points, tolerance=%r)" % (type(self).__name__, len(self._points), self.tolerance)
+
+    def add(self, point):
+        '''
+        :param point: tuple or list (x, y)
+        :return: int, id of the point, used to remove or move it
+        '''
+        point = _to_point(point)
+        point_id = self._new_id()
+        self._insert(point_id, point)
+
+        return point_id
+
+    def remove(self, point_id):
+        '''
+        :param point_id: id of the point, from add()
+        :return: tuple (x, y), the removed point
+        '''
+        point = self.get_point(point_id)
+
+        self._grid.remove(self._grid_indices.pop(point_id))
+        del self._points[point_id]
+
+        self._counts[point] -= 1
+        if self._counts[point] == 0:
+            del self._counts[point]
+            position = bisect_left(self._sorted_points, point)
+            del self._sorted_points[position]
+            self._sorted_array = np.delete(self._sorted_array, position, axis=0)
+
+        self._valid_lines = None
+
+        return point
+
+    def move(self, point_id, point):
+        '''
+        :param point_id: id of the point, from add(), it keeps its id
+        :param point: tuple or list (x, y), new position of the point
+        :return: None
+        '''
+        point = _to_point(point)
+        self.remove(point_id)
+        self._insert(point_id, point)
+
+    def get_point(self, point_id):
+        '''
+        :param point_id: id of the point, from add()
+        :return: tuple (x, y)
+        '''
+        try:
+            return self._points[point_id]
+        except KeyError as e:
+            # reraise it with custom message
+            error_msg_output = "SymmetryIndex: point id %r is not in the index!" % (point_id,)
+            print(error_msg_output)
+            e.args += (error_msg_output,)
+            raise
+
+    def points(self):
+        '''
+        :return: dictionary {point id: (x, y)} of the current points
+        '''
+        return dict(self._points)
+
+    def valid_lines(self, stats=None):
+        '''
+        get the valid lines of symmetry of the current points, found once after each change
+
+        :param stats: Stats object counting candidates, reflection lookups and valid lines, see stats.py. only counted
+            when the lines are found
+        :return: list of Line objects, empty if there are less than 2 points or none are found
+        '''
+
+        if self._valid_lines is None:
+            self._valid_lines = self._find_valid_lines(NULL_STATS if stats is None else stats)
+
+        return list(self._valid_lines)
+
+    def equations(self, rounding=3):
+        '''
+        :param rounding: round the equations using Python builtin's round(), like find_valid_symmetry_lines()
+        :return: list of equations of the valid lines of symmetry
+        '''
+        if rounding:
+            return [format_line_equation(line, rounding) for line in self.valid_lines()]
+        return [line.equation for line in self.valid_lines()]
+
+    def _new_id(self):
+        point_id = self._next_id
+        self._next_id += 1
+        return point_id
+
+    def _insert(self, point_id, point):
+        self._points[point_id] = point
+        self._grid_indices[point_id] = self._grid.insert(point)
+
+        if point in self._counts:
+            self._counts[point] += 1
+        else:
+            self._counts[point] = 1
+            position = bisect_left(self._sorted_points, point)
+            self._sorted_points.insert(position, point)
+            self._sorted_array = np.insert(self._sorted_array, position, point, axis=0)
+
+        self._valid_lines = None
+
+    def _find_valid_lines(self, stats):
+        if len(self._points) < 2:
+            return []
+
+        # sorted and distinct, so get_centroid_candidate_lines() does not sort the points again
+        point_array = self._sorted_array
+
+        candidates = get_centroid_candidate_lines(point_array, self.tolerance)
+
+        valid_lines = []
+        valid_lines_found = set()
+        lookups = self._grid.lookups
+        for line in candidates:
+            if line in valid_lines_found:
+                continue
+
+            if self._grid.contains_all(reflect_points(point_array, [line])[0]):
+                valid_lines.append(line)
+                valid_lines_found.add(line)
+
+        stats.count("candidates", len(candidates))
+        stats.count("reflection_lookups", self._grid.lookups - lookups)
+        stats.count("valid_lines", len(valid_lines))
+
+        return valid_lines
+
+
+def _to_point(point):
+    # point as a tuple of floats
+    if isinstance(point, (tuple, list, np.ndarray)) is False or len(point) != 2:
+        raise TypeError("SymmetryIndex: point %r must be a tuple or a list (x, y)." % (point,))
+
+    try:
+        return (float(point[0]), float(point[1]))
+    except (ValueError, TypeError) as e:
+        # reraise it with custom message
+        error_msg_output = "SymmetryIndex: point %r cannot be found!" % (point,)
+        print(error_msg_output)
+        e.args += (error_msg_output,)
+        raise